@@ -12,13 +12,26 @@ from PyQt6.QtCore import qWarning
 
 from mobase import IPlugin
 
-from .basic_game import BasicGame
-from .basic_game_ini import BasicIniGame
+from .basic_game import BasicGame, store_timeout
+from .basic_game_ini import IniGameRegistry
+from .basic_game_lazy import (
+    lazy_plugins,
+    load_manifest,
+    module_entry,
+    package_signature,
+    save_manifest,
+)
+from .startup_report import measure, write_report
+from .steam_watcher import ENVIRONMENT_VARIABLE as WATCH_STEAM_VARIABLE
 
 site.addsitedir(os.path.join(os.path.dirname(__file__), "lib"))
 
 
-BasicGame.setup()
+with measure("setup", "BasicGame.setup"):
+    BasicGame.setup(store_timeout())
+
+if os.environ.get(WATCH_STEAM_VARIABLE):
+    BasicGame.watch_steam_libraries()
 
 
 def createPlugins():
@@ -29,25 +42,78 @@ def createPlugins():
     curpath = os.path.abspath(os.path.dirname(__file__))
     escaped_games_path = glob.escape(os.path.join(curpath, "games"))
 
-    # List all the .ini files:
+    # Plugins already listed in the manifest are created lazily, the manifest is
+    # updated with the plugins that had to be loaded:
+    with measure("manifest", "package_signature"):
+        signature = package_signature(curpath)
+    manifest = load_manifest(signature)
+    updated_manifest: dict[str, typing.Any] = {}
+
+    # List all the .ini files, the ones that are not in the manifest are read and
+    # checked, invalid files are all reported at once:
+    ini_paths: typing.List[str] = []
     for file in glob.glob(os.path.join(escaped_games_path, "*.ini")):
-        game_plugins.append(BasicIniGame(file))
+        ini_name = os.path.basename(file)
+        with measure("lazy", ini_name):
+            lazy_game_plugins = lazy_plugins(ini_name, manifest.get(ini_name))
+        if lazy_game_plugins is not None:
+            game_plugins.extend(lazy_game_plugins)
+            updated_manifest[ini_name] = manifest[ini_name]
+        else:
+            ini_paths.append(file)
+
+    ini_games = IniGameRegistry(ini_paths)
+    if ini_games.errors:
+        print(
+            "Invalid game definitions:\n"
+            + "\n".join(f"- {e}" for e in ini_games.errors),
+            file=sys.stderr,
+        )
+    if ini_games.warnings:
+        print(
+            "Warnings in game definitions:\n"
+            + "\n".join(f"- {w}" for w in ini_games.warnings),
+            file=sys.stderr,
+        )
+    for file in ini_games.paths():
+        ini_name = os.path.basename(file)
+        try:
+            with measure("instantiate", ini_name):
+                ini_game = ini_games.create(file)
+        except Exception as e:
+            print("Failed to instantiate {}: {}".format(ini_name, e), file=sys.stderr)
+            continue
+        game_plugins.append(ini_game)
+        updated_manifest[ini_name] = module_entry([ini_game])
 
     # List all the python plugins:
     for file in glob.glob(os.path.join(escaped_games_path, "*.py")):
         module_p = os.path.relpath(file, os.path.join(curpath, "games"))
         if module_p == "__init__.py":
             continue
+        module_name = module_p[:-3]
+
+        with measure("lazy", module_name):
+            lazy_game_plugins = lazy_plugins(module_name, manifest.get(module_name))
+        if lazy_game_plugins is not None:
+            game_plugins.extend(lazy_game_plugins)
+            updated_manifest[module_name] = manifest[module_name]
+            continue
 
         # Import the module:
         try:
-            module = importlib.import_module(".games." + module_p[:-3], __package__)
+            with measure("import", module_name):
+                module = importlib.import_module(".games." + module_name, __package__)
         except ImportError as e:
             print("Failed to import module {}: {}".format(module_p, e), file=sys.stderr)
+            continue
         except Exception as e:
             print("Failed to import module {}: {}".format(module_p, e), file=sys.stderr)
+            continue
 
         # Lookup game plugins:
+        module_plugins: typing.List[BasicGame] = []
+        failed = False
         for name in dir(module):
             if hasattr(module, name):
                 obj = getattr(module, name)
@@ -57,26 +123,41 @@ def createPlugins():
                     and obj is not BasicGame
                 ):
                     try:
-                        game_plugins.append(obj())
+                        with measure("instantiate", name):
+                            module_plugins.append(obj())
                     except Exception as e:
+                        failed = True
                         print(
                             "Failed to instantiate {}: {}".format(name, e),
                             file=sys.stderr,
                         )
+        game_plugins.extend(module_plugins)
+
+        # Modules with failing plugins are kept out of the manifest so that errors
+        # are reported on every run:
+        if not failed:
+            updated_manifest[module_name] = module_entry(module_plugins)
+
+    if updated_manifest != manifest:
+        save_manifest(signature, updated_manifest)
+
     for path in pathlib.Path(escaped_games_path).rglob("plugins/__init__.py"):
         module_path = "." + os.path.relpath(path.parent, curpath).replace(os.sep, ".")
         try:
-            module = importlib.import_module(module_path, __package__)
+            with measure("import", module_path):
+                module = importlib.import_module(module_path, __package__)
             if hasattr(module, "createPlugins") and callable(module.createPlugins):
                 try:
-                    plugins: typing.Any = module.createPlugins()
+                    with measure("createPlugins", module_path):
+                        plugins: typing.Any = module.createPlugins()
                     for item in plugins:
                         if isinstance(item, IPlugin):
                             game_plugins.append(item)
                 except TypeError:
                     pass
             if hasattr(module, "createPlugin") and callable(module.createPlugin):
-                plugin = module.createPlugin()
+                with measure("createPlugin", module_path):
+                    plugin = module.createPlugin()
                 if isinstance(plugin, IPlugin):
                     game_plugins.append(plugin)
         except ImportError as e:
@@ -84,4 +165,6 @@ def createPlugins():
         except Exception as e:
             qWarning(f"Error calling function createPlugin(s) in {module_path}: {e}")
 
+    write_report()
+
     return game_plugins
@@ -1,10 +1,22 @@
 from .basic_local_savegames import BasicLocalSavegames
-from .basic_mod_data_checker import BasicModDataChecker, GlobPatterns
+from .basic_mod_data_checker import (
+    BasicModDataChecker,
+    FixOperation,
+    FixPlan,
+    GlobPatterns,
+)
 from .basic_save_game_info import BasicGameSaveGameInfo
+from .path_patterns import PathPatterns
+from .save_metadata_cache import SaveMetadata, SaveMetadataCache
 
 __all__ = [
     "BasicModDataChecker",
     "BasicGameSaveGameInfo",
     "GlobPatterns",
+    "FixOperation",
+    "FixPlan",
+    "PathPatterns",
     "BasicLocalSavegames",
+    "SaveMetadata",
+    "SaveMetadataCache",
 ]
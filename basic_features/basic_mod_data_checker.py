@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import re
 from dataclasses import dataclass, field
 from typing import Iterable, Literal
 
 import mobase
 
+from .path_patterns import PathPatterns, split_path
 from .utils import is_directory
 
 
@@ -37,6 +39,9 @@ class OptionalRegexPattern:
         return bool(self._pattern.match(value))
 
 
+_Category = Literal["ignore", "unfold", "valid", "delete", "move"]
+
+
 class RegexPatterns:
     """
     Regex patterns for validation in `BasicModDataChecker`.
@@ -52,6 +57,31 @@ class RegexPatterns:
         }
         self.ignore = OptionalRegexPattern(globs.ignore)
 
+        # valid patterns with folders, e.g. "Mods/*.pak":
+        valid_paths = [glob for glob in globs.valid or [] if len(split_path(glob)) > 1]
+        self.valid_paths = PathPatterns(valid_paths) if valid_paths else None
+
+        # All the globs in a single pattern, in order of precedence, see classify():
+        self._categories: list[tuple[_Category, str | None]] = []
+        globs_by_category: list[tuple[_Category, Iterable[str] | None]] = [
+            ("ignore", globs.ignore),
+            ("unfold", globs.unfold),
+            ("valid", globs.valid),
+            ("delete", globs.delete),
+        ]
+        all_globs: list[str] = []
+        for category, category_globs in globs_by_category:
+            for glob in category_globs or []:
+                all_globs.append(glob)
+                self._categories.append((category, None))
+        for key in globs.move:
+            all_globs.append(key)
+            self._categories.append(("move", key))
+
+        self._classifier = (
+            OptionalRegexPattern.regex_from_glob_list(all_globs) if all_globs else None
+        )
+
     def move_match(self, value: str) -> str | None:
         """
         Retrieve the first move patterns that matches the given value, or None if no
@@ -62,6 +92,78 @@ class RegexPatterns:
                 return key
         return None
 
+    def classify(self, value: str) -> tuple[_Category, str | None] | None:
+        """
+        Find the category of the first glob matching the given value, with a single
+        regex match. Categories are checked in order: ignore, unfold, valid, delete
+        and move.
+
+        Returns:
+            A pair (category, move key), where the move key is only set for the move
+            category, or None if no glob matches.
+        """
+        if self._classifier is None:
+            return None
+        match = self._classifier.match(value)
+        if match is None or match.lastindex is None:
+            return None
+        return self._categories[match.lastindex - 1]
+
+    @staticmethod
+    def of(globs: GlobPatterns) -> RegexPatterns:
+        """
+        Retrieve the regex patterns for the given glob patterns, compiling them only
+        if no identical glob patterns were compiled before.
+
+        The returned patterns are shared and must not be modified.
+        """
+        return _compile_patterns(globs.key())
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_patterns(key: _GlobPatternsKey) -> RegexPatterns:
+    return RegexPatterns(GlobPatterns.from_key(key))
+
+
+@functools.lru_cache(maxsize=256)
+def _merge_patterns(
+    key: _GlobPatternsKey, other: _GlobPatternsKey, mode: Literal["merge", "replace"]
+) -> GlobPatterns:
+    globs, other_globs = GlobPatterns.from_key(key), GlobPatterns.from_key(other)
+    if mode == "merge":
+        return GlobPatterns(
+            unfold=_merge_list(globs.unfold, other_globs.unfold),
+            valid=_merge_list(globs.valid, other_globs.valid),
+            delete=_merge_list(globs.delete, other_globs.delete),
+            move=globs.move | other_globs.move,
+            ignore=_merge_list(globs.ignore, other_globs.ignore),
+        )
+    else:
+        return GlobPatterns(
+            unfold=other_globs.unfold or globs.unfold,
+            valid=other_globs.valid or globs.valid,
+            delete=other_globs.delete or globs.delete,
+            move=other_globs.move or globs.move,
+            ignore=other_globs.ignore or globs.ignore,
+        )
+
+
+def _freeze_list(globs: list[str] | None) -> tuple[str, ...] | None:
+    return None if globs is None else tuple(globs)
+
+
+def _thaw_list(globs: tuple[str, ...] | None) -> list[str] | None:
+    return None if globs is None else list(globs)
+
+
+_GlobPatternsKey = tuple[
+    tuple[str, ...] | None,
+    tuple[str, ...] | None,
+    tuple[str, ...] | None,
+    tuple[tuple[str, str], ...],
+    tuple[str, ...] | None,
+]
+
 
 def _merge_list(l1: list[str] | None, l2: list[str] | None) -> list[str] | None:
     if l1 is None and l2 is None:
@@ -70,10 +172,14 @@ def _merge_list(l1: list[str] | None, l2: list[str] | None) -> list[str] | None:
     return (l1 or []) + (l2 or [])
 
 
-@dataclass(frozen=True, unsafe_hash=True)
+@dataclass(frozen=True)
 class GlobPatterns:
     """
     See: `BasicModDataChecker`
+
+    Glob patterns are hashed by value and are considered immutable, so the lists and
+    dictionary should not be modified once the patterns are created. As for
+    equality, the order of the move patterns is not taken into account by the hash.
     """
 
     unfold: list[str] | None = None
@@ -82,6 +188,38 @@ class GlobPatterns:
     move: dict[str, str] = field(default_factory=dict[str, str])
     ignore: list[str] | None = None
 
+    def __hash__(self) -> int:
+        unfold, valid, delete, move, ignore = self.key()
+        return hash((unfold, valid, delete, frozenset(move), ignore))
+
+    def key(self) -> _GlobPatternsKey:
+        """
+        Returns:
+            A hashable value identifying these patterns, including the order of the
+            move patterns (that is not taken into account when comparing patterns).
+        """
+        return (
+            _freeze_list(self.unfold),
+            _freeze_list(self.valid),
+            _freeze_list(self.delete),
+            tuple(self.move.items()),
+            _freeze_list(self.ignore),
+        )
+
+    @staticmethod
+    def from_key(key: _GlobPatternsKey) -> GlobPatterns:
+        """
+        Construct glob patterns from the value returned by key().
+        """
+        unfold, valid, delete, move, ignore = key
+        return GlobPatterns(
+            unfold=_thaw_list(unfold),
+            valid=_thaw_list(valid),
+            delete=_thaw_list(delete),
+            move=dict(move),
+            ignore=_thaw_list(ignore),
+        )
+
     def merge(
         self, other: GlobPatterns, mode: Literal["merge", "replace"] = "replace"
     ) -> GlobPatterns:
@@ -100,32 +238,52 @@ class GlobPatterns:
             mode: Merge mode.
 
         Returns:
-            A new glob pattern representing the merge of this one with other.
-        """
-        if mode == "merge":
-            return GlobPatterns(
-                unfold=_merge_list(self.unfold, other.unfold),
-                valid=_merge_list(self.valid, other.valid),
-                delete=_merge_list(self.delete, other.delete),
-                move=self.move | other.move,
-                ignore=_merge_list(self.ignore, other.ignore),
-            )
-        else:
-            return GlobPatterns(
-                unfold=other.unfold or self.unfold,
-                valid=other.valid or self.valid,
-                delete=other.delete or self.delete,
-                move=other.move or self.move,
-                ignore=other.ignore or self.ignore,
-            )
+            A glob pattern representing the merge of this one with other, shared with
+            previous merges of identical patterns.
+        """
+        return _merge_patterns(self.key(), other.key(), mode)
+
+
+@dataclass
+class FixOperation:
+    """
+    Operation applied to an entry of a tree by `BasicModDataChecker.fix`.
+    """
+
+    kind: Literal["merge", "detach", "move"]
+    """Merge the entry (a folder) in the tree, detach it or move it."""
+
+    name: str
+    """Name of the entry in the tree."""
+
+    target: str | None = None
+    """Target path for a move, see `mobase.IFileTree.move`."""
+
+
+@dataclass(frozen=True)
+class FixPlan:
+    """
+    Result of the check of a tree by `BasicModDataChecker`.
+    """
+
+    status: mobase.ModDataChecker.CheckReturn
+    """Status of the tree."""
+
+    operations: list[FixOperation]
+    """Operations to fix the tree, in order."""
+
+    names: tuple[str, ...]
+    """Names of the entries in the tree when it was checked, only complete if the
+    status is not invalid."""
 
 
 class BasicModDataChecker(mobase.ModDataChecker):
     """Game feature that is used to check and fix the content of a data tree
     via simple file definitions.
 
-    The file definitions support glob pattern (without subfolders) and are
-    checked and fixed in definition order of the `file_patterns` dict.
+    The file definitions support glob pattern (without subfolders, except for valid
+    patterns) and are checked and fixed in definition order of the `file_patterns`
+    dict.
 
     Args:
         file_patterns (optional): A GlobPatterns object, with the following attributes:
@@ -137,6 +295,9 @@ class BasicModDataChecker(mobase.ModDataChecker):
                 # Check result: `mobase.ModDataChecker.VALID`.
 
             valid: [ "list of files and folders in the right path." ],
+                # Patterns can contain folders (e.g. "Mods/*.pak", see
+                # `PathPatterns`), a folder is then valid if everything in it
+                # matches these patterns.
                 # Check result: `mobase.ModDataChecker.VALID`.
 
             delete: [ "list of files/folders to delete." ],
@@ -166,61 +327,135 @@ class BasicModDataChecker(mobase.ModDataChecker):
     _regex_patterns: RegexPatterns
     """The regex patterns derived from the file (glob) patterns."""
 
+    _last_plan: tuple[mobase.IFileTree, FixPlan] | None
+    """The last tree checked by `dataLooksValid` and its plan, for `fix`."""
+
     def __init__(self, file_patterns: GlobPatterns | None = None):
         super().__init__()
 
         self._file_patterns = file_patterns or GlobPatterns()
-        self._regex_patterns = RegexPatterns(self._file_patterns)
+        self._regex_patterns = RegexPatterns.of(self._file_patterns)
+        self._last_plan = None
 
     def dataLooksValid(
         self, filetree: mobase.IFileTree
     ) -> mobase.ModDataChecker.CheckReturn:
-        status = mobase.ModDataChecker.INVALID
+        plan = self._plan(list(filetree), stop_on_invalid=True, recurse=True)
 
-        rp = self._regex_patterns
-        for entry in filetree:
-            name = entry.name().casefold()
-
-            if rp.ignore.match(name):
-                continue
-            if rp.unfold.match(name):
-                if is_directory(entry):
-                    status = self.dataLooksValid(entry)
-                else:
-                    status = mobase.ModDataChecker.INVALID
-                    break
-            elif rp.valid.match(name):
-                if status is mobase.ModDataChecker.INVALID:
-                    status = mobase.ModDataChecker.VALID
-            elif rp.delete.match(name) or rp.move_match(name) is not None:
-                status = mobase.ModDataChecker.FIXABLE
-            else:
-                status = mobase.ModDataChecker.INVALID
-                break
-        return status
+        # keep the plan for fix(), that is only called next on the same tree if it
+        # is fixable, other trees are not kept alive
+        self._last_plan = (
+            (filetree, plan) if plan.status is mobase.ModDataChecker.FIXABLE else None
+        )
+        return plan.status
 
     def fix(self, filetree: mobase.IFileTree) -> mobase.IFileTree:
-        rp = self._regex_patterns
-        for entry in list(filetree):
-            name = entry.name()
+        entries = list(filetree)
+        names = tuple(entry.name() for entry in entries)
+
+        # replay the plan from dataLooksValid() if the tree has not changed since
+        plan: FixPlan | None = None
+        if self._last_plan is not None:
+            last_tree, last_plan = self._last_plan
+            self._last_plan = None
+            if last_tree is filetree and last_plan.names == names:
+                plan = last_plan
+        if plan is None:
+            plan = self._plan(entries, stop_on_invalid=False, recurse=False)
+
+        entries_by_name = dict(zip(names, entries, strict=True))
+        for operation in plan.operations:
+            entry = entries_by_name[operation.name]
+            match operation.kind:
+                case "merge":
+                    assert is_directory(entry)
+                    filetree.merge(entry)
+                case "detach":
+                    entry.detach()
+                case "move":
+                    assert operation.target is not None
+                    filetree.move(entry, operation.target)
 
-            if rp.ignore.match(name):
-                continue
-            # unfold first - if this match, entry is a directory (checked in
-            # dataLooksValid)
-            if rp.unfold.match(name):
-                assert is_directory(entry)
-                filetree.merge(entry)
-                entry.detach()
+        return filetree
 
-            elif rp.valid.match(name):
-                continue
+    def plan(self, filetree: mobase.IFileTree) -> FixPlan:
+        """
+        Check the given tree and list the operations that fix() would apply, without
+        modifying the tree.
+
+        Args:
+            filetree: Tree to check.
+
+        Returns:
+            The status of the tree, as returned by dataLooksValid(), and the
+            operations to fix it.
+        """
+        return self._plan(list(filetree), stop_on_invalid=False, recurse=True)
+
+    def _plan(
+        self,
+        entries: list[mobase.FileTreeEntry],
+        stop_on_invalid: bool,
+        recurse: bool,
+    ) -> FixPlan:
+        """
+        Classify the given entries of a tree.
 
-            elif rp.delete.match(name):
-                entry.detach()
+        Args:
+            entries: Entries of the tree.
+            stop_on_invalid: Stop at the first invalid entry, the operations are then
+                incomplete.
+            recurse: Check the folders to unfold, otherwise the status is only
+                meaningful for the operations.
+        """
+        status = mobase.ModDataChecker.INVALID
+        operations: list[FixOperation] = []
+        names: list[str] = []
+        invalid = False
 
-            elif (move_key := rp.move_match(name)) is not None:
-                target = self._file_patterns.move[move_key]
-                filetree.move(entry, target)
+        rp = self._regex_patterns
+        for entry in entries:
+            name = entry.name()
+            names.append(name)
+
+            match rp.classify(name.casefold()):
+                case ("ignore", _):
+                    continue
+                case ("unfold", _):
+                    if not is_directory(entry):
+                        invalid = True
+                    else:
+                        if recurse and not invalid:
+                            status = self.dataLooksValid(entry)
+                        # unfold first, then remove the empty folder
+                        operations.append(FixOperation("merge", name))
+                        operations.append(FixOperation("detach", name))
+                case ("valid", _):
+                    if status is mobase.ModDataChecker.INVALID:
+                        status = mobase.ModDataChecker.VALID
+                case ("delete", _):
+                    status = mobase.ModDataChecker.FIXABLE
+                    operations.append(FixOperation("detach", name))
+                case ("move", str(move_key)):
+                    status = mobase.ModDataChecker.FIXABLE
+                    target = self._file_patterns.move[move_key]
+                    operations.append(FixOperation("move", name, target))
+                case _:
+                    # a folder is also valid if everything in it matches the valid
+                    # patterns with folders
+                    if (
+                        recurse
+                        and rp.valid_paths is not None
+                        and rp.valid_paths.covers(entry)
+                    ):
+                        if status is mobase.ModDataChecker.INVALID:
+                            status = mobase.ModDataChecker.VALID
+                    else:
+                        invalid = True
+
+            if invalid and stop_on_invalid:
+                break
 
-        return filetree
+        if invalid:
+            status = mobase.ModDataChecker.INVALID
+        return FixPlan(status, operations, tuple(names))
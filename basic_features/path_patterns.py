@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Iterable, Sequence
+
+import mobase
+
+from .utils import is_directory
+
+_SEPARATORS = re.compile(r"[/\\]")
+
+
+def split_path(path: str) -> list[str]:
+    """
+    Split a path or a path glob pattern into its segments, on both / and \\.
+    """
+    return [segment for segment in _SEPARATORS.split(path) if segment]
+
+
+class _Node:
+    __slots__ = ("literals", "wildcards", "globstar", "recursive", "index")
+
+    def __init__(self, recursive: bool = False) -> None:
+        # children for segments without wildcards, by casefolded segment:
+        self.literals: dict[str, _Node] = {}
+
+        # children for segments with wildcards, by segment:
+        self.wildcards: dict[str, tuple[re.Pattern[str], _Node]] = {}
+
+        # child for a "**" segment, and whether this node is such a child:
+        self.globstar: _Node | None = None
+        self.recursive = recursive
+
+        # index of the first pattern ending at this node:
+        self.index: int | None = None
+
+
+def _closure(node: _Node) -> list[_Node]:
+    # the node and the nodes reached from it by "**" segments matching no folder
+    nodes = [node]
+    while node.globstar is not None:
+        node = node.globstar
+        nodes.append(node)
+    return nodes
+
+
+class _State:
+    """
+    Set of trie nodes reached by a path, with the transitions from these nodes
+    merged together.
+    """
+
+    __slots__ = ("nodes", "index", "literals", "wildcards", "recursive", "transitions")
+
+    def __init__(self, nodes: frozenset[_Node]) -> None:
+        self.nodes = nodes
+
+        # index of the first pattern ending at one of the nodes:
+        indices = [node.index for node in nodes if node.index is not None]
+        self.index = min(indices) if indices else None
+
+        self.literals: dict[str, list[_Node]] = {}
+        wildcards: dict[str, tuple[re.Pattern[str], list[_Node]]] = {}
+        self.recursive: list[_Node] = []
+        for node in nodes:
+            for key, child in node.literals.items():
+                self.literals.setdefault(key, []).extend(_closure(child))
+            for segment, (pattern, child) in node.wildcards.items():
+                wildcards.setdefault(segment, (pattern, []))[1].extend(_closure(child))
+            if node.recursive:
+                self.recursive.append(node)
+        self.wildcards = list(wildcards.values())
+
+        # next states, by casefolded name:
+        self.transitions: dict[str, _State] = {}
+
+
+class PathPatterns:
+    """
+    Glob patterns matching paths segment by segment, e.g. `Mods/*.pak`.
+
+    Wildcards (`*`, `?` and `[...]`) only match inside a segment, and a `**` segment
+    matches any number of folders (including none). Matching is case-insensitive and
+    both / and \\ are accepted as separators.
+
+    The patterns are compiled into a trie of segments, so matching the entries of a
+    tree only descends into folders that can still match a pattern, and never
+    builds the path of the entries. The sets of trie nodes reached while matching
+    are cached, together with the transitions between them.
+    """
+
+    # maximum number of cached transitions from a single state
+    _MAX_TRANSITIONS = 4096
+
+    def __init__(self, globs: Iterable[str]) -> None:
+        root = _Node()
+        for index, glob in enumerate(globs):
+            node = root
+            for segment in split_path(glob):
+                node = self._child(node, segment)
+            if node.index is None:
+                node.index = index
+
+        self._states: dict[frozenset[_Node], _State] = {}
+        self._start = self._state(_closure(root))
+
+    @staticmethod
+    def _child(node: _Node, segment: str) -> _Node:
+        if segment == "**":
+            if node.globstar is None:
+                node.globstar = _Node(recursive=True)
+            return node.globstar
+
+        if not any(c in segment for c in "*?["):
+            return node.literals.setdefault(segment.casefold(), _Node())
+
+        if segment not in node.wildcards:
+            node.wildcards[segment] = (
+                re.compile(fnmatch.translate(segment), re.I),
+                _Node(),
+            )
+        return node.wildcards[segment][1]
+
+    def _state(self, nodes: Iterable[_Node]) -> _State:
+        key = frozenset(nodes)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _State(key)
+        return state
+
+    def _step(self, state: _State, name: str) -> _State:
+        key = name.casefold()
+        next_state = state.transitions.get(key)
+        if next_state is None:
+            nodes = list(state.literals.get(key, ()))
+            for pattern, children in state.wildcards:
+                if pattern.match(key):
+                    nodes.extend(children)
+            nodes.extend(state.recursive)
+            next_state = self._state(nodes)
+
+            if len(state.transitions) >= PathPatterns._MAX_TRANSITIONS:
+                state.transitions.clear()
+            state.transitions[key] = next_state
+        return next_state
+
+    def match(self, path: str | Sequence[str]) -> int | None:
+        """
+        Match a path against the patterns.
+
+        Args:
+            path: The path, as a string or as a list of segments.
+
+        Returns:
+            The index of the first pattern matching the path, or None if no pattern
+            matches it.
+        """
+        state = self._start
+        for segment in split_path(path) if isinstance(path, str) else path:
+            state = self._step(state, segment)
+            if not state.nodes:
+                return None
+        return state.index
+
+    def covers(self, entry: mobase.FileTreeEntry) -> bool:
+        """
+        Check if an entry at the root of a tree is covered by the patterns, i.e., if
+        it matches a pattern, or if it is a folder whose path is the beginning of a
+        pattern and where every entry is covered. Folders are only walked as long as
+        their path can match a pattern.
+
+        Args:
+            entry: Entry to check, its path is its name.
+
+        Returns:
+            True if the entry is covered by the patterns, False otherwise.
+        """
+        return self._covers(entry, self._step(self._start, entry.name()))
+
+    def _covers(self, entry: mobase.FileTreeEntry, state: _State) -> bool:
+        if state.index is not None:
+            return True
+        if not state.nodes or not is_directory(entry):
+            return False
+        for child in entry:
+            if not self._covers(child, self._step(state, child.name())):
+                return False
+        return True
@@ -0,0 +1,278 @@
+# -*- encoding: utf-8 -*-
+
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, as_completed
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..cache_utils import FileCache
+from ..process_utils import create_process_pool, map_chunk
+
+_T = TypeVar("_T")
+
+SaveMetadata = dict[str, Any]
+
+
+def _stat(path: Path) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class SaveMetadataCache:
+    """
+    Persistent cache of the metadata of the saves of a game.
+
+    The metadata of a save is extracted by a function registered by the game, and is
+    cached in the plugin data folder, validated against the size and modification
+    time of the file it is extracted from. Saves that did not change since they were
+    last listed (even in a previous session of MO2) are not read again.
+
+    Example:
+
+        class MyGame(BasicGame):
+            def init(self, organizer: mobase.IOrganizer) -> bool:
+                super().init(organizer)
+                self._saves_metadata = SaveMetadataCache(
+                    self.GameShortName, extract_metadata
+                )
+                return True
+
+            def listSaves(self, folder: QDir) -> list[mobase.ISaveGame]:
+                return self._saves_metadata.create_saves(
+                    Path(folder.absolutePath()).glob("*.sav"), MySaveGame
+                )
+
+    For formats that are slow to parse, the save games can instead retrieve their
+    metadata on demand with `get()`, while `prefetch()` warms the cache in the
+    background (see `games/game_stalkeranomaly.py`). For formats that are CPU-bound
+    to parse, `prefetch()` can also extract the saves in worker processes.
+    """
+
+    def __init__(
+        self,
+        game: str,
+        extract: Callable[[Path], SaveMetadata],
+        version: int = 0,
+        source: Callable[[Path], Path] | None = None,
+    ):
+        """
+        Args:
+            game: Short name of the game, used to name the cache file.
+            extract: Function extracting the metadata of a save from its path. The
+                metadata must be small and JSON serializable. If the function raises,
+                nothing is cached for the save. To extract saves in worker
+                processes, this must be a function defined at the level of a module
+                that does not depend on mobase.
+            version: Version of the metadata, to bump when `extract` changes.
+            source: Function returning the file the metadata is extracted from, for
+                saves that are folders. Defaults to the save itself.
+        """
+        self._name = f"saves/{game}.json"
+        self._extract = extract
+        self._version = version
+        self._source = source
+
+        # loaded on first use, so that creating the game does not read the cache
+        self._cache: FileCache | None = None
+
+        # the cache is shared with the prefetching thread
+        self._lock = threading.Lock()
+        self._prefetch_id = 0
+
+        # saves being extracted, by get() or in worker processes, set once their
+        # extraction is over
+        self._pending: dict[Path, threading.Event] = {}
+
+    def _load(self) -> FileCache:
+        if self._cache is None:
+            self._cache = FileCache(self._name, self._version)
+        return self._cache
+
+    def _file(self, save: Path) -> Path:
+        return save if self._source is None else self._source(save)
+
+    def get(self, save: Path) -> SaveMetadata:
+        """
+        Retrieve the metadata of a save, extracting it if the save is not in the
+        cache or changed since it was cached. Can be called from any thread, but
+        waits for the save being extracted by another thread or by `prefetch()`, if
+        any.
+
+        Args:
+            save: Path to the save.
+
+        Returns:
+            The metadata of the save.
+        """
+        file = self._file(save)
+        while True:
+            with self._lock:
+                cache = self._load()
+                if cache.contains(file):
+                    return cache.get(file, lambda _: self._extract(save))
+
+                pending = self._pending.get(save)
+                if pending is None:
+                    event = self._pending[save] = threading.Event()
+                    break
+
+            # if the extraction failed, the save is extracted again to raise
+            pending.wait()
+
+        # the extraction runs outside of the lock so that the saves that are
+        # already cached can be retrieved meanwhile
+        try:
+            stat = _stat(file)
+            metadata = self._extract(save)
+            with self._lock:
+                return cache.get(file, lambda _: metadata, stat)
+        finally:
+            with self._lock:
+                del self._pending[save]
+            event.set()
+
+    def prefetch(
+        self, saves: Iterable[Path], processes: int = 0, chunk_size: int = 8
+    ) -> None:
+        """
+        Retrieve the metadata of the given saves, in order, on a background thread,
+        then save the cache. A prefetch that is still running is stopped. Errors are
+        ignored, `get()` raises them again for the saves that cannot be extracted.
+
+        Args:
+            saves: Paths to the saves, the ones most likely to be shown first
+                should come first.
+            processes: Number of worker processes to extract the saves that are not
+                in the cache with, 0 to extract them on the background thread.
+            chunk_size: Number of saves sent to a worker process at once.
+        """
+        saves = list(saves)
+        with self._lock:
+            self._prefetch_id += 1
+            prefetch_id = self._prefetch_id
+
+        def work():
+            if processes > 0:
+                self._extract_in_processes(saves, processes, chunk_size, prefetch_id)
+
+            # marks the saves as used, and extracts the ones that failed in the
+            # worker processes again to report their errors
+            for save in saves:
+                if self._prefetch_id != prefetch_id:
+                    return
+                try:
+                    self.get(save)
+                except Exception:
+                    pass
+            self.save()
+
+        threading.Thread(
+            target=work, name=f"{self._name} prefetch", daemon=True
+        ).start()
+
+    def _extract_in_processes(
+        self, saves: list[Path], processes: int, chunk_size: int, prefetch_id: int
+    ) -> None:
+        with self._lock:
+            cache = self._load()
+            missing = [
+                save
+                for save in saves
+                if save not in self._pending and not cache.contains(self._file(save))
+            ]
+            chunks = [
+                missing[i : i + chunk_size] for i in range(0, len(missing), chunk_size)
+            ]
+            events = [threading.Event() for _ in chunks]
+            for chunk, event in zip(chunks, events, strict=True):
+                for save in chunk:
+                    self._pending[save] = event
+        if not chunks:
+            return
+
+        try:
+            pool = create_process_pool(min(processes, len(chunks)))
+            if pool is None:
+                return
+
+            try:
+                # only the (small) metadata of the saves is sent back
+                futures: dict[
+                    Future[list[tuple[SaveMetadata | None, str | None]]], int
+                ] = {
+                    pool.submit(map_chunk, self._extract, chunk): i
+                    for i, chunk in enumerate(chunks)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        print(f"Failed to extract saves: {e}", file=sys.stderr)
+                        break
+
+                    with self._lock:
+                        for save, (metadata, error) in zip(
+                            chunks[i], results, strict=True
+                        ):
+                            if error is None:
+                                cache.get(self._file(save), lambda _, m=metadata: m)
+                            del self._pending[save]
+                    events[i].set()
+
+                    if self._prefetch_id != prefetch_id:
+                        break
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            with self._lock:
+                for chunk, event in zip(chunks, events, strict=True):
+                    for save in chunk:
+                        if self._pending.get(save) is event:
+                            del self._pending[save]
+            for event in events:
+                event.set()
+
+    def save(self) -> None:
+        """
+        Save the cache if it was modified. The saves that were not retrieved since
+        the cache was loaded (e.g. the saves of other profiles) are kept, unless
+        they were deleted or modified.
+        """
+        with self._lock:
+            if self._cache is not None:
+                self._cache.save(keep_unused=True)
+
+    def create_saves(
+        self, saves: Iterable[Path], factory: Callable[[Path, SaveMetadata], _T]
+    ) -> list[_T]:
+        """
+        Create the save games for the given paths from their metadata, and save the
+        cache. Saves whose metadata cannot be extracted (e.g. corrupted saves) are
+        reported and skipped.
+
+        Args:
+            saves: Paths to the saves.
+            factory: Function creating a save game from its path and metadata,
+                typically the save game class.
+
+        Returns:
+            The save games.
+        """
+        games: list[_T] = []
+        try:
+            for save in saves:
+                try:
+                    metadata = self.get(save)
+                except Exception as e:
+                    print(f"Failed to read save {save}: {e}", file=sys.stderr)
+                    continue
+                games.append(factory(save, metadata))
+        finally:
+            self.save()
+        return games
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import os
+import re
 import shutil
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Callable, Generic, TypeVar
+from typing import Any, Callable, Collection, Generic, TypeVar
 
-from PyQt6.QtCore import QDir, QFileInfo, QStandardPaths
+from PyQt6.QtCore import QDir, QFileInfo, QObject, QStandardPaths
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QMessageBox
 
@@ -15,110 +19,396 @@ from .basic_features.basic_save_game_info import (
     BasicGameSaveGame,
     BasicGameSaveGameInfo,
 )
+from .cache_utils import FileCache, file_signature
+from .startup_report import measure
+
+# Variables that can be used in the paths of basic games, and their values:
+_VARIABLES: dict[str, Callable[[BasicGame], str]] = {
+    "%DOCUMENTS%": lambda game: QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.DocumentsLocation
+    ),
+    "%USERPROFILE%": lambda game: QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.HomeLocation
+    ),
+    "%GAME_DOCUMENTS%": lambda game: game.documentsDirectory().absolutePath(),
+    "%GAME_PATH%": lambda game: game.gameDirectory().absolutePath(),
+}
+_VARIABLES_PATTERN = re.compile("|".join(map(re.escape, _VARIABLES)))
+
+# Methods of the game called by the variables, see _MappingInfo:
+_VARIABLE_METHODS: dict[str, str] = {
+    "%GAME_DOCUMENTS%": "documentsDirectory",
+    "%GAME_PATH%": "gameDirectory",
+}
+
+
+class _Template:
+    """
+    A value with special paths (see replace_variables), split once into literal
+    and variable segments.
+    """
+
+    __slots__ = ("_segments", "_qdir", "methods")
+
+    def __init__(self, value: str, qdir: bool = False):
+        self._segments: list[str | Callable[[BasicGame], str]] = []
+        self._qdir = qdir
+
+        # methods of the game called to expand the value:
+        self.methods: set[str] = set()
+
+        position = 0
+        for match in _VARIABLES_PATTERN.finditer(value):
+            if match.start() > position:
+                self._segments.append(value[position : match.start()])
+            self._segments.append(_VARIABLES[match.group()])
+            if match.group() in _VARIABLE_METHODS:
+                self.methods.add(_VARIABLE_METHODS[match.group()])
+            position = match.end()
+        if position < len(value) or not self._segments:
+            self._segments.append(value[position:])
+
+    @staticmethod
+    def of(value: object) -> _Template | None:
+        """
+        Returns:
+            The template for the given value, or None if the value cannot contain
+            special paths.
+        """
+        if isinstance(value, str):
+            return _Template(value)
+        elif isinstance(value, QDir):
+            return _Template(value.path(), qdir=True)
+
+        # MO2 does not support Path anywhere so we always convert to str:
+        elif isinstance(value, Path):
+            return _Template(str(value))
+
+        return None
+
+    def expand(self, game: BasicGame) -> str | QDir:
+        value = "".join(
+            segment if isinstance(segment, str) else segment(game)
+            for segment in self._segments
+        )
+        return QDir(value) if self._qdir else value
 
 
 def replace_variables(value: str, game: BasicGame) -> str:
     """Replace special paths in the given value."""
+    return _Template(value).expand(game)  # type: ignore
 
-    if value.find("%DOCUMENTS%") != -1:
-        value = value.replace(
-            "%DOCUMENTS%",
-            QStandardPaths.writableLocation(
-                QStandardPaths.StandardLocation.DocumentsLocation
-            ),
-        )
-    if value.find("%USERPROFILE%") != -1:
-        value = value.replace(
-            "%USERPROFILE%",
-            QStandardPaths.writableLocation(
-                QStandardPaths.StandardLocation.HomeLocation
-            ),
-        )
-    if value.find("%GAME_DOCUMENTS%") != -1:
-        value = value.replace(
-            "%GAME_DOCUMENTS%", game.documentsDirectory().absolutePath()
+
+def normalize_path(path: Path | str) -> str:
+    """
+    Normalize a path so that different spellings of the same path (separators,
+    case on Windows, trailing separators) are equal.
+
+    Args:
+        path: The path to normalize.
+
+    Returns:
+        The normalized path.
+    """
+    return os.path.normcase(os.path.normpath(path))
+
+
+_ErrorList = list[tuple[str, Exception]]
+
+# Function listing the games of a store, filling the given mapping from game IDs to
+# install locations as they are found and adding errors to the given list:
+_StoreScanner = Callable[[dict[str, Path], _ErrorList], object]
+
+
+def _with_file_cache(
+    name: str, scanner: Callable[[dict[str, Path], _ErrorList, FileCache], object]
+) -> _StoreScanner:
+    """
+    Wrap a store scanner to give it a persistent cache for the files it parses. The
+    cache is saved when the scanner completes.
+
+    Args:
+        name: Name of the cache file.
+        scanner: Function listing the games of the store, using the given cache.
+
+    Returns:
+        A function listing the games of the store.
+    """
+
+    def run(games: dict[str, Path], errors: _ErrorList) -> None:
+        cache = FileCache(name)
+        scanner(games, errors, cache)
+        cache.save()
+
+    return run
+
+
+def _run_store_scanners(
+    scanners: dict[str, _StoreScanner],
+    timeout: float | None,
+    errors: _ErrorList,
+) -> dict[str, dict[str, Path]]:
+    """
+    Run the given store scanners concurrently.
+
+    Each scanner runs in a daemon thread so that a hung scanner (e.g. a Steam library
+    on a sleeping network drive) stalls neither the loading of the plugins nor the
+    exit of MO2.
+
+    Args:
+        scanners: Mapping from store names to functions listing the games of the
+            store.
+        timeout: Maximum time (in seconds) given to each scanner, or None to wait
+            for all the scanners.
+        errors: List where failures and timeouts of the scanners are added.
+
+    Returns:
+        A mapping from store names to the games found by the corresponding scanner,
+        only the games found in time for scanners that did not complete in time.
+    """
+    # each scanner has its own games and errors, so that a scanner that did not
+    # complete in time only modifies objects that are not used anymore
+    results: dict[str, tuple[dict[str, Path], _ErrorList]] = {
+        name: ({}, []) for name in scanners
+    }
+
+    def run(name: str, scanner: _StoreScanner):
+        scanner_games, scanner_errors = results[name]
+        try:
+            with measure("store", name):
+                scanner(scanner_games, scanner_errors)
+        except Exception as e:
+            error_message = f"Failed to list the games installed via {name}."
+            print(error_message, e, file=sys.stderr)
+            scanner_errors.append((error_message, e))
+
+    threads = {
+        name: threading.Thread(
+            target=run, args=(name, scanner), name=f"{name} scanner", daemon=True
         )
-    if value.find("%GAME_PATH%") != -1:
-        value = value.replace("%GAME_PATH%", game.gameDirectory().absolutePath())
+        for name, scanner in scanners.items()
+    }
+    for thread in threads.values():
+        thread.start()
+
+    # all the scanners run concurrently, so they all share the same deadline
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    games: dict[str, dict[str, Path]] = {}
+    for name, thread in threads.items():
+        thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        scanner_games, scanner_errors = results[name]
+        if thread.is_alive():
+            # copies of a dict or list are atomic, so the scanner can keep running
+            games[name] = dict(scanner_games)
+            errors.extend(list(scanner_errors))
+
+            error_message = (
+                f"Listing the games installed via {name} did not complete in time,"
+                f" only the games found so far ({len(games[name])}) will be detected."
+            )
+            print(error_message, file=sys.stderr)
+            errors.append(
+                (error_message, TimeoutError(f"{name} scanner timed out ({timeout}s)"))
+            )
+        else:
+            games[name] = scanner_games
+            errors.extend(scanner_errors)
 
-    return value
+    return games
 
 
-_T = TypeVar("_T")
+# Environment variable with the time (in seconds) given to the store scanners when the
+# plugins are loaded:
+STORE_TIMEOUT_VARIABLE = "BASIC_GAMES_STORE_TIMEOUT"
 
 
-class BasicGameMapping(Generic[_T]):
-    # The game:
-    _game: "BasicGame"
+def store_timeout(default: float | None = 10.0) -> float | None:
+    """
+    Read the time given to the store scanners from the BASIC_GAMES_STORE_TIMEOUT
+    environment variable.
+
+    Args:
+        default: Timeout used if the variable is not set or is not a number.
+
+    Returns:
+        The timeout in seconds, or None to wait for all the scanners if the variable
+        is zero, negative or infinite.
+    """
+    value = os.environ.get(STORE_TIMEOUT_VARIABLE, "").strip()
+    if not value:
+        return default
+    try:
+        timeout = float(value)
+    except ValueError:
+        print(
+            f'Invalid {STORE_TIMEOUT_VARIABLE} "{value}", using {default} instead.',
+            file=sys.stderr,
+        )
+        return default
+    return timeout if 0 < timeout < float("inf") else None
 
-    # Name of the attribute for exposure:
-    _exposed_name: str
 
-    # Name of the internal method:
-    _internal_method_name: str
+_T = TypeVar("_T")
+
+
+def _expand(value: _T, game: BasicGame, template: _Template | None = None) -> _T:
+    """
+    Replace special paths in the given value, using the given template if the value
+    was already compiled.
+    """
+    if template is None:
+        template = _Template.of(value)
+    if template is None:
+        return value
+    return template.expand(game)  # type: ignore
 
-    # Required:
-    _required: bool
 
-    # Callable returning a default value (if not required):
-    _default: Callable[["BasicGame"], _T]
+class _MappingSpec(Generic[_T]):
+    """
+    Definition of a mapping: the attribute declaring it, the method it implements
+    and how to get a default value.
+    """
 
-    # Function to apply to the value:
-    _apply_fn: Callable[[_T | str], _T] | None
+    __slots__ = (
+        "exposed_name",
+        "internal_method",
+        "default",
+        "apply_fn",
+        "options",
+        "current_default",
+        "default_methods",
+    )
 
     def __init__(
         self,
-        game: BasicGame,
         exposed_name: str,
         internal_method: str,
         default: Callable[[BasicGame], _T] | None = None,
-        apply_fn: Callable[[_T | str], _T] | None = None,
+        apply_fn: Callable[[Any], _T] | None = None,
+        options: bool = False,
+        current_default: Callable[[BasicGame], Any] | None = None,
+        default_methods: tuple[str, ...] = (),
     ):
-        self._game = game
-        self._exposed_name = exposed_name
-        self._internal_method_name = internal_method
-        self._apply_fn = apply_fn
+        """
+        Args:
+            exposed_name: Name of the attribute declaring the mapping.
+            internal_method: Name of the method of BasicGame using the mapping.
+            default: Callable returning a default value, if the attribute is not
+                required.
+            apply_fn: Function to apply to the value of the attribute.
+            options: Whether the mapping holds multiple options (see
+                BasicGameOptionsMapping).
+            current_default: Callable returning the current value of an options
+                mapping without options.
+            default_methods: Methods of the game called by default, see
+                _MappingInfo.
+        """
+        self.exposed_name = exposed_name
+        self.internal_method = internal_method
+        self.default = default
+        self.apply_fn = apply_fn
+        self.options = options
+        self.current_default = current_default
+        self.default_methods = default_methods
 
-        if hasattr(game, self._exposed_name):
-            value = getattr(game, self._exposed_name)
 
-            if self._apply_fn is not None:
+class _MappingInfo(Generic[_T]):
+    """
+    Static part of a mapping for a game class, shared by all the instances: the
+    value of the attribute (converted with apply_fn and precompiled) or the default.
+
+    The value of a mapping is cached by the instances until the mappings are
+    invalidated (when the game path or the profile changes), unless it depends on a
+    method overridden by the game, e.g. the default saves directory of a game that
+    overrides documentsDirectory(), since the game may compute it from any state.
+    """
+
+    __slots__ = ("spec", "has_value", "value", "template", "methods", "cacheable")
+
+    def __init__(self, spec: _MappingSpec[_T], game: BasicGame):
+        self.spec = spec
+        self.has_value = hasattr(game, spec.exposed_name)
+        self.value: _T | None = None
+        self.template: _Template | None = None
+
+        # whether the value can be cached, see BasicGameMappings._infos():
+        self.cacheable = True
+
+        if self.has_value:
+            value = getattr(game, spec.exposed_name)
+
+            if spec.apply_fn is not None:
                 try:
-                    value = self._apply_fn(value)
+                    value = spec.apply_fn(value)
                 except Exception as err:
                     raise ValueError(
                         "Basic game plugin from {} has an invalid {} property.".format(
                             game._fromName,  # pyright: ignore[reportPrivateUsage]
-                            self._exposed_name,
+                            spec.exposed_name,
                         )
                     ) from err
-            self._default = lambda game: value  # type: ignore
-        elif default is not None:
-            self._default = default  # type: ignore
-        elif getattr(game.__class__, self._internal_method_name) is getattr(
-            BasicGame, self._internal_method_name
-        ):
+            self.value = value
+            self.template = _Template.of(value)
+        elif spec.default is None and getattr(
+            game.__class__, spec.internal_method
+        ) is getattr(BasicGame, spec.internal_method):
             raise ValueError(
                 "Basic game plugin from {} is missing {} property.".format(
                     game._fromName,  # pyright: ignore[reportPrivateUsage]
-                    self._exposed_name,
+                    spec.exposed_name,
                 )
             )
 
-    def get(self) -> _T:
-        """Return the value of this mapping."""
-        value = self._default(self._game)  # type: ignore
+        # methods of the game called to compute the value:
+        self.methods: set[str] = set()
+        if not self.has_value:
+            self.methods.update(spec.default_methods)
+        elif self.template is not None:
+            self.methods.update(self.template.methods)
 
-        if isinstance(value, str):
-            return replace_variables(value, self._game)  # type: ignore
-        elif isinstance(value, QDir):
-            return QDir(replace_variables(value.path(), self._game))  # type: ignore
 
-        # MO2 does not support Path anywhere so we always convert to str:
-        elif isinstance(value, Path):
-            return replace_variables(str(value), self._game)  # type: ignore
+class BasicGameMapping(Generic[_T]):
+    # Only the state of the mapping is stored per instance, see _MappingInfo:
+    __slots__ = ("_info", "_game", "_cached")
 
-        return value
+    def __init__(self, info: _MappingInfo[_T], game: BasicGame):
+        self._info = info
+        self._game = game
+
+        # Value returned by get(), until invalidate() is called:
+        self._cached: tuple[_T] | None = None
+
+    @property
+    def exposed_name(self) -> str:
+        """Name of the attribute that can be used to declare this mapping."""
+        return self._info.spec.exposed_name
+
+    def get(self) -> _T:
+        """Return the value of this mapping."""
+        cached = self._cached
+        if cached is None:
+            info = self._info
+            value: _T
+            if info.has_value:
+                value = _expand(info.value, self._game, info.template)  # type: ignore
+            else:
+                value = _expand(info.spec.default(self._game), self._game)  # type: ignore
+            cached = (value,)
+            if info.cacheable:
+                self._cached = cached
+
+        # QDir are mutable, so each caller gets its own (cheap) copy:
+        if isinstance(cached[0], QDir):
+            return QDir(cached[0])  # type: ignore
+        return cached[0]
+
+    def invalidate(self):
+        """
+        Clear the cached value of this mapping, so that special paths and defaults
+        are computed again.
+        """
+        self._cached = None
 
 
 class BasicGameOptionsMapping(BasicGameMapping[list[_T]]):
@@ -127,19 +417,14 @@ class BasicGameOptionsMapping(BasicGameMapping[list[_T]]):
     plugin is responsible to choose the right option depending on the context.
     """
 
-    _index: int
+    __slots__ = ("_index", "_current")
 
-    def __init__(
-        self,
-        game: BasicGame,
-        exposed_name: str,
-        internal_method: str,
-        default: Callable[[BasicGame], _T] | None = None,
-        apply_fn: Callable[[list[_T] | str], list[_T]] | None = None,
-    ):
-        super().__init__(game, exposed_name, internal_method, lambda g: [], apply_fn)
+    def __init__(self, info: _MappingInfo[list[_T]], game: BasicGame):
+        super().__init__(info, game)
         self._index = -1
-        self._current_default = default
+
+        # Index and value returned by current(), until invalidate() is called:
+        self._current: tuple[int, _T] | None = None
 
     def set_index(self, index: int):
         """
@@ -173,25 +458,203 @@ class BasicGameOptionsMapping(BasicGameMapping[list[_T]]):
         return self._index != -1
 
     def current(self) -> _T:
-        values = self._default(self._game)  # type: ignore
+        if self._current is None or self._current[0] != self._index:
+            values = self.get()
+
+            value: _T
+            if not values:
+                value = self._info.spec.current_default(self._game)  # type: ignore
+            elif self._index == -1:
+                value = _expand(values[0], self._game)
+            else:
+                value = _expand(values[self._index], self._game)
+
+            if not self._info.cacheable:
+                return value
+            self._current = (self._index, value)
+
+        value = self._current[1]
+        if isinstance(value, QDir):
+            return QDir(value)  # type: ignore
+        return value
 
-        if not values:
-            return self._current_default(self._game)  # type: ignore
+    def invalidate(self):
+        super().invalidate()
+        self._current = None
 
-        if self._index == -1:
-            value = values[0]
-        else:
-            value = values[self._index]
 
-        if isinstance(value, str):
-            return replace_variables(value, self._game)  # type: ignore
-        elif isinstance(value, QDir):
-            return QDir(replace_variables(value.path(), self._game))  # type: ignore
+# Convert Union[int, str, List[Union[int, str]]] to List[str].
+def _ids_apply(v: list[int] | list[str] | int | str) -> list[str]:
+    """
+    Convert various types to a list of string. If the given value is already a
+    list, returns a new list with all values converted to string, otherwise
+    returns a list with the value convert to a string as its only element.
+    """
+    if isinstance(v, (int, str)):
+        v = [str(v)]
+    return [str(x) for x in v]
 
-        return value
+
+def _list_apply(value: list[str] | str) -> list[str]:
+    return [c.strip() for c in value.split(",")] if isinstance(value, str) else value
+
+
+def _qdir_apply(value: QDir | str) -> QDir:
+    return QDir(value) if isinstance(value, str) else value
+
+
+def _default_documents_directory(game: BasicGame) -> QDir:
+    return QDir(
+        game._memoize(  # pyright: ignore[reportPrivateUsage]
+            "defaultDocumentsDirectory",
+            game._gamePath,  # pyright: ignore[reportPrivateUsage]
+            lambda: _probe_documents_directory(game),
+        )
+    )
+
+
+def _probe_documents_directory(game: BasicGame) -> QDir:
+    folders = [
+        "{}/My Games/{}".format(
+            QStandardPaths.writableLocation(
+                QStandardPaths.StandardLocation.DocumentsLocation
+            ),
+            game.gameName(),
+        ),
+        "{}/{}".format(
+            QStandardPaths.writableLocation(
+                QStandardPaths.StandardLocation.DocumentsLocation
+            ),
+            game.gameName(),
+        ),
+    ]
+    for folder in folders:
+        qdir = QDir(folder)
+        if qdir.exists():
+            return qdir
+
+    return QDir()
+
+
+# Game mappings, by name of the attribute of BasicGameMappings:
+_MAPPING_SPECS: dict[str, _MappingSpec[Any]] = {
+    "name": _MappingSpec("Name", "name"),
+    "author": _MappingSpec("Author", "author"),
+    "version": _MappingSpec(
+        "Version",
+        "version",
+        apply_fn=lambda s: mobase.VersionInfo(s) if isinstance(s, str) else s,
+    ),
+    "description": _MappingSpec(
+        "Description",
+        "description",
+        lambda g: "Adds basic support for game {}.".format(g.gameName()),
+        default_methods=("gameName",),
+    ),
+    "gameName": _MappingSpec("GameName", "gameName"),
+    "gameShortName": _MappingSpec("GameShortName", "gameShortName"),
+    "gameNexusName": _MappingSpec(
+        "GameNexusName",
+        "gameNexusName",
+        default=lambda g: g.gameShortName(),
+        default_methods=("gameShortName",),
+    ),
+    "gameThunderstoreName": _MappingSpec(
+        "GameThunderstoreName", "gameThunderstoreName", default=lambda g: ""
+    ),
+    "validShortNames": _MappingSpec(
+        "GameValidShortNames",
+        "validShortNames",
+        default=lambda g: [],
+        apply_fn=_list_apply,
+    ),
+    "nexusGameId": _MappingSpec(
+        "GameNexusId", "nexusGameID", default=lambda g: 0, apply_fn=int
+    ),
+    "binaryName": _MappingSpec("GameBinary", "binaryName"),
+    "launcherName": _MappingSpec(
+        "GameLauncher", "getLauncherName", default=lambda g: ""
+    ),
+    "dataDirectory": _MappingSpec("GameDataPath", "dataDirectory"),
+    "documentsDirectory": _MappingSpec(
+        "GameDocumentsDirectory",
+        "documentsDirectory",
+        apply_fn=_qdir_apply,
+        default=_default_documents_directory,
+        default_methods=("gameName",),
+    ),
+    "iniFiles": _MappingSpec(
+        "GameIniFiles", "iniFiles", lambda g: [], apply_fn=_list_apply
+    ),
+    "savesDirectory": _MappingSpec(
+        "GameSavesDirectory",
+        "savesDirectory",
+        apply_fn=_qdir_apply,
+        default=lambda g: g.documentsDirectory(),
+        default_methods=("documentsDirectory",),
+    ),
+    "savegameExtension": _MappingSpec(
+        "GameSaveExtension", "savegameExtension", default=lambda g: "save"
+    ),
+    "steamAPPId": _MappingSpec(
+        "GameSteamId",
+        "steamAPPId",
+        lambda g: [],
+        _ids_apply,
+        options=True,
+        current_default=lambda g: "",
+    ),
+    "gogAPPId": _MappingSpec(
+        "GameGogId",
+        "gogAPPId",
+        lambda g: [],
+        _ids_apply,
+        options=True,
+        current_default=lambda g: "",
+    ),
+    "originManifestIds": _MappingSpec(
+        "GameOriginManifestIds",
+        "originManifestIds",
+        lambda g: [],
+        _ids_apply,
+        options=True,
+        current_default=lambda g: "",
+    ),
+    "originWatcherExecutables": _MappingSpec(
+        "GameOriginWatcherExecutables",
+        "originWatcherExecutables",
+        apply_fn=lambda s: [s] if isinstance(s, str) else s,
+        default=lambda g: [],
+    ),
+    "epicAPPId": _MappingSpec(
+        "GameEpicId",
+        "epicAPPId",
+        lambda g: [],
+        _ids_apply,
+        options=True,
+        current_default=lambda g: "",
+    ),
+    "eaDesktopContentId": _MappingSpec(
+        "GameEaDesktopId",
+        "eaDesktopContentId",
+        lambda g: [],
+        _ids_apply,
+        options=True,
+        current_default=lambda g: "",
+    ),
+    "supportURL": _MappingSpec("GameSupportURL", "supportURL", default=lambda g: ""),
+}
 
 
 class BasicGameMappings:
+    """
+    Mappings of a game. The static part of the mappings (which attributes exist and
+    their converted values) is computed once per game class, the instances only hold
+    the state of each mapping.
+    """
+
+    __slots__ = ("_game", *_MAPPING_SPECS)
+
     name: BasicGameMapping[str]
     author: BasicGameMapping[str]
     version: BasicGameMapping[mobase.VersionInfo]
@@ -218,155 +681,100 @@ class BasicGameMappings:
     supportURL: BasicGameMapping[str]
 
     @staticmethod
-    def _default_documents_directory(game: mobase.IPluginGame):
-        folders = [
-            "{}/My Games/{}".format(
-                QStandardPaths.writableLocation(
-                    QStandardPaths.StandardLocation.DocumentsLocation
-                ),
-                game.gameName(),
-            ),
-            "{}/{}".format(
-                QStandardPaths.writableLocation(
-                    QStandardPaths.StandardLocation.DocumentsLocation
-                ),
-                game.gameName(),
-            ),
-        ]
-        for folder in folders:
-            qdir = QDir(folder)
-            if qdir.exists():
-                return qdir
+    def check_attributes(
+        attributes: dict[str, Any], overrides: Collection[str] = ()
+    ) -> tuple[list[tuple[str, str]], list[str]]:
+        """
+        Check game attributes (e.g. from an INI file) against the mappings, without
+        creating a game.
+
+        Args:
+            attributes: The attributes, by name (e.g. "GameName").
+            overrides: Name of the methods of BasicGame that are overridden by the
+                game, for which the corresponding attribute is not required.
+
+        Returns:
+            A list of (attribute, error) pairs for missing or invalid attributes,
+            and the list of attributes that do not correspond to any mapping.
+        """
+        errors: list[tuple[str, str]] = []
+        for spec in _MAPPING_SPECS.values():
+            if spec.exposed_name in attributes:
+                if spec.apply_fn is not None:
+                    try:
+                        spec.apply_fn(attributes[spec.exposed_name])
+                    except Exception as e:
+                        errors.append((spec.exposed_name, f"invalid value: {e}"))
+            elif spec.default is None and spec.internal_method not in overrides:
+                errors.append((spec.exposed_name, "missing property"))
+
+        exposed_names = {spec.exposed_name for spec in _MAPPING_SPECS.values()}
+        unknown = [name for name in attributes if name not in exposed_names]
+
+        return errors, unknown
 
-        return QDir()
+    # Static part of the mappings, by game class:
+    _infos_by_class: dict[type[BasicGame], dict[str, _MappingInfo[Any]]] = {}
+
+    @staticmethod
+    def _infos(game: BasicGame) -> dict[str, _MappingInfo[Any]]:
+        cls = game.__class__
+
+        # attributes set on the instance (e.g. INI games) cannot be shared:
+        shared = not any(
+            spec.exposed_name in vars(game) for spec in _MAPPING_SPECS.values()
+        )
+
+        if shared and cls in BasicGameMappings._infos_by_class:
+            return BasicGameMappings._infos_by_class[cls]
+
+        infos = {
+            name: _MappingInfo(spec, game) for name, spec in _MAPPING_SPECS.items()
+        }
+
+        # values depending on an overridden method, or on a mapping whose value is
+        # not cached, are not cached either
+        by_method = {info.spec.internal_method: info for info in infos.values()}
+        changed = True
+        while changed:
+            changed = False
+            for info in infos.values():
+                if info.cacheable and any(
+                    getattr(cls, method) is not getattr(BasicGame, method)
+                    or (method in by_method and not by_method[method].cacheable)
+                    for method in info.methods
+                ):
+                    info.cacheable = False
+                    changed = True
+
+        if shared:
+            BasicGameMappings._infos_by_class[cls] = infos
+        return infos
 
     # Game mappings:
     def __init__(self, game: BasicGame):
         self._game = game
 
-        self.name = BasicGameMapping(game, "Name", "name")
-        self.author = BasicGameMapping(game, "Author", "author")
-        self.version = BasicGameMapping(
-            game,
-            "Version",
-            "version",
-            apply_fn=lambda s: mobase.VersionInfo(s) if isinstance(s, str) else s,
-        )
-        self.description = BasicGameMapping(
-            game,
-            "Description",
-            "description",
-            lambda g: "Adds basic support for game {}.".format(g.gameName()),
-        )
-        self.gameName = BasicGameMapping(game, "GameName", "gameName")
-        self.gameShortName = BasicGameMapping(game, "GameShortName", "gameShortName")
-        self.gameNexusName = BasicGameMapping(
-            game,
-            "GameNexusName",
-            "gameNexusName",
-            default=lambda g: g.gameShortName(),
-        )
-        self.gameThunderstoreName = BasicGameMapping(
-            game,
-            "GameThunderstoreName",
-            "gameThunderstoreName",
-            default=lambda g: "",
-        )
-        self.validShortNames = BasicGameMapping(
-            game,
-            "GameValidShortNames",
-            "validShortNames",
-            default=lambda g: [],
-            apply_fn=lambda value: (
-                [c.strip() for c in value.split(",")]  # type: ignore
-                if isinstance(value, str)
-                else value
-            ),
-        )
-        self.nexusGameId = BasicGameMapping(
-            game, "GameNexusId", "nexusGameID", default=lambda g: 0, apply_fn=int
-        )
-        self.binaryName = BasicGameMapping(game, "GameBinary", "binaryName")
-        self.launcherName = BasicGameMapping(
-            game,
-            "GameLauncher",
-            "getLauncherName",
-            default=lambda g: "",
-        )
-        self.dataDirectory = BasicGameMapping(game, "GameDataPath", "dataDirectory")
-        self.documentsDirectory = BasicGameMapping(
-            game,
-            "GameDocumentsDirectory",
-            "documentsDirectory",
-            apply_fn=lambda s: QDir(s) if isinstance(s, str) else s,
-            default=BasicGameMappings._default_documents_directory,
-        )
-        self.iniFiles = BasicGameMapping(
-            game,
-            "GameIniFiles",
-            "iniFiles",
-            lambda g: [],
-            apply_fn=lambda value: (
-                [c.strip() for c in value.split(",")]
-                if isinstance(value, str)
-                else value
-            ),
-        )
-        self.savesDirectory = BasicGameMapping(
-            game,
-            "GameSavesDirectory",
-            "savesDirectory",
-            apply_fn=lambda s: QDir(s) if isinstance(s, str) else s,
-            default=lambda g: g.documentsDirectory(),
-        )
-        self.savegameExtension = BasicGameMapping(
-            game, "GameSaveExtension", "savegameExtension", default=lambda g: "save"
-        )
+        for name, info in BasicGameMappings._infos(game).items():
+            if info.spec.options:
+                setattr(self, name, BasicGameOptionsMapping(info, game))
+            else:
+                setattr(self, name, BasicGameMapping(info, game))
 
-        # Convert Union[int, str, List[Union[int, str]]] to List[str].
-        def ids_apply(v: list[int] | list[str] | int | str) -> list[str]:
-            """
-            Convert various types to a list of string. If the given value is already a
-            list, returns a new list with all values converted to string, otherwise
-            returns a list with the value convert to a string as its only element.
-            """
-            if isinstance(v, (int, str)):
-                v = [str(v)]
-            return [str(x) for x in v]
-
-        self.steamAPPId = BasicGameOptionsMapping(
-            game, "GameSteamId", "steamAPPId", default=lambda g: "", apply_fn=ids_apply
-        )
-        self.gogAPPId = BasicGameOptionsMapping(
-            game, "GameGogId", "gogAPPId", default=lambda g: "", apply_fn=ids_apply
-        )
-        self.originManifestIds = BasicGameOptionsMapping(
-            game,
-            "GameOriginManifestIds",
-            "originManifestIds",
-            default=lambda g: "",
-            apply_fn=ids_apply,
-        )
-        self.originWatcherExecutables = BasicGameMapping(
-            game,
-            "GameOriginWatcherExecutables",
-            "originWatcherExecutables",
-            apply_fn=lambda s: [s] if isinstance(s, str) else s,
-            default=lambda g: [],
-        )
-        self.epicAPPId = BasicGameOptionsMapping(
-            game, "GameEpicId", "epicAPPId", default=lambda g: "", apply_fn=ids_apply
-        )
-        self.eaDesktopContentId = BasicGameOptionsMapping(
-            game,
-            "GameEaDesktopId",
-            "eaDesktopContentId",
-            default=lambda g: "",
-            apply_fn=ids_apply,
-        )
-        self.supportURL = BasicGameMapping(
-            game, "GameSupportURL", "supportURL", default=lambda g: ""
-        )
+    def mappings(self) -> list[BasicGameMapping[Any]]:
+        """
+        Returns:
+            All the mappings of the game.
+        """
+        return [getattr(self, name) for name in _MAPPING_SPECS]
+
+    def invalidate(self):
+        """
+        Clear the cached values of all the mappings, e.g. when the game path or the
+        profile changes.
+        """
+        for mapping in self.mappings():
+            mapping.invalidate()
 
 
 class BasicGame(mobase.IPluginGame):
@@ -381,20 +789,139 @@ class BasicGame(mobase.IPluginGame):
     epic_games: dict[str, Path]
     eadesktop_games: dict[str, Path]
 
+    # Index from normalized install paths (see normalize_path) to the stores and IDs
+    # of the games installed there:
+    games_by_path: dict[str, list[tuple[str, str]]] = {}
+
+    # Watcher updating the Steam games, see watch_steam_libraries():
+    _steam_watcher: QObject | None = None
+
+    @staticmethod
+    def _store_games() -> dict[str, dict[str, Path]]:
+        return {
+            "Steam": BasicGame.steam_games,
+            "GOG": BasicGame.gog_games,
+            "Origin": BasicGame.origin_games,
+            "Epic Games": BasicGame.epic_games,
+            "EA Desktop": BasicGame.eadesktop_games,
+        }
+
+    @staticmethod
+    def index_games():
+        """
+        Build the index from install paths to games (games_by_path) from the games
+        found in each store.
+        """
+        index: dict[str, list[tuple[str, str]]] = {}
+        for store, games in BasicGame._store_games().items():
+            for game_id, path in games.items():
+                index.setdefault(normalize_path(path), []).append((store, game_id))
+        BasicGame.games_by_path = index
+
+    @staticmethod
+    def update_games(store: str, games: dict[str, Path | None]):
+        """
+        Update some of the games of a store, and the index from install paths to
+        games accordingly.
+
+        Args:
+            store: Name of the store (e.g. "Steam").
+            games: Mapping from game IDs to their new install location, or None for
+                games that are not installed anymore.
+        """
+        stores = list(BasicGame._store_games())
+        store_games = BasicGame._store_games()[store]
+        index = BasicGame.games_by_path
+
+        for game_id, path in games.items():
+            old_path = store_games.pop(game_id, None)
+            if old_path is not None:
+                key = normalize_path(old_path)
+                entries = [e for e in index.get(key, []) if e != (store, game_id)]
+                if entries:
+                    index[key] = entries
+                else:
+                    index.pop(key, None)
+
+            if path is not None:
+                store_games[game_id] = path
+                entries = index.setdefault(normalize_path(path), [])
+                entries.append((store, game_id))
+                # keep the order of index_games()
+                entries.sort(key=lambda e: stores.index(e[0]))
+
+    @staticmethod
+    def watch_steam_libraries():
+        """
+        Watch the Steam libraries and update the Steam games (and the index from
+        install paths to games) when games are installed, moved or uninstalled.
+        """
+        from .steam_utils import find_steam_path
+        from .steam_watcher import SteamLibraryWatcher
+
+        steam_path = find_steam_path()
+        if steam_path is None or BasicGame._steam_watcher is not None:
+            return
+
+        watcher = SteamLibraryWatcher(
+            steam_path,
+            BasicGame.steam_games,
+            lambda games: BasicGame.update_games("Steam", games),
+            FileCache("steam_games.json"),
+        )
+        watcher.start()
+        BasicGame._steam_watcher = watcher
+
     @staticmethod
-    def setup():
+    def setup(timeout: float | None = 10.0):
+        """
+        Find the games installed via the supported stores. The stores are scanned
+        concurrently.
+
+        Args:
+            timeout: Maximum time (in seconds) given to each store scanner, or None
+                to wait for all the scanners, see store_timeout(). Scanners that do
+                not complete in time are reported as errors, the games they found
+                before the timeout are kept.
+        """
         from .eadesktop_utils import find_games as find_eadesktop_games
         from .epic_utils import find_games as find_epic_games
         from .gog_utils import find_games as find_gog_games
         from .origin_utils import find_games as find_origin_games
         from .steam_utils import find_games as find_steam_games
 
-        errors: list[tuple[str, Exception]] = []
-        BasicGame.steam_games = find_steam_games()
-        BasicGame.gog_games = find_gog_games()
-        BasicGame.origin_games = find_origin_games()
-        BasicGame.epic_games = find_epic_games(errors)
-        BasicGame.eadesktop_games = find_eadesktop_games(errors)
+        errors: _ErrorList = []
+        games = _run_store_scanners(
+            {
+                "Steam": _with_file_cache(
+                    "steam_games.json",
+                    lambda games, errors, cache: find_steam_games(cache, games),
+                ),
+                "GOG": lambda games, errors: find_gog_games(games),
+                "Origin": _with_file_cache(
+                    "origin_games.json",
+                    lambda games, errors, cache: find_origin_games(cache, games),
+                ),
+                "Epic Games": _with_file_cache(
+                    "epic_games.json",
+                    lambda games, errors, cache: find_epic_games(errors, cache, games),
+                ),
+                "EA Desktop": _with_file_cache(
+                    "eadesktop_games.json",
+                    lambda games, errors, cache: find_eadesktop_games(
+                        errors, cache, games
+                    ),
+                ),
+            },
+            timeout,
+            errors,
+        )
+        BasicGame.steam_games = games["Steam"]
+        BasicGame.gog_games = games["GOG"]
+        BasicGame.origin_games = games["Origin"]
+        BasicGame.epic_games = games["Epic Games"]
+        BasicGame.eadesktop_games = games["EA Desktop"]
+        BasicGame.index_games()
 
         if errors:
             QMessageBox.critical(
@@ -415,15 +942,50 @@ class BasicGame(mobase.IPluginGame):
     # Path to the game, as set by MO2:
     _gamePath: str
 
+    # Results of the inspection of the game files (icon, version, ...), by name, with
+    # the key they were computed for, see _memoize():
+    _memoized: dict[str, tuple[object, Any]]
+
     def __init__(self):
-        super(BasicGame, self).__init__()
+        # a lazy plugin that is being replaced by its actual class already went
+        # through the mobase initialization, see basic_game_lazy.LazyBasicGame
+        if not getattr(self, "_lazy_materializing", False):
+            super(BasicGame, self).__init__()
 
         if not hasattr(self, "_fromName"):
             self._fromName = self.__class__.__name__
 
         self._gamePath = ""
+        self._memoized = {}
+
+        with measure("mappings", self.__class__.__name__):
+            self._mappings: BasicGameMappings = BasicGameMappings(self)
 
-        self._mappings: BasicGameMappings = BasicGameMappings(self)
+    def _memoize(self, name: str, key: object, compute: Callable[[], _T]) -> _T:
+        """
+        Memoize the result of an expensive inspection of the game files. Results are
+        cleared when the game path changes.
+
+        Args:
+            name: Name of the result.
+            key: Key the result depends on (e.g. path and modification time of a
+                file), the result is computed again when the key changes.
+            compute: Function computing the result.
+
+        Returns:
+            The (possibly memoized) result.
+        """
+        entry = self._memoized.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = compute()
+        self._memoized[name] = (key, value)
+        return value
+
+    def _binary_key(self) -> tuple[str, list[int] | None]:
+        path = self.gameDirectory().absoluteFilePath(self.binaryName())
+        return path, file_signature(path)
 
     def _register_feature(self, feature: mobase.GameFeature) -> bool:
         return self._organizer.gameFeatures().registerFeature(self, feature, 0, True)
@@ -451,6 +1013,9 @@ class BasicGame(mobase.IPluginGame):
 
         self._register_feature(BasicGameSaveGameInfo())
 
+        # Defaults and special paths of the mappings might depend on the profile:
+        organizer.onProfileChanged(lambda old, new: self._mappings.invalidate())
+
         if self._mappings.originWatcherExecutables.get():
             from .origin_utils import OriginWatcher
 
@@ -493,31 +1058,39 @@ class BasicGame(mobase.IPluginGame):
 
     # IPluginGame interface:
 
-    def detectGame(self):
+    def _find_game_path(self) -> Path | None:
+        """
+        Find the installation path of the game from the games found by setup().
+
+        Returns:
+            The path to the game, or None if the game was not found.
+        """
         for steam_id in self._mappings.steamAPPId.get():
             if steam_id in BasicGame.steam_games:
-                self.setGamePath(BasicGame.steam_games[steam_id])
-                return
+                return BasicGame.steam_games[steam_id]
 
         for gog_id in self._mappings.gogAPPId.get():
             if gog_id in BasicGame.gog_games:
-                self.setGamePath(BasicGame.gog_games[gog_id])
-                return
+                return BasicGame.gog_games[gog_id]
 
         for origin_manifest_id in self._mappings.originManifestIds.get():
             if origin_manifest_id in BasicGame.origin_games:
-                self.setGamePath(BasicGame.origin_games[origin_manifest_id])
-                return
+                return BasicGame.origin_games[origin_manifest_id]
 
         for epic_id in self._mappings.epicAPPId.get():
             if epic_id in BasicGame.epic_games:
-                self.setGamePath(BasicGame.epic_games[epic_id])
-                return
+                return BasicGame.epic_games[epic_id]
 
         for eadesktop_content_id in self._mappings.eaDesktopContentId.get():
             if eadesktop_content_id in BasicGame.eadesktop_games:
-                self.setGamePath(BasicGame.eadesktop_games[eadesktop_content_id])
-                return
+                return BasicGame.eadesktop_games[eadesktop_content_id]
+
+        return None
+
+    def detectGame(self):
+        path = self._find_game_path()
+        if path is not None:
+            self.setGamePath(path)
 
     def gameName(self) -> str:
         return self._mappings.gameName.get()
@@ -526,8 +1099,9 @@ class BasicGame(mobase.IPluginGame):
         return self._mappings.gameShortName.get()
 
     def gameIcon(self) -> QIcon:
-        return mobase.getIconForExecutable(
-            self.gameDirectory().absoluteFilePath(self.binaryName())
+        key = self._binary_key()
+        return self._memoize(
+            "gameIcon", key, lambda: mobase.getIconForExecutable(key[0])
         )
 
     def validShortNames(self) -> list[str]:
@@ -617,11 +1191,12 @@ class BasicGame(mobase.IPluginGame):
         pass
 
     def gameVersion(self) -> str:
-        return mobase.getFileVersion(
-            self.gameDirectory().absoluteFilePath(self.binaryName())
-        )
+        key = self._binary_key()
+        return self._memoize("gameVersion", key, lambda: mobase.getFileVersion(key[0]))
 
     def looksValid(self, directory: QDir):
+        # not memoized: the check is a single stat, and the directory can change
+        # while MO2 probes it (e.g. the game being installed)
         return directory.exists(self.binaryName())
 
     def isInstalled(self) -> bool:
@@ -640,26 +1215,20 @@ class BasicGame(mobase.IPluginGame):
 
     def setGamePath(self, path: Path | str) -> None:
         self._gamePath = str(path)
-
-        path = Path(path)
+        self._memoized.clear()
+        self._mappings.invalidate()
 
         # Check if we have a matching steam, GOG, Origin or EA Desktop id and set the
         # index accordingly:
-        for steamid, steampath in BasicGame.steam_games.items():
-            if steampath == path:
-                self._mappings.steamAPPId.set_value(steamid)
-        for gogid, gogpath in BasicGame.gog_games.items():
-            if gogpath == path:
-                self._mappings.gogAPPId.set_value(gogid)
-        for originid, originpath in BasicGame.origin_games.items():
-            if originpath == path:
-                self._mappings.originManifestIds.set_value(originid)
-        for epicid, epicpath in BasicGame.epic_games.items():
-            if epicpath == path:
-                self._mappings.epicAPPId.set_value(epicid)
-        for eadesktopid, eadesktoppath in BasicGame.eadesktop_games.items():
-            if eadesktoppath == path:
-                self._mappings.eaDesktopContentId.set_value(eadesktopid)
+        store_mappings = {
+            "Steam": self._mappings.steamAPPId,
+            "GOG": self._mappings.gogAPPId,
+            "Origin": self._mappings.originManifestIds,
+            "Epic Games": self._mappings.epicAPPId,
+            "EA Desktop": self._mappings.eaDesktopContentId,
+        }
+        for store, game_id in BasicGame.games_by_path.get(normalize_path(path), []):
+            store_mappings[store].set_value(game_id)
 
     def documentsDirectory(self) -> QDir:
         return self._mappings.documentsDirectory.get()
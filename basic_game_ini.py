@@ -2,22 +2,135 @@
 
 import configparser
 import os
+from collections.abc import Sequence
+from pathlib import Path
 
-from .basic_game import BasicGame
+from .basic_game import BasicGame, BasicGameMappings
+from .cache_utils import FileCache
 
 
-class BasicIniGame(BasicGame):
-    def __init__(self, path: str):
-        # Set the _fromName to get more "correct" errors:
-        self._fromName = os.path.basename(path)
+def read_ini_game(path: Path | str) -> dict[str, str]:
+    """
+    Read the definition of a game from an INI file.
+
+    Args:
+        path: Path to the INI file.
+
+    Returns:
+        The attributes of the game (e.g. "GameName"), from the DEFAULT section.
+    """
+    config = configparser.ConfigParser()
+    config.optionxform = str  # type: ignore
+    config.read(path)
+    return dict(config["DEFAULT"].items())
 
-        # Read the file:
-        config = configparser.ConfigParser()
-        config.optionxform = str  # type: ignore
-        config.read(path)
 
-        # Just fill the class with values:
-        for k, v in config["DEFAULT"].items():
-            setattr(self, k, v)
+class BasicIniGame(BasicGame):
+    def __init__(self, path: str | None = None):
+        """
+        Args:
+            path: Path to the INI file defining the game, or None if the attributes
+                are already set on the class (see IniGameRegistry).
+        """
+        if path is not None:
+            # Set the _fromName to get more "correct" errors:
+            self._fromName = os.path.basename(path)
+
+            # Just fill the class with values:
+            for k, v in read_ini_game(path).items():
+                setattr(self, k, v)
 
         super().__init__()
+
+
+def ini_game_class(path: str, attributes: dict[str, str]) -> type[BasicIniGame]:
+    """
+    Create the class of the game defined in an INI file.
+
+    Args:
+        path: Path to the INI file.
+        attributes: The attributes of the game, see `read_ini_game()`.
+
+    Returns:
+        A BasicIniGame subclass, named after the file, with the attributes of the
+        game as class attributes.
+    """
+    name = os.path.basename(path)
+    return type(
+        os.path.splitext(name)[0], (BasicIniGame,), {**attributes, "_fromName": name}
+    )
+
+
+class IniGameRegistry:
+    """
+    Definitions of the games from INI files.
+
+    All the files are parsed in one pass (unchanged files are read from a cache) and
+    checked against the game mappings, so that all the invalid definitions can be
+    reported at once. Games are only created when requested, from a class built once
+    per definition.
+    """
+
+    def __init__(self, paths: Sequence[str], cache: FileCache | None = None):
+        """
+        Args:
+            paths: Paths to the INI files.
+            cache: Cache for the content of the INI files, a new cache is used (and
+                saved) if None.
+        """
+        self._definitions: dict[str, dict[str, str]] = {}
+        self._classes: dict[str, type[BasicIniGame]] = {}
+
+        # Errors and warnings, as "file: attribute: message":
+        self.errors: list[str] = []
+        self.warnings: list[str] = []
+
+        file_cache = FileCache("ini_games.json") if cache is None else cache
+        for path in paths:
+            name = os.path.basename(path)
+            try:
+                attributes = file_cache.get(Path(path), read_ini_game)
+            except Exception as e:
+                # invalid syntax or encoding, unreadable file, ...
+                self.errors.append(f"{name}: {e}")
+                continue
+
+            errors, unknown = BasicGameMappings.check_attributes(attributes)
+            self.errors.extend(f"{name}: {key}: {error}" for key, error in errors)
+            self.warnings.extend(f"{name}: {key}: unknown property" for key in unknown)
+            if not errors:
+                self._definitions[path] = attributes
+
+        if cache is None:
+            file_cache.save()
+
+    def paths(self) -> list[str]:
+        """
+        Returns:
+            The paths of the valid definitions.
+        """
+        return list(self._definitions)
+
+    def create(self, path: str) -> BasicIniGame:
+        """
+        Create the game defined in the given INI file.
+
+        Args:
+            path: Path to the INI file, must be one of paths().
+
+        Returns:
+            The game.
+        """
+        cls = self._classes.get(path)
+        if cls is None:
+            cls = self._classes[path] = ini_game_class(path, self._definitions[path])
+        return cls()
+
+    def create_all(self) -> list[BasicIniGame]:
+        """
+        Create all the valid games.
+
+        Returns:
+            The games, in the order of the paths given to the registry.
+        """
+        return [self.create(path) for path in self._definitions]
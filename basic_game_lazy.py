@@ -0,0 +1,376 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Lazy loading of game plugins.
+
+Importing every game module (and their dependencies) at startup is costly while only
+a single game is managed by MO2. On the first run, game plugins are loaded normally
+and a manifest describing them (declared attributes, overridden methods, settings)
+is stored in the plugin data folder. Games defined by INI files are listed in the
+manifest too, so that their files are not read and checked on every run. On the next
+runs, `LazyBasicGame` proxies are created from this manifest, and the actual game
+module is only imported when MO2 needs something the manifest cannot provide (e.g.
+when the game becomes the managed game).
+
+The manifest is only used while no python or INI file of the plugin package changed
+(see `package_signature()`), since a game module depends on other modules of the
+package (basic features, other game modules, ...).
+
+Plugins that override `init()` are only initialized once their module is imported,
+see `LazyBasicGame.init()`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import mobase
+
+from .basic_game import BasicGame
+from .basic_game_ini import ini_game_class, read_ini_game
+from .cache_utils import load_json_cache, save_json_cache
+from .startup_report import measure, write_report
+
+# Bump when the content of the manifest changes:
+MANIFEST_VERSION = 2
+
+MANIFEST_FILENAME = "plugin_manifest.json"
+
+# Methods that are handled by LazyBasicGame and never trigger the loading of the
+# actual plugin:
+_LAZY_METHODS = {"init", "settings"}
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def _is_json_value(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(map(_is_scalar, value))  # pyright: ignore[reportUnknownArgumentType]
+    return _is_scalar(value)
+
+
+class LazyBasicGame(BasicGame):
+    """
+    Proxy for a game plugin (from a python module or an INI file), created from its
+    manifest entry.
+
+    The proxy exposes the attributes of the actual plugin so that all the methods of
+    `BasicGame` work as-is. Methods overridden by the actual plugin load it and
+    replace the class of the proxy by the actual one, so that MO2 keeps using the
+    same plugin object. Calls to `init()` are deferred until the plugin is loaded
+    if the actual plugin overrides it.
+    """
+
+    # Name of the module (inside games/) containing the actual plugin, or of the INI
+    # file defining it:
+    _lazy_module: str
+
+    # Settings of the plugin, from the manifest:
+    _lazy_settings: list[tuple[str, str, mobase.MoVariant]] | None = None
+
+    # Whether the actual plugin overrides init(), which is then deferred:
+    _lazy_init: bool = False
+
+    @staticmethod
+    def create_class(module: str, entry: dict[str, Any]) -> type[LazyBasicGame]:
+        """
+        Create a LazyBasicGame class for the given manifest entry.
+
+        Args:
+            module: Name of the module containing the plugin, or of the INI file
+                defining it, relative to games/.
+            entry: Manifest entry of the plugin, see `LazyBasicGame.manifest_entry`.
+
+        Returns:
+            A LazyBasicGame subclass with the same name as the actual plugin class.
+        """
+        overrides: list[str] = entry["overrides"]
+
+        # detectGame() calls setGamePath() which needs the actual plugin when
+        # overridden
+        if "setGamePath" in overrides and "detectGame" not in overrides:
+            overrides = overrides + ["detectGame"]
+
+        namespace: dict[str, Any] = dict(entry["attributes"])
+        namespace["_lazy_module"] = module
+        namespace["_lazy_init"] = "init" in overrides
+        if entry["settings"] is not None:
+            namespace["_lazy_settings"] = [tuple(s) for s in entry["settings"]]
+        for name in overrides:
+            if name not in _LAZY_METHODS:
+                namespace[name] = LazyBasicGame._materializing_method(name)
+
+        return type(entry["class"], (LazyBasicGame,), namespace)
+
+    @staticmethod
+    def manifest_entry(game: BasicGame) -> dict[str, Any] | None:
+        """
+        Create the manifest entry for the given plugin.
+
+        Args:
+            game: The plugin to create the entry for.
+
+        Returns:
+            The manifest entry, or None if the plugin cannot be loaded lazily.
+        """
+        cls = game.__class__
+
+        # plugins implementing other interfaces must be loaded
+        if any(
+            base.__module__ == "mobase" and base not in BasicGame.__mro__
+            for base in cls.__mro__
+        ):
+            return None
+
+        attributes: dict[str, Any] = {}
+        for mapping in game._mappings.mappings():
+            name = mapping.exposed_name
+            if hasattr(game, name):
+                value = getattr(game, name)
+                if not _is_json_value(value):
+                    return None
+                attributes[name] = value
+
+        overrides: set[str] = set()
+        for klass in cls.__mro__[: cls.__mro__.index(BasicGame)]:
+            for name, value in vars(klass).items():
+                if (
+                    callable(value)
+                    and not name.startswith("__")
+                    and hasattr(BasicGame, name)
+                ):
+                    overrides.add(name)
+
+        settings: list[list[Any]] | None = None
+        if "settings" in overrides:
+            try:
+                settings = [
+                    [s.key, s.description, s.default_value] for s in game.settings()
+                ]
+            except Exception:
+                settings = None
+
+            if settings is None or not all(_is_scalar(s[2]) for s in settings):
+                return None
+
+        return {
+            "class": cls.__name__,
+            "attributes": attributes,
+            "overrides": sorted(overrides),
+            "settings": settings,
+        }
+
+    @staticmethod
+    def _materializing_method(name: str) -> Callable[..., Any]:
+        def method(self: LazyBasicGame, *args: Any, **kwargs: Any) -> Any:
+            self._materialize()
+            return getattr(self, name)(*args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+    def _materialize(self) -> None:
+        """
+        Load the actual plugin and replace the class of this object by it.
+        """
+        cls: Any
+        with measure("materialize", self._lazy_module):
+            if self._lazy_module.endswith(".ini"):
+                path = str(Path(__file__).parent.joinpath("games", self._lazy_module))
+                cls = ini_game_class(path, read_ini_game(path))
+            else:
+                module = importlib.import_module(
+                    ".games." + self._lazy_module, __package__
+                )
+                cls = getattr(module, self.__class__.__name__)
+
+            # only set if init() was deferred
+            organizer: mobase.IOrganizer | None = vars(self).pop(
+                "_lazy_organizer", None
+            )
+            game_path = self._gamePath
+
+            self.__class__ = cls
+            self._lazy_materializing = True
+            try:
+                cls.__init__(self)
+            finally:
+                del self._lazy_materializing
+
+            if organizer is not None:
+                self.init(organizer)
+            if game_path:
+                self.setGamePath(game_path)
+
+        # the report was written once the plugins were created, before this
+        write_report()
+
+    def init(self, organizer: mobase.IOrganizer) -> bool:
+        """
+        Initialize the plugin. If the actual plugin overrides `init()`, it is only
+        called once the plugin is loaded (e.g. when the game becomes the managed
+        game), and anything it does (registering features, connecting to the
+        signals of the organizer, ...) is deferred until then. Otherwise, the plugin
+        is initialized right away, as by `BasicGame.init()`.
+        """
+        if self._lazy_init:
+            self._lazy_organizer = organizer
+            return True
+        return super().init(organizer)
+
+    def settings(self) -> list[mobase.PluginSetting]:
+        if self._lazy_settings is None:
+            return super().settings()
+        return [
+            mobase.PluginSetting(key, description, default_value)
+            for key, description, default_value in self._lazy_settings
+        ]
+
+    def detectGame(self) -> None:
+        # only the store IDs are needed to detect the game, so the path is set
+        # without loading the actual plugin
+        path = self._find_game_path()
+        if path is not None:
+            BasicGame.setGamePath(self, path)
+
+    def setGamePath(self, path: Path | str) -> None:
+        # MO2 only sets the path of the managed game, or of a game being configured,
+        # so this is when the actual plugin is needed
+        self._materialize()
+        self.setGamePath(path)
+
+
+def package_signature(package_path: str) -> list[list[Any]]:
+    """
+    Compute a signature of the plugin package that changes when any of its python or
+    INI files is modified, added or removed. Only the folders that are python packages
+    (e.g. basic_features/, games/ and its sub-packages) are searched, so bundled
+    dependencies and virtual environments are left out.
+
+    Args:
+        package_path: Path to the basic games folder.
+
+    Returns:
+        The [path, size, mtime] of every python or INI file, relative to the package,
+        in a stable order.
+    """
+    signature: list[list[Any]] = []
+
+    def walk(folder: str, relative: str) -> None:
+        try:
+            entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            name = relative + entry.name
+            try:
+                if entry.is_dir():
+                    if os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                        walk(entry.path, name + "/")
+                elif entry.name.endswith((".py", ".ini")):
+                    # the stat from scandir is free on Windows
+                    st = entry.stat()
+                    signature.append([name, st.st_size, st.st_mtime_ns])
+            except OSError:
+                continue
+
+    walk(package_path, "")
+    return signature
+
+
+def load_manifest(signature: list[list[Any]]) -> dict[str, Any]:
+    """
+    Load the plugin manifest.
+
+    Args:
+        signature: Current signature of the plugin package, see
+            `package_signature()`. The manifest is ignored if it was saved for
+            another signature.
+
+    Returns:
+        The modules of the manifest, mapping module names to their entries, or an
+        empty dictionary if there is no valid manifest.
+    """
+    manifest = load_json_cache(MANIFEST_FILENAME)
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("package") != signature
+    ):
+        return {}
+    return manifest.get("modules", {})
+
+
+def save_manifest(signature: list[list[Any]], modules: dict[str, Any]) -> None:
+    """
+    Save the plugin manifest.
+
+    Args:
+        signature: Signature of the plugin package, see `package_signature()`.
+        modules: Mapping from module names to their entries.
+    """
+    save_json_cache(
+        MANIFEST_FILENAME,
+        {"version": MANIFEST_VERSION, "package": signature, "modules": modules},
+    )
+
+
+def lazy_plugins(
+    module: str, entry: dict[str, Any] | None
+) -> list[LazyBasicGame] | None:
+    """
+    Create lazy plugins for a module or an INI file from its manifest entry.
+
+    Args:
+        module: Name of the module or of the INI file, relative to games/.
+        entry: Entry of the module in the manifest, if any.
+
+    Returns:
+        The list of lazy plugins, or None if the module needs to be imported (no
+        entry or module that cannot be loaded lazily).
+    """
+    if entry is None or entry.get("plugins") is None:
+        return None
+
+    plugins: list[LazyBasicGame] = []
+    for plugin_entry in entry["plugins"]:
+        try:
+            plugins.append(LazyBasicGame.create_class(module, plugin_entry)())
+        except Exception as e:
+            print(
+                "Failed to create lazy plugin {} from {}: {}".format(
+                    plugin_entry.get("class"), module, e
+                ),
+                file=sys.stderr,
+            )
+            return None
+    return plugins
+
+
+def module_entry(plugins: list[BasicGame]) -> dict[str, Any]:
+    """
+    Create the manifest entry of a module or an INI file from the plugins it
+    contains.
+
+    Args:
+        plugins: Plugins instantiated from the module or the INI file.
+
+    Returns:
+        The manifest entry for the module.
+    """
+    entries: list[dict[str, Any]] | None = []
+    for plugin in plugins:
+        entry = LazyBasicGame.manifest_entry(plugin)
+        if entry is None:
+            entries = None
+            break
+        entries.append(entry)
+
+    return {"plugins": entries}
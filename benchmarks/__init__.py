@@ -0,0 +1,15 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Tools to run parts of the game plugins outside of MO2.
+
+The mobase module is only available inside MO2, so `fake_mobase` provides a
+pure-Python stand-in, with an in-memory implementation of the file trees, that is
+enough to import the game plugins and to exercise their mod data checkers and
+contents. See `mod_checkers` for the benchmark of the mod data checkers.
+
+This package is not used by the plugins, and must be run from the root of the
+repository, e.g.:
+
+    python -m benchmarks.mod_checkers --help
+"""
@@ -0,0 +1,205 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Synthetic mod archives, modelled on common layouts of the archives found on Nexus.
+
+Each layout is a function returning the paths of the files of an archive with the
+given number of files. Layouts are deterministic for a given random generator.
+"""
+
+import random
+from collections.abc import Callable, Iterable
+
+from .fake_mobase import IFileTree
+
+Layout = Callable[[int, random.Random], list[str]]
+
+_TEXTURES = ["dds", "png", "tga"]
+_MIXED = ["esp", "dll", "pak", "txt", "json", "ini", "dds", "lua", "xml", "cfg"]
+
+
+def _name(rng: random.Random, prefix: str = "") -> str:
+    return prefix + "".join(rng.choices("abcdefghijklmnopqrstuvwxyz_", k=8))
+
+
+def _files(
+    count: int,
+    rng: random.Random,
+    folder: str,
+    extensions: list[str],
+    depth: int = 2,
+    width: int = 8,
+) -> list[str]:
+    # files spread over random sub-folders of the given folder, at most depth deep
+    folders = [folder]
+    for _ in range(max(1, count // 20)):
+        parent = rng.choice(folders)
+        if parent.count("/") - folder.count("/") < depth and rng.randrange(width):
+            folders.append(f"{parent}/{_name(rng)}".lstrip("/"))
+    return [
+        f"{rng.choice(folders)}/{_name(rng)}{i}.{rng.choice(extensions)}".lstrip("/")
+        for i in range(count)
+    ]
+
+
+def flat(count: int, rng: random.Random) -> list[str]:
+    """Files of various types at the root of the archive."""
+    return [f"{_name(rng)}{i}.{rng.choice(_MIXED)}" for i in range(count)]
+
+
+def wrapped_data(count: int, rng: random.Random) -> list[str]:
+    """Single top-level folder (name and version of the mod) around a Data folder."""
+    return ["My Mod-1234-1-0/readme.txt"] + _files(
+        count - 1, rng, "My Mod-1234-1-0/Data/textures", _TEXTURES
+    )
+
+
+def loose_textures(count: int, rng: random.Random) -> list[str]:
+    """Texture replacer, with textures and meshes folders at the root."""
+    half = count // 2
+    return _files(half, rng, "textures", _TEXTURES) + _files(
+        count - half, rng, "meshes", ["nif"]
+    )
+
+
+def deep(count: int, rng: random.Random) -> list[str]:
+    """Deep nesting, up to 12 folders, under a single top-level folder."""
+    return _files(count, rng, "Deep", _MIXED, depth=12, width=2)
+
+
+def bepinex(count: int, rng: random.Random) -> list[str]:
+    """BepInEx plugins and configuration, with a manifest (Thunderstore)."""
+    return [
+        "manifest.json",
+        "icon.png",
+        "README.md",
+        "BepInEx/config/mod.cfg",
+    ] + _files(count - 4, rng, "BepInEx/plugins/MyMod", ["dll", "json", "png"])
+
+
+def unreal_paks(count: int, rng: random.Random) -> list[str]:
+    """Unreal Engine pak mods, with the I/O store files, and UE4SS Lua mods."""
+    paks = [
+        f"Content/Paks/~mods/MyMod{i // 3}_P.{('pak', 'ucas', 'utoc')[i % 3]}"
+        for i in range(count // 2)
+    ]
+    return paks + _files(
+        count - len(paks), rng, "Binaries/Win64/ue4ss/Mods/MyMod/Scripts", ["lua"]
+    )
+
+
+def ue5_nested(count: int, rng: random.Random) -> list[str]:
+    """
+    Unreal Engine 5 paks and DLLs at their location in the game folder, some of them
+    under a _ROOT folder (Root Builder).
+    """
+    paks = [
+        f"{prefix}End/Content/Paks/~Mods/MyMod{i // 3}_P.{('pak', 'ucas', 'utoc')[i % 3]}"
+        for i, prefix in enumerate(rng.choices(["", "_ROOT/"], k=count // 2))
+    ]
+    return paks + [
+        f"{rng.choice(['', '_ROOT/'])}End/Binaries/Win64/{_name(rng)}{i}.dll"
+        for i in range(count - len(paks))
+    ]
+
+
+def ue5_merged(count: int, rng: random.Random) -> list[str]:
+    """
+    Large merged Unreal Engine 5 mod, cooked assets spread over thousands of folders
+    next to the paks of the merged mods, in a wrapper folder.
+    """
+    paks = [
+        f"Merged Mod/Paks/~mods/Merged{i // 3}_P.{('pak', 'ucas', 'utoc')[i % 3]}"
+        for i in range(max(3, count // 100))
+    ]
+    return paks + _files(
+        count - len(paks),
+        rng,
+        "Merged Mod/OblivionRemastered/Content",
+        ["uasset", "uexp", "ubulk"],
+        depth=6,
+        width=4,
+    )
+
+
+def bg3(count: int, rng: random.Random) -> list[str]:
+    """Baldur's Gate 3 pak mods, loose files and Script Extender files."""
+    third = count // 3
+    return (
+        ["info.json", "bin/DWrite.dll"]
+        + [f"Mods/{_name(rng)}{i}.pak" for i in range(third)]
+        + _files(third, rng, "Public/MyMod/Assets", _TEXTURES + ["lsx"])
+        + _files(count - 2 * third - 2, rng, "Localization/English", ["xml"])
+    )
+
+
+def cyberpunk(count: int, rng: random.Random) -> list[str]:
+    """Cyberpunk 2077 archives, redscript, RED4ext and CET mods."""
+    quarter = count // 4
+    return (
+        [f"archive/pc/mod/{_name(rng)}{i}.archive" for i in range(quarter)]
+        + _files(quarter, rng, "r6/scripts/MyMod", ["reds"])
+        + _files(quarter, rng, "red4ext/plugins/MyMod", ["dll", "toml"])
+        + _files(
+            count - 3 * quarter,
+            rng,
+            "bin/x64/plugins/cyber_engine_tweaks/mods/MyMod",
+            ["lua", "json"],
+        )
+    )
+
+
+def sims4(count: int, rng: random.Random) -> list[str]:
+    """The Sims 4 packages and scripts, nested too deeply in a wrapper folder."""
+    return ["MyMod/Scripts/mymod.ts4script"] + _files(
+        count - 1, rng, "MyMod/Mods/CC/Hair/Long", ["package"], depth=4
+    )
+
+
+def stalker(count: int, rng: random.Random) -> list[str]:
+    """S.T.A.L.K.E.R. gamedata with a FOMOD installer."""
+    return ["fomod/ModuleConfig.xml", "fomod/info.xml"] + _files(
+        count - 2,
+        rng,
+        "gamedata",
+        ["ltx", "script", "dds", "ogg", "xml"],
+        depth=4,
+    )
+
+
+LAYOUTS: dict[str, Layout] = {
+    "flat": flat,
+    "wrapped-data": wrapped_data,
+    "loose-textures": loose_textures,
+    "deep": deep,
+    "bepinex": bepinex,
+    "unreal-paks": unreal_paks,
+    "ue5-nested": ue5_nested,
+    "ue5-merged": ue5_merged,
+    "bg3": bg3,
+    "cyberpunk": cyberpunk,
+    "sims4": sims4,
+    "stalker": stalker,
+}
+
+
+def build_tree(paths: Iterable[str]) -> IFileTree:
+    """
+    Build a tree from the paths of its files.
+
+    Args:
+        paths: Paths of the files, separated by /.
+
+    Returns:
+        The root of the tree.
+    """
+    root = IFileTree()
+    folders: dict[str, IFileTree] = {"": root}
+    for path in paths:
+        folder, _, name = path.rpartition("/")
+        tree = folders.get(folder)
+        if tree is None:
+            tree = folders[folder] = root.addDirectory(folder)
+        if not tree.exists(name):
+            tree.addFile(name)
+    return root
@@ -0,0 +1,144 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Micro-benchmark of the classification of the entries of a tree by
+`BasicModDataChecker`, with the combined regex of `RegexPatterns.classify()` and with
+one regex match per category (ignore, unfold, valid, delete, then every move
+pattern), as before the combined regex.
+
+The names of the top-level entries of synthetic archives (see `archives`) are
+classified with the patterns of every `BasicModDataChecker` registered by the game
+plugins. The fastest of the runs is reported, and the results of both classifiers
+are compared.
+
+Run from the root of the repository:
+
+    python -m benchmarks.classifier --sizes 100 10000 --layouts flat
+"""
+
+import argparse
+import importlib
+import random
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from PyQt6.QtWidgets import QApplication
+
+from .archives import LAYOUTS, build_tree
+from .mod_checkers import registered_features
+from .plugins import PACKAGE
+
+
+def _per_category(rp: Any) -> Callable[[str], tuple[str, str | None] | None]:
+    # classification with a regex match per category, in order of precedence
+    def classify(value: str) -> tuple[str, str | None] | None:
+        for category in ("ignore", "unfold", "valid", "delete"):
+            if getattr(rp, category).match(value):
+                return category, None
+        move_key = rp.move_match(value)
+        return None if move_key is None else ("move", move_key)
+
+    return classify
+
+
+def _time(classify: Callable[[str], object], names: list[str], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            classify(name)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(
+    features: Sequence[tuple[str, Any]],
+    layouts: Sequence[str],
+    sizes: Sequence[int],
+    repeat: int = 5,
+) -> int:
+    """
+    Run the benchmark, see the module documentation.
+
+    Returns:
+        The number of names classified differently by the two classifiers.
+    """
+    checker_module = importlib.import_module(
+        f"{PACKAGE}.basic_features.basic_mod_data_checker"
+    )
+
+    # games sharing the same patterns are only run once
+    patterns: dict[Any, str] = {}
+    for game, feature in features:
+        if isinstance(feature, checker_module.BasicModDataChecker):
+            globs = feature._file_patterns  # pyright: ignore[reportPrivateUsage]
+            patterns.setdefault(globs.key(), game)
+
+    print(
+        f"{'game':30} {'layout':15} {'entries':>7}"
+        f" {'combined (ms)':>13} {'per category (ms)':>17} {'speedup':>8}"
+    )
+    errors = 0
+    for layout in layouts:
+        for size in sizes:
+            tree = build_tree(LAYOUTS[layout](size, random.Random(f"{layout}-{size}")))
+            names = [entry.name().casefold() for entry in tree]
+            for key, game in patterns.items():
+                rp = checker_module.RegexPatterns.of(
+                    checker_module.GlobPatterns.from_key(key)
+                )
+                per_category = _per_category(rp)
+
+                for name in names:
+                    if rp.classify(name) != per_category(name):
+                        errors += 1
+                        print(
+                            f"error: {game}: {name} is classified as"
+                            f" {rp.classify(name)} instead of {per_category(name)}",
+                            file=sys.stderr,
+                        )
+
+                combined = _time(rp.classify, names, repeat)
+                reference = _time(per_category, names, repeat)
+                print(
+                    f"{game[:30]:30} {layout:15} {len(names):>7}"
+                    f" {combined * 1000:>13.3f} {reference * 1000:>17.3f}"
+                    f" {reference / combined if combined else 0:>7.2f}x"
+                )
+    return errors
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.classifier",
+        description="Micro-benchmark of the classifier of BasicModDataChecker.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 10000],
+        help="numbers of files of the archives (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--layouts",
+        nargs="+",
+        choices=list(LAYOUTS),
+        default=["flat"],
+        help="layouts of the archives (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per archive")
+    args = parser.parse_args(argv)
+
+    # some plugins use Qt when initialized
+    if QApplication.instance() is None:
+        _app = QApplication(sys.argv[:1])
+
+    if benchmark(registered_features(), args.layouts, args.sizes, args.repeat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Pure-Python stand-in for the mobase module, to run the game plugins outside of MO2.
+
+Only the file trees (`FileTreeEntry` and `IFileTree`), `ModDataChecker` and
+`ModDataContent` are implemented. Any other name of mobase is a placeholder class
+that accepts any argument, and whose class attributes are placeholders too, which is
+enough to import and instantiate the game plugins.
+
+The file trees follow the behavior of the trees from MO2: names are case-insensitive,
+directories are listed before files, and both / and \\ are accepted as separators.
+"""
+
+from __future__ import annotations
+
+import enum
+import re
+import sys
+from collections.abc import Callable, Iterator, Sequence
+from types import ModuleType
+from typing import Any
+
+_SEPARATORS = re.compile(r"[/\\]")
+
+
+def install() -> ModuleType:
+    """
+    Register this module as the mobase module, unless mobase is already imported.
+
+    Returns:
+        The mobase module.
+    """
+    return sys.modules.setdefault("mobase", sys.modules[__name__])
+
+
+def _split(path: str) -> list[str]:
+    parts = [part for part in _SEPARATORS.split(path) if part]
+    if any(part in (".", "..") for part in parts):
+        raise RuntimeError(f'Invalid path "{path}".')
+    return parts
+
+
+class FileTreeEntry:
+    """
+    File in a tree, see `IFileTree` for folders.
+    """
+
+    class FileTypes(enum.IntFlag):
+        FILE = 1
+        DIRECTORY = 2
+        FILE_OR_DIRECTORY = 3
+
+    FILE = FileTypes.FILE
+    DIRECTORY = FileTypes.DIRECTORY
+    FILE_OR_DIRECTORY = FileTypes.FILE_OR_DIRECTORY
+
+    def __init__(self, name: str, parent: IFileTree | None = None):
+        self._name = name
+        self._parent: IFileTree | None = None
+        if parent is not None:
+            parent._add(self)  # pyright: ignore[reportPrivateUsage]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}("{self.path("/")}")'
+
+    def name(self) -> str:
+        return self._name
+
+    def isDir(self) -> bool:
+        return False
+
+    def isFile(self) -> bool:
+        return not self.isDir()
+
+    def fileType(self) -> FileTreeEntry.FileTypes:
+        return self.DIRECTORY if self.isDir() else self.FILE
+
+    def suffix(self) -> str:
+        if self.isDir() or "." not in self._name:
+            return ""
+        return self._name.rsplit(".", 1)[1]
+
+    def hasSuffix(self, suffixes: str | Sequence[str]) -> bool:
+        if isinstance(suffixes, str):
+            suffixes = [suffixes]
+        suffix = self.suffix().casefold()
+        return self.isFile() and any(suffix == s.casefold() for s in suffixes)
+
+    def parent(self) -> IFileTree | None:
+        return self._parent
+
+    def path(self, sep: str = "\\") -> str:
+        names: list[str] = []
+        entry: FileTreeEntry = self
+        while entry._parent is not None:
+            names.append(entry._name)
+            entry = entry._parent
+        return sep.join(reversed(names))
+
+    def pathFrom(self, tree: IFileTree, sep: str = "\\") -> str:
+        names: list[str] = []
+        entry: FileTreeEntry | None = self
+        while entry is not None and entry is not tree:
+            names.append(entry._name)
+            entry = entry._parent
+        return "" if entry is None else sep.join(reversed(names))
+
+    def detach(self) -> bool:
+        if self._parent is None:
+            return False
+        self._parent._remove(self)  # pyright: ignore[reportPrivateUsage]
+        return True
+
+    def moveTo(self, tree: IFileTree) -> bool:
+        return tree.insert(self, IFileTree.REPLACE)
+
+    def _copy(self) -> FileTreeEntry:
+        return FileTreeEntry(self._name)
+
+
+class IFileTree(FileTreeEntry):
+    """
+    In-memory folder of a tree.
+    """
+
+    class InsertPolicy(enum.Enum):
+        FAIL_IF_EXISTS = 0
+        REPLACE = 1
+        MERGE = 2
+
+    class WalkReturn(enum.Enum):
+        CONTINUE = 0
+        STOP = 1
+        SKIP = 2
+
+    FAIL_IF_EXISTS = InsertPolicy.FAIL_IF_EXISTS
+    REPLACE = InsertPolicy.REPLACE
+    MERGE = InsertPolicy.MERGE
+
+    CONTINUE = WalkReturn.CONTINUE
+    STOP = WalkReturn.STOP
+    SKIP = WalkReturn.SKIP
+
+    def __init__(self, name: str = "", parent: IFileTree | None = None):
+        # entries by casefolded name, and the same entries in the order of MO2:
+        self._entries: dict[str, FileTreeEntry] = {}
+        self._sorted: list[FileTreeEntry] | None = None
+        super().__init__(name, parent)
+
+    def isDir(self) -> bool:
+        return True
+
+    def _list(self) -> list[FileTreeEntry]:
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._entries.values(), key=lambda e: (e.isFile(), e._name.casefold())
+            )
+        return self._sorted
+
+    def _add(self, entry: FileTreeEntry) -> None:
+        entry._parent = self
+        self._entries[entry._name.casefold()] = entry
+        self._sorted = None
+
+    def _remove(self, entry: FileTreeEntry) -> None:
+        del self._entries[entry._name.casefold()]
+        entry._parent = None
+        self._sorted = None
+
+    def _is_within(self, entry: FileTreeEntry) -> bool:
+        tree: FileTreeEntry | None = self
+        while tree is not None:
+            if tree is entry:
+                return True
+            tree = tree._parent
+        return False
+
+    def _copy(self) -> IFileTree:
+        tree = IFileTree(self._name)
+        for entry in self._entries.values():
+            tree._add(entry._copy())
+        return tree
+
+    def __iter__(self) -> Iterator[FileTreeEntry]:
+        return iter(list(self._list()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __getitem__(self, index: int) -> FileTreeEntry:
+        return self._list()[index]
+
+    def find(
+        self, path: str, type: FileTreeEntry.FileTypes = FileTreeEntry.FILE_OR_DIRECTORY
+    ) -> FileTreeEntry | None:
+        entry: FileTreeEntry = self
+        for name in _split(path):
+            if not isinstance(entry, IFileTree):
+                return None
+            child = entry._entries.get(name.casefold())
+            if child is None:
+                return None
+            entry = child
+        return entry if entry is not self and entry.fileType() & type else None
+
+    def exists(
+        self, path: str, type: FileTreeEntry.FileTypes = FileTreeEntry.FILE_OR_DIRECTORY
+    ) -> bool:
+        return self.find(path, type) is not None
+
+    def pathTo(self, entry: FileTreeEntry, sep: str = "\\") -> str:
+        return entry.pathFrom(self, sep)
+
+    def createOrphanTree(self, name: str = "") -> IFileTree:
+        return IFileTree(name)
+
+    def addDirectory(self, path: str) -> IFileTree:
+        tree = self
+        for name in _split(path):
+            child = tree._entries.get(name.casefold())
+            if child is None:
+                child = IFileTree(name, tree)
+            elif not isinstance(child, IFileTree):
+                raise RuntimeError(f'"{child.path("/")}" is not a directory.')
+            tree = child
+        return tree
+
+    def addFile(self, path: str, replace_if_exists: bool = False) -> FileTreeEntry:
+        *folders, name = _split(path)
+        tree = self.addDirectory("/".join(folders))
+        existing = tree._entries.get(name.casefold())
+        if existing is not None:
+            if not replace_if_exists:
+                raise RuntimeError(f'"{existing.path("/")}" already exists.')
+            existing.detach()
+        return FileTreeEntry(name, tree)
+
+    def insert(
+        self, entry: FileTreeEntry, policy: InsertPolicy = InsertPolicy.FAIL_IF_EXISTS
+    ) -> bool:
+        if self._is_within(entry):
+            return False
+
+        existing = self._entries.get(entry._name.casefold())
+        if existing is entry:
+            return True
+        if existing is not None:
+            if policy is IFileTree.FAIL_IF_EXISTS:
+                return False
+            if policy is IFileTree.MERGE:
+                if isinstance(existing, IFileTree) and isinstance(entry, IFileTree):
+                    existing.merge(entry)
+                    entry.detach()
+                    return True
+                if existing.isDir() != entry.isDir():
+                    return False
+            existing.detach()
+
+        entry.detach()
+        self._add(entry)
+        return True
+
+    def move(
+        self,
+        entry: FileTreeEntry,
+        path: str,
+        policy: InsertPolicy = InsertPolicy.FAIL_IF_EXISTS,
+    ) -> bool:
+        parts = _split(path)
+        if not parts:
+            return self.insert(entry, policy)
+
+        if path[-1] in "/\\":
+            name = entry._name
+        else:
+            *parts, name = parts
+        if self._is_within(entry):
+            return False
+
+        try:
+            tree = self.addDirectory("/".join(parts))
+        except RuntimeError:
+            return False
+
+        existing = tree._entries.get(name.casefold())
+        if existing is not None and existing is not entry:
+            if policy is IFileTree.FAIL_IF_EXISTS:
+                return False
+            if policy is IFileTree.MERGE and existing.isDir() != entry.isDir():
+                return False
+
+        entry.detach()
+        entry._name = name
+        return tree.insert(entry, policy)
+
+    def copy(
+        self,
+        entry: FileTreeEntry,
+        path: str = "",
+        insert_policy: InsertPolicy = InsertPolicy.FAIL_IF_EXISTS,
+    ) -> FileTreeEntry:
+        copy = entry._copy()
+        if not self.move(copy, path, insert_policy):
+            raise RuntimeError(f'Unable to copy "{entry.path("/")}" to "{path}".')
+        return copy
+
+    def merge(
+        self, other: IFileTree, overwrites: bool = False
+    ) -> dict[FileTreeEntry, FileTreeEntry] | int:
+        if self._is_within(other):
+            raise RuntimeError("Cannot merge a tree with one of its parents.")
+
+        overwritten: dict[FileTreeEntry, FileTreeEntry] = {}
+        for entry in list(other._entries.values()):
+            existing = self._entries.get(entry._name.casefold())
+            if existing is not None:
+                if isinstance(existing, IFileTree) and isinstance(entry, IFileTree):
+                    result = existing.merge(entry, True)
+                    assert isinstance(result, dict)
+                    overwritten.update(result)
+                    entry.detach()
+                    continue
+                existing.detach()
+                overwritten[existing] = entry
+            entry.detach()
+            self._add(entry)
+
+        return overwritten if overwrites else len(overwritten)
+
+    def remove(self, entry: str | FileTreeEntry) -> bool:
+        if isinstance(entry, str):
+            child = self._entries.get(entry.casefold())
+            if child is None:
+                return False
+            entry = child
+        if entry._parent is not self:
+            return False
+        return entry.detach()
+
+    def removeAll(self, names: Sequence[str]) -> int:
+        return sum(self.remove(name) for name in names)
+
+    def removeIf(self, filter: Callable[[FileTreeEntry], bool]) -> int:
+        return sum(entry.detach() for entry in list(self._list()) if filter(entry))
+
+    def clear(self) -> bool:
+        for entry in list(self._entries.values()):
+            entry.detach()
+        return True
+
+    def walk(
+        self,
+        callback: Callable[[str, FileTreeEntry], IFileTree.WalkReturn],
+        sep: str = "\\",
+    ) -> None:
+        # depth-first, in the order of the entries, as in MO2
+        stack: list[tuple[str, FileTreeEntry]] = [
+            ("", entry) for entry in reversed(self._list())
+        ]
+        while stack:
+            path, entry = stack.pop()
+            result = callback(path, entry)
+            if result is IFileTree.STOP:
+                break
+            if isinstance(entry, IFileTree) and result is not IFileTree.SKIP:
+                path = f"{path}{entry._name}{sep}"
+                stack.extend((path, child) for child in reversed(entry._list()))
+
+
+class GameFeature:
+    pass
+
+
+class ModDataChecker(GameFeature):
+    class CheckReturn(enum.Enum):
+        INVALID = 0
+        FIXABLE = 1
+        VALID = 2
+
+    INVALID = CheckReturn.INVALID
+    FIXABLE = CheckReturn.FIXABLE
+    VALID = CheckReturn.VALID
+
+    def dataLooksValid(self, filetree: IFileTree) -> ModDataChecker.CheckReturn:
+        raise NotImplementedError
+
+    def fix(self, filetree: IFileTree) -> IFileTree | None:
+        return None
+
+
+class ModDataContent(GameFeature):
+    class Content:
+        def __init__(self, id: int, name: str, icon: str, filter_only: bool = False):
+            self._id = id
+            self._name = name
+            self._icon = icon
+            self._filter_only = filter_only
+
+        def id(self) -> int:
+            return self._id
+
+        def name(self) -> str:
+            return self._name
+
+        def icon(self) -> str:
+            return self._icon
+
+        def isOnlyForFilter(self) -> bool:
+            return self._filter_only
+
+    def getAllContents(self) -> list[ModDataContent.Content]:
+        raise NotImplementedError
+
+    def getContentsFor(self, filetree: IFileTree) -> list[int]:
+        raise NotImplementedError
+
+
+class _PlaceholderType(type):
+    def __getattr__(cls, name: str) -> Any:
+        # only for the placeholders themselves, not for the classes deriving from
+        # them (e.g. the game plugins)
+        if name.startswith("__") or "_placeholder" not in cls.__dict__:
+            raise AttributeError(name)
+        value = _placeholder(name)
+        setattr(cls, name, value)
+        return value
+
+
+def _init(self: Any, *args: Any, **kwargs: Any) -> None:
+    pass
+
+
+class _Placeholder(metaclass=_PlaceholderType):
+    pass
+
+
+def _placeholder(name: str) -> type:
+    # each placeholder defines __init__, that does not call the next class in the
+    # MRO, as the classes of mobase
+    return _PlaceholderType(
+        name, (_Placeholder,), {"_placeholder": True, "__init__": _init}
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name.startswith("__"):
+        raise AttributeError(name)
+    value = globals()[name] = _placeholder(name)
+    return value
@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Benchmark of the memory and time taken by the instances of the game plugins, mostly
+their mappings (see `BasicGameMappings`).
+
+Every game plugin (from the INI files and the python modules, see `plugins`) is
+instantiated several times, and the following is reported, for each game and for all
+the games:
+
+- the time of the first instantiation, which also computes the static part of the
+  mappings of the game class, and of the next ones, which reuse it,
+- the memory retained by an instance, with the static part of the mappings shared
+  by the instances, and computed again for every instance as when every instance
+  held all its mappings.
+
+Run from the root of the repository:
+
+    python -m benchmarks.game_instances --instances 10
+"""
+
+import argparse
+import importlib
+import sys
+import time
+import tracemalloc
+from collections.abc import Sequence
+from typing import Any
+
+from PyQt6.QtWidgets import QApplication
+
+from .plugins import PACKAGE, create_games
+
+
+def _instantiate(cls: type, count: int, shared: bool) -> tuple[float, list[Any]]:
+    # instantiate a game class, returning the fastest time and the instances
+    infos_by_class: dict[type, Any] = importlib.import_module(
+        f"{PACKAGE}.basic_game"
+    ).BasicGameMappings._infos_by_class
+    games: list[Any] = []
+    times: list[float] = []
+    for _ in range(count):
+        if not shared:
+            infos_by_class.pop(cls, None)
+        start = time.perf_counter()
+        games.append(cls())
+        times.append(time.perf_counter() - start)
+    return min(times), games
+
+
+def _retained_memory(cls: type, count: int, shared: bool) -> float:
+    # memory retained by an instance of a game class, in bytes
+    _instantiate(cls, 1, True)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        _, games = _instantiate(cls, count, shared)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del games
+    return retained / count
+
+
+def benchmark(classes: Sequence[type], instances: int) -> list[dict[str, Any]]:
+    """
+    Run the benchmark, see the module documentation.
+
+    Args:
+        classes: Game classes to instantiate.
+        instances: Number of instances of each class.
+
+    Returns:
+        One result for each game class.
+    """
+    infos_by_class: dict[type, Any] = importlib.import_module(
+        f"{PACKAGE}.basic_game"
+    ).BasicGameMappings._infos_by_class
+
+    results: list[dict[str, Any]] = []
+    for cls in classes:
+        result: dict[str, Any] = {"game": cls.__name__}
+        try:
+            infos_by_class.pop(cls, None)
+            result["first_time"], _ = _instantiate(cls, 1, True)
+            result["time"], _ = _instantiate(cls, instances, True)
+            result["memory"] = _retained_memory(cls, instances, True)
+            result["unshared_memory"] = _retained_memory(cls, instances, False)
+        except Exception as e:
+            print(f"Failed to instantiate {cls.__name__}: {e}", file=sys.stderr)
+            continue
+        results.append(result)
+        _print(result)
+    return results
+
+
+def _print(result: dict[str, Any]) -> None:
+    print(
+        f"{result['game'][:36]:36} {result['first_time'] * 1000:>10.3f}"
+        f" {result['time'] * 1000:>9.3f} {result['memory'] / 1024:>10.1f}"
+        f" {result['unshared_memory'] / 1024:>13.1f}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.game_instances",
+        description="Benchmark of the memory and time taken by the game instances.",
+    )
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=10,
+        help="instances of each game (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    # some plugins use Qt when created
+    if QApplication.instance() is None:
+        _app = QApplication(sys.argv[:1])
+
+    games: list[object] = create_games()
+    classes = list(dict.fromkeys(type(game) for game in games))
+
+    print(
+        f"{'game':36} {'first (ms)':>10} {'next (ms)':>9}"
+        f" {'KiB/game':>10} {'KiB unshared':>13}"
+    )
+    results = benchmark(classes, args.instances)
+    _print(
+        {
+            "game": f"all ({len(results)} games)",
+            **{
+                key: sum(result[key] for result in results)
+                for key in ("first_time", "time", "memory", "unshared_memory")
+            },
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
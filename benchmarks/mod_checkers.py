@@ -0,0 +1,204 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Benchmark of the mod data checkers and contents registered by the game plugins.
+
+The game plugins are created and initialized outside of MO2 (see `fake_mobase` and
+`plugins`), and every mod data checker and content they register is run on synthetic
+archives (see `archives`). For each archive, the time of `dataLooksValid()` (and of
+`fix()` on the same tree when the archive is fixable) or of `getContentsFor()` is
+reported, with the peak of memory allocated during the calls.
+
+Run from the root of the repository:
+
+    python -m benchmarks.mod_checkers --sizes 10 1000 200000 --features bg3
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from PyQt6.QtWidgets import QApplication
+
+from . import fake_mobase
+from .archives import LAYOUTS, build_tree
+from .plugins import initialized_games
+
+mobase = fake_mobase.install()
+
+
+def registered_features() -> list[tuple[str, Any]]:
+    """
+    Create and initialize all the game plugins (see `plugins`).
+
+    Returns:
+        The mod data checkers and contents registered by the games, with the name of
+        the game.
+    """
+    _, organizer = initialized_games()
+    return [
+        (game, feature)
+        for game, feature in organizer.features
+        if isinstance(feature, (mobase.ModDataChecker, mobase.ModDataContent))
+    ]
+
+
+def _run(feature: Any, paths: list[str]) -> tuple[str, float, float | None]:
+    tree = build_tree(paths)
+    if isinstance(feature, mobase.ModDataContent):
+        start = time.perf_counter()
+        contents = feature.getContentsFor(tree)
+        return f"{len(contents)} contents", time.perf_counter() - start, None
+
+    start = time.perf_counter()
+    status = feature.dataLooksValid(tree)
+    check_time = time.perf_counter() - start
+    fix_time = None
+    if status is mobase.ModDataChecker.FIXABLE:
+        start = time.perf_counter()
+        feature.fix(tree)
+        fix_time = time.perf_counter() - start
+    return status.name, check_time, fix_time
+
+
+def _peak_memory(feature: Any, paths: list[str]) -> int:
+    tree = build_tree(paths)
+    tracemalloc.start()
+    try:
+        if isinstance(feature, mobase.ModDataContent):
+            feature.getContentsFor(tree)
+        elif feature.dataLooksValid(tree) is mobase.ModDataChecker.FIXABLE:
+            feature.fix(tree)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(
+    features: Sequence[tuple[str, Any]],
+    layouts: Sequence[str],
+    sizes: Sequence[int],
+    repeat: int = 3,
+    memory: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Run the given features on synthetic archives.
+
+    Args:
+        features: Features to run, with the name of their game.
+        layouts: Names of the archive layouts (see `archives.LAYOUTS`).
+        sizes: Numbers of files of the archives.
+        repeat: Number of runs for each archive, the fastest run is reported.
+        memory: Also measure the peak of memory allocated during a run, in a separate
+            run since tracing the allocations slows down the code.
+
+    Returns:
+        One result for each feature and archive.
+    """
+    results: list[dict[str, Any]] = []
+    for layout in layouts:
+        for size in sizes:
+            paths = LAYOUTS[layout](size, random.Random(f"{layout}-{size}"))
+            for game, feature in features:
+                result: dict[str, Any] = {
+                    "game": game,
+                    "feature": type(feature).__name__,
+                    "layout": layout,
+                    "size": size,
+                }
+                try:
+                    runs = [_run(feature, paths) for _ in range(repeat)]
+                    result["result"] = runs[0][0]
+                    result["time"] = min(run[1] for run in runs)
+                    fix_times = [run[2] for run in runs if run[2] is not None]
+                    result["fix_time"] = min(fix_times) if fix_times else None
+                    if memory:
+                        result["peak_memory"] = _peak_memory(feature, paths)
+                except Exception as e:
+                    result["result"] = f"error: {e!r}"
+                results.append(result)
+                _print(result)
+    return results
+
+
+def _print(result: dict[str, Any]) -> None:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value * 1000:.2f}"
+
+    memory = result.get("peak_memory")
+    print(
+        f"{result['game'][:30]:30} {result['feature'][:36]:36}"
+        f" {result['layout']:15} {result['size']:>7}"
+        f" {ms(result.get('time')):>9} {ms(result.get('fix_time')):>9}"
+        f" {'-' if memory is None else memory // 1024:>8}"
+        f"  {result['result']}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.mod_checkers",
+        description="Benchmark of the mod data checkers and contents.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1000, 20000],
+        help="numbers of files of the archives (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--layouts",
+        nargs="+",
+        choices=list(LAYOUTS),
+        default=list(LAYOUTS),
+        help="layouts of the archives (default: all)",
+    )
+    parser.add_argument(
+        "--features",
+        nargs="+",
+        default=[],
+        help="only run the features whose class or game name contains one of these"
+        " (case-insensitive)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per archive")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="do not measure the memory"
+    )
+    parser.add_argument("--json", type=Path, help="also write the results to a file")
+    args = parser.parse_args(argv)
+
+    # some plugins use Qt when initialized
+    if QApplication.instance() is None:
+        _app = QApplication(sys.argv[:1])
+
+    filters = [f.casefold() for f in args.features]
+    features = [
+        (game, feature)
+        for game, feature in registered_features()
+        if not filters
+        or any(
+            f in game.casefold() or f in type(feature).__name__.casefold()
+            for f in filters
+        )
+    ]
+
+    print(
+        f"{'game':30} {'feature':36} {'layout':15} {'files':>7}"
+        f" {'time (ms)':>9} {'fix (ms)':>9} {'peak KiB':>8}  result"
+    )
+    results = benchmark(
+        features, args.layouts, args.sizes, args.repeat, not args.no_memory
+    )
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
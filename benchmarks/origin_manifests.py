@@ -0,0 +1,167 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Benchmark of the search of the Origin manifests in the LocalContent folder.
+
+A synthetic LocalContent folder is generated, with a folder for every game holding
+its manifest (`.mfst`, some of them for Steam), and the leftovers of old
+installations and downloads: deep folders of files that are not manifests. The
+following are timed:
+
+- a recursive glob of the manifests, then reading every one of them, as before the
+  depth-limited walk,
+- `list_manifests()` then reading every manifest,
+- `list_manifests()` with a cache of the manifests that did not change.
+
+The games found by the glob and by the walk are compared.
+
+Run from the root of the repository:
+
+    python -m benchmarks.origin_manifests --games 200 --leftovers 20000
+"""
+
+import argparse
+import importlib
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+from urllib import parse
+
+from .plugins import PACKAGE, import_plugins
+
+
+def write_local_content(
+    folder: Path, games: int, leftovers: int, seed: int = 0
+) -> None:
+    """
+    Write a synthetic LocalContent folder.
+
+    Args:
+        folder: Folder to write to, created if needed.
+        games: Number of games (folders with a manifest).
+        leftovers: Number of files left by old installations and downloads.
+        seed: Seed of the random generator.
+    """
+    rng = random.Random(seed)
+    names: list[str] = []
+    for i in range(games):
+        name = f"Game {i}"
+        names.append(name)
+        game_folder = folder.joinpath(name)
+        game_folder.mkdir(parents=True, exist_ok=True)
+
+        manifest_id = f"OFB-EAST:{100000 + i}"
+        steam = rng.random() < 0.2
+        query = parse.urlencode(
+            {
+                "currentstate": "kReadyToStart",
+                "id": f"{manifest_id}@steam" if steam else manifest_id,
+                "dipinstallpath": f"C:\\Games\\{name}\\",
+                "previousstate": "kInstalling",
+            }
+        )
+        file_name = f"{manifest_id.replace(':', '')}{'@steam' if steam else ''}.mfst"
+        game_folder.joinpath(file_name).write_text(f"?{query}")
+
+    # leftovers are deep, e.g. LocalContent/<game>/__Installer/cache/<hash>/...
+    for i in range(leftovers):
+        parts = [rng.choice(names), "__Installer", "cache"]
+        parts += [f"{rng.randrange(16):x}" for _ in range(rng.randrange(1, 6))]
+        leftover = folder.joinpath(*parts)
+        leftover.mkdir(parents=True, exist_ok=True)
+        leftover.joinpath(f"chunk_{i}.dat").touch()
+
+
+def _time(function: Callable[[], object], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.origin_manifests",
+        description="Benchmark of the search of the Origin manifests.",
+    )
+    parser.add_argument("--games", type=int, default=200, help="number of games")
+    parser.add_argument(
+        "--leftovers",
+        type=int,
+        default=20000,
+        help="files left by old installations (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each method")
+    parser.add_argument(
+        "--folder", type=Path, help="LocalContent folder (default: temporary)"
+    )
+    args = parser.parse_args(argv)
+
+    import_plugins()
+    origin_utils = importlib.import_module(f"{PACKAGE}.origin_utils")
+    cache_utils = importlib.import_module(f"{PACKAGE}.cache_utils")
+
+    def glob_games(folder: Path) -> dict[str, str]:
+        games: dict[str, str] = {}
+        for manifest in folder.glob("**/*.mfst"):
+            if "@steam" not in manifest.name.lower():
+                games.update(origin_utils.read_manifest(manifest))
+        return games
+
+    def walk_games(folder: Path, cache: Any = None) -> dict[str, str]:
+        games: dict[str, str] = {}
+        for entry in origin_utils.list_manifests(folder):
+            manifest = Path(entry.path)
+            if cache is None:
+                games.update(origin_utils.read_manifest(manifest))
+            else:
+                games.update(
+                    cache.get(manifest, origin_utils.read_manifest, entry.stat())
+                )
+        return games
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder or Path(tmp)
+        start = time.perf_counter()
+        write_local_content(folder, args.games, args.leftovers)
+        print(
+            f"generated {args.games} games and {args.leftovers} leftovers"
+            f" in {time.perf_counter() - start:.2f} s"
+        )
+
+        expected, found = glob_games(folder), walk_games(folder)
+        if found != expected:
+            print(
+                f"error: {len(found)} games found by the walk instead of"
+                f" {len(expected)}",
+                file=sys.stderr,
+            )
+
+        cache = cache_utils.FileCache("origin_manifests_benchmark.json")
+        walk_games(folder, cache)
+
+        results = {
+            "glob": _time(lambda: glob_games(folder), args.repeat),
+            "walk": _time(lambda: walk_games(folder), args.repeat),
+            "walk (cached)": _time(lambda: walk_games(folder, cache), args.repeat),
+        }
+
+        print(f"{'method':15} {'time (ms)':>10} {'speedup':>8}")
+        for method, elapsed in results.items():
+            print(
+                f"{method:15} {elapsed * 1000:>10.1f}"
+                f" {results['glob'] / elapsed:>7.1f}x"
+            )
+
+    if found != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
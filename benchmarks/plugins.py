@@ -0,0 +1,175 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Loading of the game plugins outside of MO2, for the benchmarks.
+
+The plugin package is imported without running its `__init__`, so that no store is
+scanned for installed games and the plugin manifest is not used: every game is
+created from its INI file or python class, as on a first run, and `init()` really
+initializes it. Files written by the plugins (caches, ...) go to a temporary folder
+instead of the plugin data folder of MO2.
+"""
+
+import atexit
+import importlib
+import runpy
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from . import fake_mobase
+
+mobase = fake_mobase.install()
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# name of the plugin package, whatever the name of the folder of the repository
+PACKAGE = "basic_games"
+
+_data_path: Path | None = None
+
+
+def data_path() -> Path:
+    """
+    Returns:
+        The temporary folder replacing the plugin data folder, removed on exit.
+    """
+    global _data_path
+    if _data_path is None:
+        _data_path = Path(tempfile.mkdtemp(prefix="basic_games-"))
+        atexit.register(shutil.rmtree, _data_path, ignore_errors=True)
+    return _data_path
+
+
+def import_plugins() -> ModuleType:
+    """
+    Import the plugin package (see the module documentation), with the bundled
+    dependencies on the path, the plugin data folder redirected to `data_path()`
+    and no game found in the stores.
+
+    Returns:
+        The plugin package.
+    """
+    package = sys.modules.get(PACKAGE)
+    if package is not None:
+        return package
+
+    # same initialization as the worker processes, see process_utils
+    runpy.run_path(
+        str(ROOT.joinpath("process_worker.py")),
+        {"PACKAGE_NAME": PACKAGE, "PACKAGE_PATH": str(ROOT)},
+    )
+
+    cache_utils = importlib.import_module(f"{PACKAGE}.cache_utils")
+    cache_utils.plugin_data_path = data_path  # pyright: ignore[reportAttributeAccessIssue]
+
+    basic_game = importlib.import_module(f"{PACKAGE}.basic_game")
+    for store in ("steam", "gog", "origin", "epic", "eadesktop"):
+        setattr(basic_game.BasicGame, f"{store}_games", {})
+    basic_game.BasicGame.index_games()
+
+    return sys.modules[PACKAGE]
+
+
+def create_games() -> list[Any]:
+    """
+    Create all the game plugins, from the INI files and the python modules of the
+    games folder. Modules and games that fail are reported and skipped.
+
+    Returns:
+        The game plugins, not initialized.
+    """
+    import_plugins()
+    BasicGame = importlib.import_module(f"{PACKAGE}.basic_game").BasicGame
+    IniGameRegistry = importlib.import_module(
+        f"{PACKAGE}.basic_game_ini"
+    ).IniGameRegistry
+
+    games_path = ROOT.joinpath("games")
+    registry = IniGameRegistry(sorted(map(str, games_path.glob("*.ini"))))
+    for error in registry.errors:
+        print(f"Invalid game definition: {error}", file=sys.stderr)
+    games: list[Any] = list(registry.create_all())
+
+    for path in sorted(games_path.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        try:
+            module = importlib.import_module(f"{PACKAGE}.games.{path.stem}")
+        except Exception as e:
+            print(f"Failed to import {path.name}: {e}", file=sys.stderr)
+            continue
+
+        # as in createPlugins(), every game class found in the module is created
+        classes = {
+            obj
+            for obj in vars(module).values()
+            if isinstance(obj, type)
+            and issubclass(obj, BasicGame)
+            and obj is not BasicGame
+            and not obj.__name__.startswith("Lazy")
+        }
+        for cls in sorted(classes, key=lambda cls: cls.__name__):
+            try:
+                games.append(cls())
+            except Exception as e:
+                print(f"Failed to instantiate {cls.__name__}: {e}", file=sys.stderr)
+
+    return games
+
+
+class Organizer:
+    """
+    Organizer collecting the features registered by the games. It is also its own mod
+    list (for the games connecting to its signals), any other method does nothing and
+    returns None.
+    """
+
+    def __init__(self):
+        self.game_name = ""
+        self.features: list[tuple[str, Any]] = []
+
+    def gameFeatures(self) -> "Organizer":
+        return self
+
+    def modList(self) -> "Organizer":
+        return self
+
+    def pluginDataPath(self) -> str:
+        return str(data_path())
+
+    def registerFeature(
+        self, game: Any, feature: Any, priority: int, replace: bool = False
+    ) -> bool:
+        self.features.append((self.game_name, feature))
+        return True
+
+    def __getattr__(self, name: str) -> Any:
+        def method(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        return method
+
+
+def initialized_games() -> tuple[list[Any], Organizer]:
+    """
+    Create and initialize all the game plugins.
+
+    Returns:
+        The games that were initialized, and the organizer holding the features they
+        registered, with the name of their game.
+    """
+    organizer = Organizer()
+    games: list[Any] = []
+    for game in create_games():
+        try:
+            organizer.game_name = game.gameName()
+            game.init(organizer)
+        except Exception as e:
+            print(f"Unable to initialize {type(game).__name__}: {e}", file=sys.stderr)
+            continue
+        games.append(game)
+    return games, organizer
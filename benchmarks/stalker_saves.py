@@ -0,0 +1,252 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Benchmark of the extraction of the metadata of S.T.A.L.K.E.R. Anomaly saves, in MO2
+and in worker processes.
+
+A corpus of synthetic saves (`.scop` files, LZO-compressed, with an ALife chunk of
+the given size and the actor of the player) is generated, then the metadata of all
+the saves is extracted in the current process and with pools of worker processes
+of increasing size (see `process_utils`), including the start of the pool.
+
+Run from the root of the repository:
+
+    python -m benchmarks.stalker_saves --saves 64 --processes 1 2 4 8
+"""
+
+import argparse
+import importlib
+import random
+import struct
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Any
+
+from .plugins import import_plugins
+
+
+def _string(value: str) -> bytes:
+    return value.encode() + b"\0"
+
+
+def _actor(rng: random.Random, name: str) -> tuple[bytes, bytes]:
+    # spawn and update packets of the actor, in the format read by XRCreatureActor
+    state = b"".join(
+        [
+            struct.pack("<HfIII", 1, 0.0, 1, 2, 0),
+            _string(""),
+            struct.pack("<II", 0xFFFFFFFF, 0xFFFFFFFF),
+            _string("actors\\stalker_hero\\stalker_hero_1"),
+            struct.pack("<B", 0),
+            struct.pack("<BBBf", 0, 0, 0, rng.random()),
+            struct.pack("<I", 200) + struct.pack("<200H", *range(200)),
+            struct.pack("<I", 100) + struct.pack("<100H", *range(100)),
+            struct.pack("<HQ", 0xFFFF, 0),
+            struct.pack("<I", rng.randrange(100000)),
+            _string("actor"),
+            struct.pack("<I", 0),
+            _string("actor"),
+            struct.pack(
+                "<iii",
+                rng.randrange(32),
+                rng.randrange(30000),
+                rng.randrange(-2500, 2500),
+            ),
+            _string(name),
+            struct.pack("<BB", 1, 0),
+            _string("idle"),
+            struct.pack("<BH", 4, 0),
+            struct.pack("<QH", 2**64 - 1, 0),
+            struct.pack("<6f", -1, -1, -1, 1, 1, 1),
+            struct.pack("<H", 60) + rng.randbytes(60 * 8),
+            struct.pack("<H", 0xFFFF),
+        ]
+    )
+    spawn = b"".join(
+        [
+            struct.pack("<H", 1),
+            _string("actor"),
+            _string("single_player"),
+            struct.pack("<BB", 0, 0xFE),
+            struct.pack("<6f", 1, 2, 3, 0, 0, 0),
+            struct.pack("<HHHHH", 0, 0, 0xFFFF, 0xFFFF, 0x20),
+            struct.pack("<HHH", 128, 0, 7),
+            struct.pack("<H", 16) + bytes(16),
+            struct.pack("<H", 0),
+            struct.pack("<H", len(state)),
+            state,
+        ]
+    )
+    update = struct.pack("<HHHfHffBH", 0, 0, 0, 0.0, 0, 0.0, 0.1, 1, 42)
+    return spawn, update
+
+
+def save_data(rng: random.Random, name: str, alife_size: int) -> bytes:
+    """
+    Generate the uncompressed content of a save.
+
+    Args:
+        rng: Random generator.
+        name: Name of the player.
+        alife_size: Approximate size of the ALife chunk, which the parser skips.
+
+    Returns:
+        The chunks of the save.
+    """
+    spawn, update = _actor(rng, name)
+    objects = (
+        struct.pack("<I", 1)
+        + struct.pack("<H", len(spawn))
+        + spawn
+        + struct.pack("<H", len(update))
+        + update
+        + rng.randbytes(20000)
+    )
+    words = [f"object_{i}".encode() for i in range(500)]
+    alife = b"".join(
+        word + struct.pack("<I", i)
+        for i, word in enumerate(rng.choices(words, k=alife_size // 14))
+    )
+    chunks = [
+        (0x0, alife),
+        (0x1, bytes(4096)),
+        (0x5, struct.pack("<Q", 12345)),
+        (0x2, objects),
+        (0x9, rng.randbytes(50000)),
+    ]
+    return b"".join(struct.pack("<II", id, len(data)) + data for id, data in chunks)
+
+
+def write_corpus(
+    folder: Path, count: int, alife_size: int = 2_000_000, seed: int = 0
+) -> list[Path]:
+    """
+    Write synthetic saves to a folder.
+
+    Args:
+        folder: Folder to write the saves to, created if needed.
+        count: Number of saves.
+        alife_size: Approximate size of the ALife chunk of the saves.
+        seed: Seed of the random generator.
+
+    Returns:
+        The paths to the saves.
+    """
+    import lzokay  # pyright: ignore[reportMissingTypeStubs]
+
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths: list[Path] = []
+    for i in range(count):
+        data = save_data(rng, f"Stalker {i}", alife_size)
+        path = folder.joinpath(f"quicksave_{i}.scop")
+        path.write_bytes(
+            struct.pack("@iii", -1, 6, len(data)) + lzokay.compress(data)  # pyright: ignore[reportUnknownMemberType]
+        )
+        paths.append(path)
+    return paths
+
+
+def extract_in_processes(
+    package: Any,
+    extract: Callable[[Path], Any],
+    paths: Sequence[Path],
+    processes: int,
+    chunk_size: int,
+) -> int:
+    """
+    Extract the metadata of saves in worker processes, the same way
+    `SaveMetadataCache.prefetch()` does.
+
+    Returns:
+        The number of saves that were extracted.
+    """
+    process_utils = package.process_utils
+    pool = process_utils.create_process_pool(processes)
+    if pool is None:
+        raise RuntimeError("no Python interpreter to start the worker processes")
+
+    with pool:
+        futures = [
+            pool.submit(process_utils.map_chunk, extract, paths[i : i + chunk_size])
+            for i in range(0, len(paths), chunk_size)
+        ]
+        return sum(
+            error is None
+            for future in as_completed(futures)
+            for _, error in future.result()
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.stalker_saves",
+        description="Benchmark of the extraction of S.T.A.L.K.E.R. Anomaly saves.",
+    )
+    parser.add_argument("--saves", type=int, default=64, help="number of saves")
+    parser.add_argument(
+        "--alife-size",
+        type=int,
+        default=2_000_000,
+        help="approximate size of the ALife chunk (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="numbers of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=8,
+        help="saves sent to a worker at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--folder", type=Path, help="folder for the saves (default: temporary)"
+    )
+    args = parser.parse_args(argv)
+
+    # also adds the bundled dependencies (lzokay) to the path
+    package = import_plugins()
+    extract_metadata: Callable[[Path], Any] = importlib.import_module(
+        "basic_games.games.stalkeranomaly.XRSave"
+    ).extract_metadata
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder or Path(tmp)
+        start = time.perf_counter()
+        paths = write_corpus(folder, args.saves, args.alife_size)
+        print(
+            f"generated {len(paths)} saves in {time.perf_counter() - start:.2f} s"
+            f" ({sum(p.stat().st_size for p in paths) // 1024} KiB)"
+        )
+
+        print(f"{'processes':>9} {'time (s)':>9} {'saves/s':>8} {'speedup':>8}")
+
+        start = time.perf_counter()
+        for path in paths:
+            extract_metadata(path)
+        reference = time.perf_counter() - start
+        print(f"{'in MO2':>9} {reference:>9.2f} {len(paths) / reference:>8.1f}")
+
+        for processes in args.processes:
+            start = time.perf_counter()
+            count = extract_in_processes(
+                package, extract_metadata, paths, processes, args.chunk_size
+            )
+            elapsed = time.perf_counter() - start
+            if count != len(paths):
+                print(f"{len(paths) - count} saves failed with {processes} processes")
+            print(
+                f"{processes:>9} {elapsed:>9.2f} {len(paths) / elapsed:>8.1f}"
+                f" {reference / elapsed:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Benchmark of the reading of the application manifests of Steam libraries.
+
+Synthetic libraries are generated, with application manifests (`appmanifest_*.acf`)
+modelled on the ones written by Steam: the application ID and the installation
+folder near the top, followed by the installed depots, the user configuration and
+the mounted depots. The following are timed:
+
+- parsing every manifest with the vdf module, as before the fast path,
+- scanning every manifest for the two keys only (`_scan_app_manifest()`),
+- reading all the libraries with `read_library_folders()`, in parallel, without a
+  cache and with a cache of the manifests that did not change.
+
+The results of the scan and of the vdf module are compared.
+
+Run from the root of the repository (on Windows, since `steam_utils` reads the
+registry):
+
+    python -m benchmarks.steam_libraries --libraries 3 --manifests 1500
+"""
+
+import argparse
+import importlib
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, cast
+
+from .plugins import PACKAGE, import_plugins
+
+
+def app_manifest(rng: random.Random, app_id: int) -> str:
+    """
+    Generate the content of an application manifest.
+
+    Args:
+        rng: Random generator.
+        app_id: ID of the application.
+
+    Returns:
+        The manifest, in the VDF format.
+    """
+
+    def block(name: str, items: list[tuple[str, str | list[Any]]], indent: str) -> str:
+        lines = [f'{indent}"{name}"', f"{indent}{{"]
+        for key, value in items:
+            if isinstance(value, list):
+                lines.append(block(key, value, indent + "\t"))
+            else:
+                lines.append(f'{indent}\t"{key}"\t\t"{value}"')
+        lines.append(f"{indent}}}")
+        return "\n".join(lines)
+
+    depots: list[tuple[str, str | list[Any]]] = [
+        (
+            str(app_id + i + 1),
+            [
+                ("manifest", str(rng.getrandbits(63))),
+                ("size", str(rng.randrange(10**10))),
+                ("dlcappid", str(app_id + i + 100)),
+            ],
+        )
+        for i in range(rng.randrange(1, 40))
+    ]
+    name = f"Game {app_id}"
+    items: list[tuple[str, str | list[Any]]] = [
+        ("appid", str(app_id)),
+        ("universe", "1"),
+        ("LauncherPath", "C:\\\\Program Files (x86)\\\\Steam\\\\steam.exe"),
+        ("name", name),
+        ("StateFlags", "4"),
+        ("installdir", name),
+        ("LastUpdated", str(rng.randrange(10**9))),
+        ("SizeOnDisk", str(rng.randrange(10**10))),
+        ("StagingSize", "0"),
+        ("buildid", str(rng.randrange(10**7))),
+        ("LastOwner", str(rng.getrandbits(63))),
+        ("BytesToDownload", "0"),
+        ("BytesDownloaded", "0"),
+        ("AutoUpdateBehavior", "0"),
+        ("AllowOtherDownloadsWhileRunning", "0"),
+        ("ScheduledAutoUpdate", "0"),
+        ("InstalledDepots", depots),
+        ("SharedDepots", [(str(228980 + i), "228980") for i in range(3)]),
+        ("UserConfig", [("language", "english"), ("BetaKey", "public")]),
+        ("MountedConfig", [("language", "english")]),
+    ]
+    return block("AppState", items, "") + "\n"
+
+
+def write_libraries(
+    folder: Path, libraries: int, manifests: int, seed: int = 0
+) -> list[Path]:
+    """
+    Write synthetic Steam libraries to a folder.
+
+    Args:
+        folder: Folder to write the libraries to, created if needed.
+        libraries: Number of libraries.
+        manifests: Number of application manifests in each library.
+        seed: Seed of the random generator.
+
+    Returns:
+        The paths to the libraries.
+    """
+    rng = random.Random(seed)
+    paths: list[Path] = []
+    for i in range(libraries):
+        path = folder.joinpath(f"library_{i}")
+        steamapps = path.joinpath("steamapps")
+        steamapps.mkdir(parents=True, exist_ok=True)
+        for j in range(manifests):
+            app_id = 10000 * (i * manifests + j + 1)
+            steamapps.joinpath(f"appmanifest_{app_id}.acf").write_text(
+                app_manifest(rng, app_id), encoding="utf-8"
+            )
+        paths.append(path)
+    return paths
+
+
+def _time(function: Callable[[], object], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.steam_libraries",
+        description="Benchmark of the reading of Steam application manifests.",
+    )
+    parser.add_argument("--libraries", type=int, default=3, help="number of libraries")
+    parser.add_argument(
+        "--manifests",
+        type=int,
+        default=1500,
+        help="application manifests per library (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each method")
+    parser.add_argument(
+        "--folder", type=Path, help="folder for the libraries (default: temporary)"
+    )
+    args = parser.parse_args(argv)
+
+    import_plugins()
+    try:
+        steam_utils = importlib.import_module(f"{PACKAGE}.steam_utils")
+    except ImportError as e:
+        sys.exit(f"Unable to import steam_utils: {e}")
+    cache_utils = importlib.import_module(f"{PACKAGE}.cache_utils")
+    import vdf  # pyright: ignore[reportMissingTypeStubs]
+
+    def parse(path: Path) -> list[str]:
+        with open(path, "r", encoding="utf-8") as fp:
+            info = cast(
+                dict[str, dict[str, str]],
+                vdf.load(fp),  # pyright: ignore[reportUnknownMemberType]
+            )
+        return [info["AppState"]["appid"], info["AppState"]["installdir"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder or Path(tmp)
+        start = time.perf_counter()
+        libraries = write_libraries(folder, args.libraries, args.manifests)
+        manifests = [
+            path
+            for library in libraries
+            for path in sorted(library.joinpath("steamapps").glob("*.acf"))
+        ]
+        print(
+            f"generated {len(manifests)} manifests in {len(libraries)} libraries"
+            f" in {time.perf_counter() - start:.2f} s"
+        )
+
+        mismatches = [
+            path
+            for path in manifests
+            if steam_utils._scan_app_manifest(path) != parse(path)
+        ]
+        for path in mismatches:
+            print(f"error: {path.name} is not scanned as parsed", file=sys.stderr)
+
+        cache = cache_utils.FileCache("steam_libraries_benchmark.json")
+        steam_utils.read_library_folders(libraries, cache)
+
+        results = {
+            "vdf": _time(lambda: [parse(path) for path in manifests], args.repeat),
+            "scan": _time(
+                lambda: [steam_utils._scan_app_manifest(path) for path in manifests],
+                args.repeat,
+            ),
+            "libraries": _time(
+                lambda: steam_utils.read_library_folders(libraries), args.repeat
+            ),
+            "libraries (cached)": _time(
+                lambda: steam_utils.read_library_folders(libraries, cache),
+                args.repeat,
+            ),
+        }
+
+        print(f"{'method':20} {'time (ms)':>10} {'speedup':>8}")
+        for method, elapsed in results.items():
+            print(
+                f"{method:20} {elapsed * 1000:>10.1f} {results['vdf'] / elapsed:>7.1f}x"
+            )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
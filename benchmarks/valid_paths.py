@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Check of the valid patterns with folders (e.g. "End/Binaries/Win64") of the mod data
+checkers registered by the game plugins, on synthetic archives (see `archives`).
+
+For each `BasicModDataChecker` with such patterns, and each archive:
+
+- the status of the archive is compared with the status given by the same checker
+  without the patterns with folders, the archives whose status differ are listed,
+- the top-level entries of the archive that are covered by the patterns with folders
+  (see `PathPatterns.covers()`) are compared with a reference implementation
+  matching the path of every file with fnmatch, any mismatch is an error.
+
+Run from the root of the repository:
+
+    python -m benchmarks.valid_paths --sizes 10 1000
+"""
+
+import argparse
+import dataclasses
+import fnmatch
+import importlib
+import random
+import sys
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from PyQt6.QtWidgets import QApplication
+
+from . import fake_mobase
+from .archives import LAYOUTS, build_tree
+from .mod_checkers import registered_features
+from .plugins import PACKAGE
+
+mobase = fake_mobase.install()
+
+
+def _match(segments: Sequence[str], pattern: Sequence[str]) -> bool:
+    # reference matching of a path with a glob, segment by segment
+    if not pattern:
+        return not segments
+    if pattern[0] == "**":
+        return any(_match(segments[i:], pattern[1:]) for i in range(len(segments) + 1))
+    return (
+        bool(segments)
+        and fnmatch.fnmatch(segments[0].casefold(), pattern[0].casefold())
+        and _match(segments[1:], pattern[1:])
+    )
+
+
+def _is_prefix(segments: Sequence[str], pattern: Sequence[str]) -> bool:
+    # whether a path can be extended into a path matching the glob
+    return any(_match(segments, pattern[:i]) for i in range(len(pattern) + 1))
+
+
+def _covers(entry: Any, path: list[str], patterns: list[list[str]]) -> bool:
+    # reference implementation of PathPatterns.covers()
+    if any(_match(path, pattern) for pattern in patterns):
+        return True
+    if not entry.isDir() or not any(_is_prefix(path, p) for p in patterns):
+        return False
+    return all(_covers(child, path + [child.name()], patterns) for child in entry)
+
+
+def check(
+    features: Sequence[tuple[str, Any]], layouts: Sequence[str], sizes: Sequence[int]
+) -> int:
+    """
+    Run the checks on the given features, see the module documentation.
+
+    Returns:
+        The number of mismatches with the reference implementation.
+    """
+    checker_module = importlib.import_module(
+        f"{PACKAGE}.basic_features.basic_mod_data_checker"
+    )
+    BasicModDataChecker = checker_module.BasicModDataChecker
+    split_path: Callable[[str], list[str]] = importlib.import_module(
+        f"{PACKAGE}.basic_features.path_patterns"
+    ).split_path
+
+    errors = 0
+    for game, feature in features:
+        if not isinstance(feature, BasicModDataChecker):
+            continue
+        globs = feature._file_patterns  # pyright: ignore[reportPrivateUsage]
+        valid: list[str] = globs.valid or []
+        folder_globs: list[str] = [glob for glob in valid if len(split_path(glob)) > 1]
+        if not folder_globs:
+            continue
+
+        print(f"{game}: {', '.join(folder_globs)}")
+        without_folders = BasicModDataChecker(
+            dataclasses.replace(
+                globs,
+                valid=[glob for glob in valid if glob not in folder_globs],
+            )
+        )
+        folder_patterns = checker_module.RegexPatterns.of(
+            checker_module.GlobPatterns(valid=folder_globs)
+        ).valid_paths
+        patterns = [split_path(glob) for glob in folder_globs]
+
+        changed = 0
+        covered = 0
+        for layout in layouts:
+            for size in sizes:
+                tree = build_tree(
+                    LAYOUTS[layout](size, random.Random(f"{layout}-{size}"))
+                )
+
+                status = feature.dataLooksValid(tree)
+                other_status = without_folders.dataLooksValid(tree)
+                if status is not other_status:
+                    changed += 1
+                    print(
+                        f"  {layout} ({size} files): {status.name} instead of"
+                        f" {other_status.name} without the patterns with folders"
+                    )
+
+                for entry in tree:
+                    result = folder_patterns.covers(entry)
+                    expected = _covers(entry, [entry.name()], patterns)
+                    covered += result
+                    if result != expected:
+                        errors += 1
+                        print(
+                            f"  error: {layout} ({size} files): {entry.name()} is"
+                            f" {'' if result else 'not '}covered, expected"
+                            f" {'' if expected else 'not '}covered",
+                            file=sys.stderr,
+                        )
+
+        print(
+            f"  {changed} archives with a different status,"
+            f" {covered} top-level entries covered by the patterns with folders"
+        )
+    return errors
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.valid_paths",
+        description="Check of the valid patterns with folders of the mod checkers.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1000],
+        help="numbers of files of the archives (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--layouts",
+        nargs="+",
+        choices=list(LAYOUTS),
+        default=list(LAYOUTS),
+        help="layouts of the archives (default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    # some plugins use Qt when initialized
+    if QApplication.instance() is None:
+        _app = QApplication(sys.argv[:1])
+
+    if check(registered_features(), args.layouts, args.sizes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
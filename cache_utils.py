@@ -0,0 +1,209 @@
+# -*- encoding: utf-8 -*-
+
+import json
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+_T = TypeVar("_T")
+
+
+def plugin_data_path() -> Path:
+    """
+    Retrieve the directory where basic games can store persistent data.
+
+    This is the same location as `mobase.IOrganizer.pluginDataPath()` (the `data`
+    folder next to the plugin folder), but it can be used before any plugin has been
+    initialized.
+
+    Returns:
+        The path to the basic games data folder (might not exist).
+    """
+    return Path(__file__).parent.parent.joinpath("data", "basic_games")
+
+
+def file_signature(path: Path | str) -> list[int] | None:
+    """
+    Compute a signature of the given file that changes when the file is modified.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        A [size, mtime] pair for the file, or None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_json_cache(name: str) -> dict[str, Any]:
+    """
+    Load a JSON cache from the plugin data folder.
+
+    Args:
+        name: Name of the cache file.
+
+    Returns:
+        The content of the cache, or an empty dictionary if the cache does not exist
+        or cannot be read.
+    """
+    try:
+        with open(plugin_data_path().joinpath(name), "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f'Failed to read cache "{name}": {e}', file=sys.stderr)
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return data  # pyright: ignore[reportUnknownVariableType]
+
+
+def save_json_cache(name: str, data: dict[str, Any]) -> None:
+    """
+    Save a JSON cache to the plugin data folder. Failures are reported but not
+    raised since caches are only an optimization.
+
+    Args:
+        name: Name of the cache file.
+        data: Content of the cache, must be JSON serializable.
+    """
+    path = plugin_data_path().joinpath(name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so that an interrupted write does not
+        # leave a corrupted cache around
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(data, fp)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f'Failed to write cache "{name}": {e}', file=sys.stderr)
+
+
+class FileCache:
+    """
+    Persistent cache of values parsed from files.
+
+    Entries are keyed by the path of the file and validated against the size and the
+    modification time of the file, so only modified files are parsed again. Values
+    must be JSON serializable.
+    """
+
+    # Bump when the format of the cache changes:
+    VERSION = 1
+
+    def __init__(self, name: str, version: int = 0):
+        """
+        Args:
+            name: Name of the cache file, in the plugin data folder.
+            version: Version of the cached values, to bump when the parsing changes
+                so that values from older versions are discarded.
+        """
+        self._name = name
+        self._version = version
+
+        data = load_json_cache(name)
+        self._entries: dict[str, list[Any]] = (
+            data.get("entries", {})
+            if data.get("version") == FileCache.VERSION
+            and data.get("values_version", 0) == version
+            else {}
+        )
+
+        # entries used since the cache was loaded, entries for files that are not
+        # accessed anymore are dropped when saving, unless asked otherwise (see save())
+        self._used: dict[str, list[Any]] = {}
+        self._modified = False
+
+    def get(
+        self,
+        path: Path,
+        parse: Callable[[Path], _T],
+        stat: os.stat_result | None = None,
+    ) -> _T:
+        """
+        Retrieve the value for the given file, parsing the file if needed. If the
+        file does not exist or if `parse` raises, nothing is cached.
+
+        Args:
+            path: Path to the file.
+            parse: Function parsing the file.
+            stat: Stat of the file if already known (e.g. from `os.scandir`), to
+                avoid a `stat` call.
+
+        Returns:
+            The (possibly cached) value for the file.
+        """
+        if stat is None:
+            signature = file_signature(path)
+        else:
+            signature = [stat.st_size, stat.st_mtime_ns]
+
+        if signature is None:
+            return parse(path)
+
+        key = str(path)
+        # values parsed since the cache was loaded are only in the used entries
+        entry = self._used.get(key) or self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            value = cast(_T, entry[1])
+        else:
+            value = parse(path)
+            self._modified = True
+
+        self._used[key] = [signature, value]
+        return value
+
+    def contains(self, path: Path) -> bool:
+        """
+        Check if an up-to-date value is cached for the given file, without marking
+        the entry as used.
+
+        Args:
+            path: Path to the file.
+
+        Returns:
+            True if `get()` would not parse the file.
+        """
+        key = str(path)
+        entry = self._used.get(key) or self._entries.get(key)
+        return entry is not None and entry[0] == file_signature(path)
+
+    def save(self, keep_unused: bool = False) -> None:
+        """
+        Save the cache if it was modified.
+
+        Args:
+            keep_unused: Keep the entries that were not used since the cache was
+                loaded as long as their file did not change, instead of dropping
+                them, for caches of files that are not all accessed in a session.
+        """
+        entries = self._used
+        if keep_unused:
+            entries = {
+                key: entry
+                for key, entry in self._entries.items()
+                if key not in self._used and file_signature(Path(key)) == entry[0]
+            } | self._used
+
+        if self._modified or entries.keys() != self._entries.keys():
+            save_json_cache(
+                self._name,
+                {
+                    "version": FileCache.VERSION,
+                    "values_version": self._version,
+                    "entries": entries,
+                },
+            )
+            self._entries = dict(entries)
+            self._modified = False
@@ -8,16 +8,58 @@ from configparser import NoOptionError
 from pathlib import Path
 from typing import Dict
 
+from .cache_utils import FileCache
+from .thread_utils import map_threaded
 
-def find_games(errors: list[tuple[str, Exception]] | None = None) -> Dict[str, Path]:
+
+def read_installer_data(installer_file: Path) -> str | None:
+    """
+    Read the content ID from an EA Desktop installer data file.
+
+    Args:
+        installer_file: Path to the installerdata.xml file.
+
+    Returns:
+        The numeric content ID of the game, or None if not found.
+    """
+    # For all manifest files the following XPath expression returns the
+    # numeric ID: .//contentIDs/contentID[1]. There are, in some cases, also name
+    # IDs but we do not consider these. The files can be large (localized strings,
+    # DLC list, ...), so the parsing stops at the first ID.
+    with open(installer_file, "rb") as fp:
+        tags: list[str] = []
+        for event, element in et.iterparse(fp, events=("start", "end")):
+            if event == "start":
+                tags.append(element.tag)
+                continue
+
+            tags.pop()
+            if element.tag == "contentID" and tags and tags[-1] == "contentIDs":
+                return element.text or None
+
+    return None
+
+
+def find_games(
+    errors: list[tuple[str, Exception]] | None = None,
+    cache: FileCache | None = None,
+    games: Dict[str, Path] | None = None,
+) -> Dict[str, Path]:
     """
     Find the list of EA Desktop games installed.
 
+    Args:
+        errors: List where errors are added.
+        cache: Cache for the content of the installer data files.
+        games: Mapping filled with the games as they are found, so that the games
+            found so far are available if the scan is interrupted.
+
     Returns:
         A mapping from EA Desktop content IDs to install locations for available
         EA Desktop games.
     """
-    games: Dict[str, Path] = {}
+    if games is None:
+        games = {}
 
     local_app_data_path = os.path.expandvars("%LocalAppData%")
     ea_desktop_settings_path = Path(local_app_data_path).joinpath(
@@ -59,22 +101,36 @@ def find_games(errors: list[tuple[str, Exception]] | None = None) -> Dict[str, P
     if not install_path.exists():
         return games
 
-    for game_dir in install_path.iterdir():
+    def read_game_dir(game_dir: Path) -> str | None:
+        installer_file = game_dir.joinpath("__Installer", "installerdata.xml")
         try:
-            installer_file = game_dir.joinpath("__Installer", "installerdata.xml")
-            xml_tree = et.parse(installer_file)
-            root = xml_tree.getroot()
-
-            # For all manifest files the following XPath expression returns the
-            # numeric ID. There are, in some cases, also name IDs but we do not
-            # consider these.
-            content_id = root.find(".//contentIDs/contentID[1]")
-
-            if content_id is not None and content_id.text:
-                game_id = content_id.text
-                games[game_id] = game_dir
-        except FileNotFoundError:
-            pass
+            stat = installer_file.stat()
+        except OSError:
+            # not a game folder
+            return None
+
+        if cache is None:
+            game_id = read_installer_data(installer_file)
+        else:
+            game_id = cache.get(installer_file, read_installer_data, stat)
+
+        # added as soon as it is read, so that the games read so far are kept if the
+        # scan times out on a folder of a sleeping drive
+        if game_id is not None:
+            games[game_id] = game_dir
+        return game_id
+
+    game_dirs = list(install_path.iterdir())
+    for game_dir, game_id in zip(
+        game_dirs,
+        map_threaded(read_game_dir, game_dirs, name="EA Desktop"),
+        strict=True,
+    ):
+        if isinstance(game_id, Exception):
+            print(
+                f'Unable to read EA Desktop game from "{game_dir}": {game_id}',
+                file=sys.stderr,
+            )
 
     return games
 
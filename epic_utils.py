@@ -9,11 +9,45 @@ import winreg
 from collections.abc import Iterable
 from pathlib import Path
 
+from .cache_utils import FileCache
+
 ErrorList = list[tuple[str, Exception]]
 
 
+def read_epic_manifest(manifest_file_path: Path) -> list[str]:
+    """
+    Read the application name and the install location from an Epic Games manifest.
+
+    Args:
+        manifest_file_path: Path to the manifest (.item file).
+
+    Returns:
+        A pair [application name, install location].
+    """
+    with open(manifest_file_path, encoding="utf-8") as manifest_file:
+        manifest_file_data = json.load(manifest_file)
+    return [manifest_file_data["AppName"], manifest_file_data["InstallLocation"]]
+
+
+def read_legendary_installed(installed_path: Path) -> list[list[str]]:
+    """
+    Read the installed games from a Legendary installed.json file.
+
+    Args:
+        installed_path: Path to the installed.json file.
+
+    Returns:
+        A list of pairs [application name, install path].
+    """
+    with open(installed_path, encoding="utf-8") as installed_file:
+        installed_games = json.load(installed_file)
+    return [
+        [game["app_name"], game["install_path"]] for game in installed_games.values()
+    ]
+
+
 def find_epic_games(
-    errors: ErrorList | None = None,
+    errors: ErrorList | None = None, cache: FileCache | None = None
 ) -> Iterable[tuple[str, Path]]:
     try:
         with winreg.OpenKey(
@@ -28,12 +62,13 @@ def find_epic_games(
     if manifests_path.exists():
         for manifest_file_path in manifests_path.glob("*.item"):
             try:
-                with open(manifest_file_path, encoding="utf-8") as manifest_file:
-                    manifest_file_data = json.load(manifest_file)
-                yield (
-                    manifest_file_data["AppName"],
-                    Path(manifest_file_data["InstallLocation"]),
-                )
+                if cache is None:
+                    app_name, install_location = read_epic_manifest(manifest_file_path)
+                else:
+                    app_name, install_location = cache.get(
+                        manifest_file_path, read_epic_manifest
+                    )
+                yield app_name, Path(install_location)
             except (json.JSONDecodeError, KeyError) as e:
                 error_message = (
                     f'Unable to parse Epic Games manifest file: "{manifest_file_path}"\n'
@@ -49,7 +84,9 @@ def find_epic_games(
 
 
 def find_legendary_games(
-    config_path: str | None = None, errors: ErrorList | None = None
+    config_path: str | None = None,
+    errors: ErrorList | None = None,
+    cache: FileCache | None = None,
 ) -> Iterable[tuple[str, Path]]:
     # Based on legendary source:
     # https://github.com/derrod/legendary/blob/master/legendary/lfs/lgndry.py
@@ -61,10 +98,12 @@ def find_legendary_games(
     installed_path = legendary_config_path / "installed.json"
     if installed_path.exists():
         try:
-            with open(installed_path, encoding="utf-8") as installed_file:
-                installed_games = json.load(installed_file)
-            for game in installed_games.values():
-                yield game["app_name"], Path(game["install_path"])
+            if cache is None:
+                installed_games = read_legendary_installed(installed_path)
+            else:
+                installed_games = cache.get(installed_path, read_legendary_installed)
+            for app_name, install_path in installed_games:
+                yield app_name, Path(install_path)
         except (json.JSONDecodeError, AttributeError, KeyError) as e:
             error_message = (
                 f'Unable to parse installed games from Legendary/Heroic launcher: "{installed_path}"\n'
@@ -79,20 +118,40 @@ def find_legendary_games(
                 errors.append((error_message, e))
 
 
-def find_heroic_games(errors: ErrorList | None = None):
+def find_heroic_games(errors: ErrorList | None = None, cache: FileCache | None = None):
     return find_legendary_games(
-        os.path.expandvars(r"%AppData%\heroic\legendaryConfig"), errors
+        os.path.expandvars(r"%AppData%\heroic\legendaryConfig"), errors, cache
     )
 
 
-def find_games(errors: ErrorList | None = None) -> dict[str, Path]:
-    return dict(
-        itertools.chain(
-            find_epic_games(errors=errors),
-            find_legendary_games(errors=errors),
-            find_heroic_games(errors=errors),
-        )
-    )
+def find_games(
+    errors: ErrorList | None = None,
+    cache: FileCache | None = None,
+    games: dict[str, Path] | None = None,
+) -> dict[str, Path]:
+    """
+    Find the list of Epic games installed, with the Epic Games launcher, Legendary
+    or Heroic.
+
+    Args:
+        errors: List where errors are added.
+        cache: Cache for the content of the manifests.
+        games: Mapping filled with the games as they are found, so that the games
+            found so far are available if the scan is interrupted.
+
+    Returns:
+        A mapping from Epic app names to install locations for available Epic games.
+    """
+    if games is None:
+        games = {}
+
+    for app_name, install_path in itertools.chain(
+        find_epic_games(errors=errors, cache=cache),
+        find_legendary_games(errors=errors, cache=cache),
+        find_heroic_games(errors=errors, cache=cache),
+    ):
+        games[app_name] = install_path
+    return games
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ class BG3ModDataChecker(BasicModDataChecker):
             GlobPatterns(
                 valid=[
                     "*.pak",
+                    str(Path("*") / "*.pak"),  # pak files in a single folder
                     str(Path("Mods") / "*.pak"),  # standard mods
                     "bin",  # native mods / Script Extender
                     "Script Extender",  # mods which are configured via jsons in this folder
@@ -47,7 +48,7 @@ class BG3ModDataChecker(BasicModDataChecker):
             elif isinstance(entry, mobase.IFileTree):
                 status = (
                     mobase.ModDataChecker.VALID
-                    if all(rp.valid.match(e.pathFrom(filetree)) for e in entry)
+                    if rp.valid_paths is not None and rp.valid_paths.covers(entry)
                     else mobase.ModDataChecker.INVALID
                 )
             elif rp.delete.match(name) or rp.move_match(name) is not None:
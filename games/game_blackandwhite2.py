@@ -10,7 +10,7 @@ from PyQt6.QtCore import QDateTime, QDir, QFile, QFileInfo
 
 import mobase
 
-from ..basic_features import BasicLocalSavegames
+from ..basic_features import BasicLocalSavegames, SaveMetadata, SaveMetadataCache
 from ..basic_features.basic_save_game_info import (
     BasicGameSaveGame,
     BasicGameSaveGameInfo,
@@ -174,34 +174,43 @@ class BlackAndWhite2SaveGame(BasicGameSaveGame):
         "empty2": [0x00000108, 0x0000011C],
     }
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, metadata: SaveMetadata | None = None):
         super().__init__(filepath)
         self._filepath = Path(filepath)
-        self.name: str = ""
-        self.land: int = -1
-        self.elapsed: int = 0
-        self.lastsave: int = 0
-        with open(self._filepath.joinpath("SaveGame.inf"), "rb") as info:
-            # Name embedded in "SaveGame.inf" with UTF-16 encoding
-            self.name = self.readInf(info, "name").decode("utf-16")
-            # Land number embedded in "SaveGame.inf" as an int written in binary
-            self.land = int.from_bytes(self.readInf(info, "land"), "little")
-            # Getting elapsed time in second
-            self.elapsed = int.from_bytes(self.readInf(info, "elapsed"), "little")
-            # Getting date in 100th of nanosecond need to convert NT time
-            # to UNIX time and offset localtime
-            self.lastsave = int(
-                (
-                    struct.unpack("q", self.readInf(info, "date"))[0] / 10000
-                    - 11644473600000
-                )
-                - (time.localtime().tm_gmtoff * 1000)
-            )
-            info.close()
+        if metadata is None:
+            metadata = self.extractMetadata(self._filepath)
+        self.name: str = metadata["name"]
+        self.land: int = metadata["land"]
+        self.elapsed: int = metadata["elapsed"]
+        # Date in 100th of nanosecond need to convert NT time to UNIX time and
+        # offset localtime
+        self.lastsave: int = int(
+            (metadata["date"] / 10000 - 11644473600000)
+            - (time.localtime().tm_gmtoff * 1000)
+        )
 
-    def readInf(self, inf: BinaryIO, key: str):
-        inf.seek(self._saveInfLayout[key][0])
-        return inf.read(self._saveInfLayout[key][1] - self._saveInfLayout[key][0])
+    @staticmethod
+    def infPath(filepath: Path) -> Path:
+        return filepath.joinpath("SaveGame.inf")
+
+    @classmethod
+    def extractMetadata(cls, filepath: Path) -> SaveMetadata:
+        with open(cls.infPath(filepath), "rb") as info:
+            return {
+                # Name embedded in "SaveGame.inf" with UTF-16 encoding
+                "name": cls.readInf(info, "name").decode("utf-16"),
+                # Land number embedded in "SaveGame.inf" as an int written in binary
+                "land": int.from_bytes(cls.readInf(info, "land"), "little"),
+                # Getting elapsed time in second
+                "elapsed": int.from_bytes(cls.readInf(info, "elapsed"), "little"),
+                # Getting date in 100th of nanosecond (NT time)
+                "date": struct.unpack("q", cls.readInf(info, "date"))[0],
+            }
+
+    @classmethod
+    def readInf(cls, inf: BinaryIO, key: str):
+        inf.seek(cls._saveInfLayout[key][0])
+        return inf.read(cls._saveInfLayout[key][1] - cls._saveInfLayout[key][0])
 
     def allFiles(self) -> list[str]:
         files = [str(file) for file in self._filepath.glob("./*")]
@@ -267,6 +276,11 @@ class BlackAndWhite2Game(BasicGame):
         self._register_feature(
             BasicGameSaveGameInfo(get_metadata=getMetadata, max_width=400)
         )
+        self._saves_metadata = SaveMetadataCache(
+            self.GameShortName,
+            BlackAndWhite2SaveGame.extractMetadata,
+            source=BlackAndWhite2SaveGame.infPath,
+        )
         return True
 
     def detectGame(self):
@@ -323,7 +337,7 @@ class BlackAndWhite2Game(BasicGame):
 
             profiles.append(path)
 
-        return [BlackAndWhite2SaveGame(path) for path in profiles]
+        return self._saves_metadata.create_saves(profiles, BlackAndWhite2SaveGame)
 
 
 class BOTGGame(BlackAndWhite2Game):
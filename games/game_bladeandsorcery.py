@@ -6,6 +6,7 @@ from PyQt6.QtCore import QDateTime, QDir
 
 import mobase
 
+from ..basic_features import SaveMetadata, SaveMetadataCache
 from ..basic_features.basic_save_game_info import (
     BasicGameSaveGame,
     BasicGameSaveGameInfo,
@@ -14,23 +15,34 @@ from ..basic_features.basic_save_game_info import (
 from ..basic_game import BasicGame
 
 
+def bas_extract_metadata(filepath: Path) -> SaveMetadata:
+    with open(filepath, "rb") as save:
+        save_data = json.load(save)
+    f_stat = filepath.stat()
+    return {
+        "gameMode": save_data["mode"]["saveData"]["gameModeId"],
+        "creatureId": save_data["customization"]["creatureId"],
+        "ethnicity": save_data["customization"]["ethnicGroupId"],
+        "playTime": save_data["playTime"],
+        "created": f_stat.st_birthtime,
+        "modified": f_stat.st_mtime,
+    }
+
+
 class BaSSaveGame(BasicGameSaveGame):
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, metadata: SaveMetadata | None = None):
         super().__init__(filepath)
-        with open(self._filepath, "rb") as save:
-            save_data = json.load(save)
-        self._gameMode = save_data["mode"]["saveData"]["gameModeId"]
+        if metadata is None:
+            metadata = bas_extract_metadata(filepath)
+        self._gameMode = metadata["gameMode"]
         self._gender = (
-            "Male"
-            if save_data["customization"]["creatureId"] == "PlayerDefaultMale"
-            else "Female"
+            "Male" if metadata["creatureId"] == "PlayerDefaultMale" else "Female"
         )
-        self._ethnicity = save_data["customization"]["ethnicGroupId"]
-        h, m, s = save_data["playTime"].split(":")
+        self._ethnicity = metadata["ethnicity"]
+        h, m, s = metadata["playTime"].split(":")
         self._elapsed = (float(h), int(m), float(s))
-        f_stat = self._filepath.stat()
-        self._created = f_stat.st_birthtime
-        self._modified = f_stat.st_mtime
+        self._created = metadata["created"]
+        self._modified = metadata["modified"]
 
     def getName(self) -> str:
         return f"{self.getPlayerSlug()} - {self._gameMode}"
@@ -89,10 +101,13 @@ class BaSGame(BasicGame):
         self._register_feature(
             BasicGameSaveGameInfo(get_metadata=bas_parse_metadata, max_width=400)
         )
+        self._saves_metadata = SaveMetadataCache(
+            self.GameShortName, bas_extract_metadata
+        )
         return True
 
     def listSaves(self, folder: QDir) -> list[mobase.ISaveGame]:
         ext = self._mappings.savegameExtension.get()
-        return [
-            BaSSaveGame(path) for path in Path(folder.absolutePath()).glob(f"*.{ext}")
-        ]
+        return self._saves_metadata.create_saves(
+            Path(folder.absolutePath()).glob(f"*.{ext}"), BaSSaveGame
+        )
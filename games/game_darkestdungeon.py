@@ -5,6 +5,7 @@ from PyQt6.QtCore import QDir, QFileInfo
 
 import mobase
 
+from ..basic_features import SaveMetadata, SaveMetadataCache
 from ..basic_game import BasicGame, BasicGameSaveGame
 from ..steam_utils import find_steam_path
 
@@ -60,14 +61,24 @@ class DarkestDungeonModDataChecker(mobase.ModDataChecker):
 
 
 class DarkestDungeonSaveGame(BasicGameSaveGame):
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, metadata: SaveMetadata | None = None):
         super().__init__(filepath)
-        dataPath = filepath.joinpath("persist.game.json")
-        self.name: str = ""
-        if self.isBinary(dataPath):
-            self.loadBinarySaveFile(dataPath)
+        if metadata is None:
+            metadata = self.extractMetadata(filepath)
+        self.name: str = metadata["name"]
+
+    @staticmethod
+    def dataPath(filepath: Path) -> Path:
+        return filepath.joinpath("persist.game.json")
+
+    @staticmethod
+    def extractMetadata(filepath: Path) -> SaveMetadata:
+        dataPath = DarkestDungeonSaveGame.dataPath(filepath)
+        if DarkestDungeonSaveGame.isBinary(dataPath):
+            name = DarkestDungeonSaveGame.loadBinarySaveFile(dataPath)
         else:
-            self.loadJSONSaveFile(dataPath)
+            name = DarkestDungeonSaveGame.loadJSONSaveFile(dataPath)
+        return {"name": name}
 
     @staticmethod
     def isBinary(dataPath: Path) -> bool:
@@ -76,13 +87,15 @@ class DarkestDungeonSaveGame(BasicGameSaveGame):
             # magic number in binary save files
             return magic == b"\x01\xb1\x00\x00"
 
-    def loadJSONSaveFile(self, dataPath: Path):
+    @staticmethod
+    def loadJSONSaveFile(dataPath: Path) -> str:
         text = dataPath.read_text()
         content = json.loads(text)
         data = content["data"]
-        self.name = str(data["estatename"])
+        return str(data["estatename"])
 
-    def loadBinarySaveFile(self, dataPath: Path):
+    @staticmethod
+    def loadBinarySaveFile(dataPath: Path) -> str:
         # see https://github.com/robojumper/DarkestDungeonSaveEditor
         with dataPath.open(mode="rb") as fp:
             # read Header
@@ -146,9 +159,8 @@ class DarkestDungeonSaveGame(BasicGameSaveGame):
                     continue
                 valueLength = int.from_bytes(fp.read(4), "little")
                 valueBytes = fp.read(valueLength - 1)
-                value = bytes.decode(valueBytes, "utf-8")
-                self.name = value
-                break
+                return bytes.decode(valueBytes, "utf-8")
+        return ""
 
     def getName(self) -> str:
         if self.name == "":
@@ -176,6 +188,11 @@ class DarkestDungeonGame(BasicGame):
     def init(self, organizer: mobase.IOrganizer) -> bool:
         super().init(organizer)
         self._register_feature(DarkestDungeonModDataChecker())
+        self._saves_metadata = SaveMetadataCache(
+            self.GameShortName,
+            DarkestDungeonSaveGame.extractMetadata,
+            source=DarkestDungeonSaveGame.dataPath,
+        )
         return True
 
     def executables(self) -> list[mobase.ExecutableInfo]:
@@ -242,4 +259,4 @@ class DarkestDungeonGame(BasicGame):
                 continue
             profiles.append(path)
 
-        return [DarkestDungeonSaveGame(path) for path in profiles]
+        return self._saves_metadata.create_saves(profiles, DarkestDungeonSaveGame)
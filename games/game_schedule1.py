@@ -5,7 +5,13 @@ from PyQt6.QtCore import QDir
 
 import mobase
 
-from ..basic_features import BasicLocalSavegames, BasicModDataChecker, GlobPatterns
+from ..basic_features import (
+    BasicLocalSavegames,
+    BasicModDataChecker,
+    GlobPatterns,
+    SaveMetadata,
+    SaveMetadataCache,
+)
 from ..basic_features.basic_save_game_info import (
     BasicGameSaveGame,
     BasicGameSaveGameInfo,
@@ -13,33 +19,45 @@ from ..basic_features.basic_save_game_info import (
 from ..basic_game import BasicGame
 
 
-def parse_schedule1_save_metadata(save_path: Path, save: mobase.ISaveGame):
-    metadata_file = save_path / "Game.json"
+def schedule1_metadata_file(save_path: Path) -> Path:
+    return save_path / "Game.json"
+
+
+def schedule1_extract_metadata(save_path: Path) -> SaveMetadata:
     try:
-        with open(metadata_file) as file:
+        with open(schedule1_metadata_file(save_path)) as file:
             meta_data = json.load(file)
-            name = meta_data["OrganisationName"]
-            if name != (save_name := save.getName()):
-                name = f"{save_name}  ({name})"
             return {
-                "Name": name,
-                "Game version": meta_data["GameVersion"],
+                "OrganisationName": meta_data["OrganisationName"],
+                "GameVersion": meta_data["GameVersion"],
             }
-    except (FileNotFoundError, json.JSONDecodeError):
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return {}
+
+
+def parse_schedule1_save_metadata(save_path: Path, save: mobase.ISaveGame):
+    if not isinstance(save, Schedule1SaveGame) or not (meta_data := save.metadata):
         return None
+    name = meta_data["OrganisationName"]
+    if name != (save_name := save.getName()):
+        name = f"{save_name}  ({name})"
+    return {
+        "Name": name,
+        "Game version": meta_data["GameVersion"],
+    }
 
 
 class Schedule1SaveGame(BasicGameSaveGame):
+    def __init__(self, filepath: Path, metadata: SaveMetadata | None = None):
+        super().__init__(filepath)
+        if metadata is None:
+            metadata = schedule1_extract_metadata(filepath)
+        self.metadata = metadata
+
     def getName(self) -> str:
-        metadata_file = self._filepath / "Game.json"
-        try:
-            with open(metadata_file) as file:
-                meta_data = json.load(file)
-                return meta_data["OrganisationName"]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return (
-                f"[{self.getSaveGroupIdentifier().rstrip('s')}] {self._filepath.stem}"
-            )
+        if self.metadata:
+            return self.metadata["OrganisationName"]
+        return f"[{self.getSaveGroupIdentifier().rstrip('s')}] {self._filepath.stem}"
 
     def getSaveGroupIdentifier(self) -> str:
         return self._filepath.parent.name
@@ -103,10 +121,14 @@ class Schedule1Game(BasicGame):
                 parse_schedule1_save_metadata,
             )
         )
+        self._saves_metadata = SaveMetadataCache(
+            self.GameShortName,
+            schedule1_extract_metadata,
+            source=schedule1_metadata_file,
+        )
         return True
 
     def listSaves(self, folder: QDir) -> list[mobase.ISaveGame]:
-        return [
-            Schedule1SaveGame(path)
-            for path in Path(folder.absolutePath()).glob("*/SaveGame_[1-5]")
-        ]
+        return self._saves_metadata.create_saves(
+            Path(folder.absolutePath()).glob("*/SaveGame_[1-5]"), Schedule1SaveGame
+        )
@@ -1,3 +1,5 @@
+import sys
+from collections.abc import Callable
 from enum import IntEnum
 from pathlib import Path
 
@@ -6,12 +8,14 @@ from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
 import mobase
 
+from ..basic_features import SaveMetadata, SaveMetadataCache
 from ..basic_features.basic_save_game_info import (
     BasicGameSaveGame,
     BasicGameSaveGameInfo,
 )
 from ..basic_game import BasicGame
-from .stalkeranomaly import XRSave
+from ..cache_utils import file_signature
+from .stalkeranomaly.XRSave import extract_metadata
 
 
 class StalkerAnomalyModDataChecker(mobase.ModDataChecker):
@@ -131,20 +135,47 @@ class StalkerAnomalyModDataContent(mobase.ModDataContent):
 class StalkerAnomalySaveGame(BasicGameSaveGame):
     _filepath: Path
 
-    xr_save: XRSave
-
-    def __init__(self, filepath: Path):
+    def __init__(
+        self,
+        filepath: Path,
+        metadata: SaveMetadata | None = None,
+        load: Callable[[Path], SaveMetadata] | None = None,
+    ):
+        """
+        Args:
+            filepath: Path to the save.
+            metadata: Metadata of the save, if already known.
+            load: Function retrieving the metadata when first needed, instead of
+                parsing the save.
+        """
         super().__init__(filepath)
         self._filepath = filepath
-        self.xr_save = XRSave(self._filepath)
+        self._metadata = metadata
+        self._load = load or self.extractMetadata
+
+    @staticmethod
+    def extractMetadata(filepath: Path) -> SaveMetadata:
+        return extract_metadata(filepath)
+
+    @property
+    def metadata(self) -> SaveMetadata:
+        # parsing the save is slow, so only done when the name or the details of
+        # the save are needed
+        if self._metadata is None:
+            try:
+                self._metadata = self._load(self._filepath)
+            except Exception as e:
+                print(f"Failed to read save {self._filepath}: {e}", file=sys.stderr)
+                self._metadata = {"player": None}
+        return self._metadata
 
     def getName(self) -> str:
-        xr_save = self.xr_save
-        player = xr_save.player
+        metadata = self.metadata
+        player = metadata["player"]
         if player:
-            name = player.character_name_str
-            time = xr_save.time_fmt
-            return f"{name}, {xr_save.save_fmt} [{time}]"
+            name = player["name"]
+            time = metadata["time_fmt"]
+            return f"{name}, {metadata['save_fmt']} [{time}]"
         return ""
 
     def allFiles(self) -> list[str]:
@@ -193,17 +224,17 @@ class StalkerAnomalySaveGameInfoWidget(mobase.ISaveGameInfoWidget):
         self.resize(240, 32)
         if not isinstance(save, StalkerAnomalySaveGame):
             return
-        xr_save = save.xr_save
-        player = xr_save.player
+        metadata = save.metadata
+        player = metadata["player"]
         if player:
-            self._labelSave.setText(f"Save: {xr_save.save_fmt}")
-            self._labelName.setText(f"Name: {player.character_name_str}")
-            self._labelFaction.setText(f"Faction: {xr_save.getFaction()}")
-            self._labelHealth.setText(f"Health: {player.health:.2f}%")
-            self._labelMoney.setText(f"Money: {player.money} RU")
-            self._labelRank.setText(f"Rank: {xr_save.getRank()} ({player.rank})")
+            self._labelSave.setText(f"Save: {metadata['save_fmt']}")
+            self._labelName.setText(f"Name: {player['name']}")
+            self._labelFaction.setText(f"Faction: {player['faction']}")
+            self._labelHealth.setText(f"Health: {player['health']:.2f}%")
+            self._labelMoney.setText(f"Money: {player['money']} RU")
+            self._labelRank.setText(f"Rank: {player['rank_name']} ({player['rank']})")
             self._labelRep.setText(
-                f"Reputation: {xr_save.getReputation()} ({player.reputation})"
+                f"Reputation: {player['reputation_name']} ({player['reputation']})"
             )
 
 
@@ -242,6 +273,7 @@ class StalkerAnomalyGame(BasicGame, mobase.IPluginFileMapper):
         self._register_feature(StalkerAnomalyModDataChecker())
         self._register_feature(StalkerAnomalyModDataContent())
         self._register_feature(StalkerAnomalySaveGameInfo())
+        self._saves_metadata = SaveMetadataCache(self.GameShortName, extract_metadata)
         organizer.onAboutToRun(lambda _str: self.aboutToRun(_str))
         return True
 
@@ -278,9 +310,34 @@ class StalkerAnomalyGame(BasicGame, mobase.IPluginFileMapper):
 
     def listSaves(self, folder: QDir) -> list[mobase.ISaveGame]:
         ext = self._mappings.savegameExtension.get()
+        paths = sorted(
+            Path(folder.absolutePath()).glob(f"*.{ext}"),
+            # saves deleted since the glob come last instead of failing the listing
+            key=lambda path: (file_signature(path) or [0, 0])[1],
+            reverse=True,
+        )
+
+        # saves are only parsed when needed, warm the most recent ones first since
+        # they are the ones shown first
+        processes = self._organizer.pluginSetting(self.name(), "save_processes")
+        self._saves_metadata.prefetch(
+            paths, processes=processes if isinstance(processes, int) else 0
+        )
         return [
-            StalkerAnomalySaveGame(path)
-            for path in Path(folder.absolutePath()).glob(f"*.{ext}")
+            StalkerAnomalySaveGame(path, load=self._saves_metadata.get)
+            for path in paths
+        ]
+
+    def settings(self) -> list[mobase.PluginSetting]:
+        return [
+            mobase.PluginSetting(
+                "save_processes",
+                (
+                    "Number of processes used to read the saves that are not cached,"
+                    " 0 to read them in Mod Organizer (default)."
+                ),
+                default_value=0,
+            )
         ]
 
     def mappings(self) -> list[mobase.Mapping]:
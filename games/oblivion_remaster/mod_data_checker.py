@@ -30,6 +30,21 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
     # Data file extensions considered valid. Unclear if BSAs are actually used.
     _data_extensions = [".esm", ".esp", ".bsa"]
 
+    # Casefolded lookups of the above, the checks run on every entry of the mod.
+    _dir_names = {dirname.casefold(): dirname for dirname in _dirs}
+    _data_dir_names = {dirname.casefold() for dirname in _data_dirs}
+    _data_suffixes = tuple(_data_extensions)
+    _top_level_suffixes = (*_data_suffixes, ".pak", ".bk2")
+    _nested_suffixes = (*_data_suffixes, ".pak", ".lua", ".bk2")
+    _nested_dir_names = _data_dir_names | {dirname.casefold() for dirname in _dirs}
+    _ue4ss_mod_names = {"shared", "npcappearancemanager", "naturalbodymorph"}
+
+    # Paths of the UE4SS library in mods packaging UE4SS.
+    _ue4ss_dll_paths = (
+        "ue4ss/UE4SS.dll",
+        "OblivionRemastered/Binaries/Win64/ue4ss/UE4SS.dll",
+    )
+
     def __init__(self, organizer: mobase.IOrganizer):
         super().__init__()
         self._organizer = organizer
@@ -37,125 +52,119 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
     def dataLooksValid(
         self, filetree: mobase.IFileTree
     ) -> mobase.ModDataChecker.CheckReturn:
-        status = mobase.ModDataChecker.INVALID
         # These represent common mod structures that include UE4SS base files.
         # These should generally be pruned or moved into a Root Builder path.
-        if filetree.find("ue4ss/UE4SS.dll") is not None:
-            return mobase.ModDataChecker.FIXABLE
-        elif (
-            filetree.find("OblivionRemastered/Binaries/Win64/ue4ss/UE4SS.dll")
-            is not None
-        ):
+        if self._has_ue4ss_dll(filetree):
             return mobase.ModDataChecker.FIXABLE
 
+        # Top-level entries are only checked when called by MO2 on the root of the mod.
+        if filetree.parent() is not None:
+            if self._is_fixable(filetree):
+                return mobase.ModDataChecker.FIXABLE
+            return mobase.ModDataChecker.INVALID
+
+        status = mobase.ModDataChecker.INVALID
         # Crawl the directory tree to check mod structure.
         for entry in filetree:
             name = entry.name().casefold()
-            parent = entry.parent()
-            assert parent is not None
-            # These are top-level file entries.
-            if parent.parent() is None:
-                if isinstance(entry, mobase.IFileTree):
-                    # Look for valid top level directories.
-                    if name in [dirname.lower() for dirname in self._dirs]:
-                        if name == "ue4ss":
+            if isinstance(entry, mobase.IFileTree):
+                # Look for valid top level directories.
+                if name in self._dir_names:
+                    if name == "ue4ss":
+                        """
+                        The UE4SS mod directory should contain either mod directories with
+                        a 'scripts/main.lua' file, or 'shared' library files. Certain common
+                        'preset settings' files are also acceptable.
+                        """
+                        mods = entry.find("Mods")
+                        if isinstance(mods, mobase.IFileTree):
                             """
-                            The UE4SS mod directory should contain either mod directories with
-                            a 'scripts/main.lua' file, or 'shared' library files. Certain common
-                            'preset settings' files are also acceptable.
+                            UE4SS intrinsically maps to the 'Mods' directory, so if this directory
+                            is present, it should be relocated.
                             """
-                            mods = entry.find("Mods")
-                            if isinstance(mods, mobase.IFileTree):
-                                """
-                                UE4SS intrinsically maps to the 'Mods' directory, so if this directory
-                                is present, it should be relocated.
-                                """
-                                for sub_entry in mods:
-                                    if isinstance(sub_entry, mobase.IFileTree):
-                                        if sub_entry.find("scripts/main.lua"):
-                                            status = mobase.ModDataChecker.FIXABLE
-                                            break
-                                        if sub_entry.name().casefold() in [
-                                            "shared",
-                                            "npcappearancemanager",
-                                            "naturalbodymorph",
-                                        ]:
-                                            status = mobase.ModDataChecker.FIXABLE
-                                            break
-                            else:
-                                for sub_entry in entry:
-                                    if isinstance(sub_entry, mobase.IFileTree):
-                                        # Files are present in the correct directory. Mark valid.
-                                        if sub_entry.find("scripts/main.lua"):
-                                            status = mobase.ModDataChecker.VALID
-                                            break
-                                        if sub_entry.name().casefold() in [
-                                            "shared",
-                                            "npcappearancemanager",
-                                            "naturalbodymorph",
-                                        ]:
-                                            status = mobase.ModDataChecker.VALID
-                                            break
-                        else:
-                            # All other base directories are considered valid
+                            if self._has_ue4ss_mod(mods):
+                                status = mobase.ModDataChecker.FIXABLE
+                        elif self._has_ue4ss_mod(entry):
+                            # Files are present in the correct directory. Mark valid.
                             status = mobase.ModDataChecker.VALID
-                        # No need to continue checks if the directory looks valid
-                        if status == mobase.ModDataChecker.VALID:
-                            break
-                    elif name in [dirname.lower() for dirname in self._data_dirs]:
-                        # Found a 'Data' subdirectory. Should be moved into 'Data'.
-                        status = mobase.ModDataChecker.FIXABLE
                     else:
-                        # Parse other directories for potential mod files.
-                        for sub_entry in entry:
-                            if sub_entry.isFile():
-                                sub_name = sub_entry.name().casefold()
-                                if sub_name.endswith(".exe"):
-                                    # Trying to handle EXE files is problematic, let the user figure it out
-                                    return mobase.ModDataChecker.INVALID
-                                if sub_name.endswith((".pak", ".bk2")):
-                                    # Found Pak files or movie files, should be fixable
-                                    status = mobase.ModDataChecker.FIXABLE
-                                elif sub_name.endswith(tuple(self._data_extensions)):
-                                    # Found plugins or BSA files, should be fixable
-                                    status = mobase.ModDataChecker.FIXABLE
-                            else:
-                                if name == "Paks":
-                                    # Found Paks directory as subdirectory, should be fixable
-                                    status = mobase.ModDataChecker.FIXABLE
-                        # Iterate into subdirectories so we can check the entire archive
-                        new_status = self.dataLooksValid(entry)
-                        if new_status != mobase.ModDataChecker.INVALID:
-                            status = new_status
-                        if status == mobase.ModDataChecker.VALID:
-                            break
+                        # All other base directories are considered valid
+                        status = mobase.ModDataChecker.VALID
+                    # No need to continue checks if the directory looks valid
+                    if status == mobase.ModDataChecker.VALID:
+                        break
+                elif name in self._data_dir_names:
+                    # Found a 'Data' subdirectory. Should be moved into 'Data'.
+                    status = mobase.ModDataChecker.FIXABLE
                 else:
-                    if name.endswith(".exe"):
-                        return mobase.ModDataChecker.INVALID
-                    if name.endswith(tuple(self._data_extensions + [".pak", ".bk2"])):
+                    # Parse other directories for potential mod files.
+                    for sub_entry in entry:
+                        if sub_entry.isFile() and sub_entry.name().casefold().endswith(
+                            ".exe"
+                        ):
+                            # Trying to handle EXE files is problematic, let the user figure it out
+                            return mobase.ModDataChecker.INVALID
+                    # Check the entire archive for Pak, movie, plugin or BSA files
+                    if self._is_fixable(entry):
                         status = mobase.ModDataChecker.FIXABLE
             else:
-                # Section is for parsing subdirectories
-                if isinstance(entry, mobase.IFileTree):
-                    if name in [dir_name.lower() for dir_name in self._dirs]:
-                        status = mobase.ModDataChecker.FIXABLE
-                    if name in [dir_name.lower() for dir_name in self._data_dirs]:
-                        status = mobase.ModDataChecker.FIXABLE
-                    else:
-                        new_status = self.dataLooksValid(entry)
-                        if new_status != mobase.ModDataChecker.INVALID:
-                            status = new_status
-                else:
-                    if name.endswith(".exe"):
-                        return mobase.ModDataChecker.INVALID
-                    if name.endswith(
-                        tuple(self._data_extensions + [".pak", ".lua", ".bk2"])
-                    ):
-                        status = mobase.ModDataChecker.FIXABLE
-                if status == mobase.ModDataChecker.VALID:
-                    break
+                if name.endswith(".exe"):
+                    return mobase.ModDataChecker.INVALID
+                if name.endswith(self._top_level_suffixes):
+                    status = mobase.ModDataChecker.FIXABLE
         return status
 
+    def _has_ue4ss_dll(self, filetree: mobase.IFileTree) -> bool:
+        return any(filetree.find(path) is not None for path in self._ue4ss_dll_paths)
+
+    def _has_ue4ss_mod(self, mods: mobase.IFileTree) -> bool:
+        """
+        Check if a UE4SS 'Mods' directory contains a Lua mod or a known library.
+        """
+        for entry in mods:
+            if isinstance(entry, mobase.IFileTree):
+                if entry.find("scripts/main.lua"):
+                    return True
+                if entry.name().casefold() in self._ue4ss_mod_names:
+                    return True
+        return False
+
+    def _is_fixable(self, directory: mobase.IFileTree) -> bool:
+        """
+        Check if a directory below the top level contains files that fix() can move
+        into place. A directory containing an EXE file is not fixable (unless it
+        packages UE4SS), whatever its subdirectories contain.
+
+        The result only depends on the subtree, so files and names of subdirectories
+        are checked before walking the subdirectories, and the search stops at the
+        first fixable entry.
+
+        :param directory: The directory to check.
+        :return: True if the directory is fixable, False otherwise.
+        """
+        if self._has_ue4ss_dll(directory):
+            return True
+
+        directories: list[mobase.IFileTree] = []
+        fixable = False
+        for entry in directory:
+            if isinstance(entry, mobase.IFileTree):
+                directories.append(entry)
+            else:
+                name = entry.name().casefold()
+                if name.endswith(".exe"):
+                    return False
+                if name.endswith(self._nested_suffixes):
+                    fixable = True
+        if fixable:
+            return True
+
+        if any(
+            subdir.name().casefold() in self._nested_dir_names for subdir in directories
+        ):
+            return True
+        return any(self._is_fixable(subdir) for subdir in directories)
+
     def fix(self, filetree: mobase.IFileTree) -> mobase.IFileTree:
         """
         Main fixer function. Iterates files, using 'parse_directory' for subdirectory search and fixing.
@@ -220,9 +229,7 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
             if isinstance(entry, mobase.IFileTree):
                 directories.append(entry)
         for directory in directories:
-            if directory.name().casefold() in [
-                dirname.lower() for dirname in self._data_dirs
-            ]:
+            if directory.name().casefold() in self._data_dir_names:
                 # Move detected 'Data' directories into 'Data'
                 data_dir = self.get_dir(filetree, "Data")
                 directory.moveTo(data_dir)
@@ -250,9 +257,7 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
                                     parent = _parent(sub_entry)
                                     sub_entry.moveTo(directory)
                                     self.detach_parents(parent)
-            elif directory.name().casefold() not in [
-                dirname.lower() for dirname in self._dirs
-            ]:
+            elif directory.name().casefold() not in self._dir_names:
                 # For non-valid directories, iterate into the directory
                 filetree = self.parse_directory(filetree, directory)
         # Parsing top-level files
@@ -287,7 +292,7 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
                                 movie_files.append(file)
                     for movie_file in movie_files:
                         movie_file.moveTo(movies_dir)
-                elif name.endswith(tuple(self._data_extensions)):
+                elif name.endswith(self._data_suffixes):
                     # Files matching Data file extensions should be moved to "Data"
                     data_dir = self.get_dir(filetree, "Data")
                     data_files: list[mobase.FileTreeEntry] = []
@@ -313,39 +318,34 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
                 directories.append(entry)
         for directory in directories:
             name = directory.name().casefold()
-            stop = False
-            for dir_name in self._dirs:
-                if name == dir_name.lower():
-                    main_dir = self.get_dir(main_filetree, dir_name)
-                    if name == "ue4ss":
-                        # UE4SS directories should presumably map to 'UE4SS' but check for a 'Mods' directory and move that instead.
-                        if self._organizer.pluginSetting(
-                            PLUGIN_NAME, "ue4ss_use_root_builder"
-                        ):
-                            ue4ss_dir = self.get_dir(
-                                main_filetree,
-                                "Root/OblivionRemastered/Binaries/Win64/ue4ss",
-                            )
-                            ue4ss_dir.merge(directory)
-                        else:
-                            mod_dir = directory.find("Mods")
-                            if isinstance(mod_dir, mobase.IFileTree):
-                                main_dir.merge(mod_dir)
-                            else:
-                                main_dir.merge(directory)
+            if (dir_name := self._dir_names.get(name)) is not None:
+                main_dir = self.get_dir(main_filetree, dir_name)
+                if name == "ue4ss":
+                    # UE4SS directories should presumably map to 'UE4SS' but check for a 'Mods' directory and move that instead.
+                    if self._organizer.pluginSetting(
+                        PLUGIN_NAME, "ue4ss_use_root_builder"
+                    ):
+                        ue4ss_dir = self.get_dir(
+                            main_filetree,
+                            "Root/OblivionRemastered/Binaries/Win64/ue4ss",
+                        )
+                        ue4ss_dir.merge(directory)
                     else:
-                        main_dir.merge(directory)
-                    self.detach_parents(directory)
-                    stop = True
-                    break
-            if stop:
+                        mod_dir = directory.find("Mods")
+                        if isinstance(mod_dir, mobase.IFileTree):
+                            main_dir.merge(mod_dir)
+                        else:
+                            main_dir.merge(directory)
+                else:
+                    main_dir.merge(directory)
+                self.detach_parents(directory)
                 continue
             if name in ["~mods", "logicmods"]:
                 # These directories should represent Paks mods and should be moved into that directory.
                 paks_dir = self.get_dir(main_filetree, "Paks")
                 directory.moveTo(paks_dir)
                 continue
-            elif name in [dirname.lower() for dirname in self._data_dirs]:
+            elif name in self._data_dir_names:
                 # These directories are typically associated with Data and should be moved into that directory.
                 data_dir = self.get_dir(main_filetree, "Data")
                 data_dir.merge(directory)
@@ -355,7 +355,7 @@ class OblivionRemasteredModDataChecker(mobase.ModDataChecker):
         for entry in next_dir:
             if entry.isFile():
                 name = entry.name().casefold()
-                if name.endswith(tuple(self._data_extensions)):
+                if name.endswith(self._data_suffixes):
                     # Files matching Data extensions should be moved into 'Data'
                     data_dir = self.get_dir(main_filetree, "Data")
                     data_dir.merge(next_dir)
@@ -3,146 +3,196 @@ from __future__ import annotations
 
 import io
 import struct
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from .XRMath import IVec3
 
+_U8 = struct.Struct("<B")
+_S8 = struct.Struct("<b")
+_U16 = struct.Struct("<H")
+_S16 = struct.Struct("<h")
+_U32 = struct.Struct("<I")
+_S32 = struct.Struct("<i")
+_U64 = struct.Struct("<Q")
+_S64 = struct.Struct("<q")
+_BOOL = struct.Struct("<?")
+_FLOAT = struct.Struct("<f")
+_FVEC3 = struct.Struct("<fff")
+
 
 class XRReader:
-    def __init__(self, buffer: bytes):
+    """
+    Reader over a range of a buffer. Values are unpacked in place, and sub-readers
+    and `read()` share the buffer instead of copying it.
+    """
+
+    def __init__(self, buffer: bytes, start: int = 0, end: Optional[int] = None):
         self._buffer = buffer
-        self._pos = 0
+        self._view = memoryview(buffer)
+        self._start = start
+        self._end = len(buffer) if end is None else end
+        self._pos = start
 
     def __len__(self) -> int:
-        return len(self._buffer)
+        return self._end - self._start
 
-    def _read(self, size: int) -> Tuple[bytes, int]:
-        pos = min(len(self._buffer), self._pos + size)
-        buffer = self._buffer[self._pos : pos]
+    def _read(self, size: int) -> Tuple[memoryview, int]:
+        pos = min(self._end, self._pos + size)
+        buffer = self._view[self._pos : pos]
         return (buffer, pos)
 
-    def read(self, size: int = -1) -> bytes:
+    def _unpack(self, fmt: struct.Struct) -> Tuple[Any, ...]:
+        pos = self._pos
+        if pos + fmt.size > self._end:
+            raise struct.error(
+                f"unpack requires {fmt.size} bytes, {max(0, self._end - pos)} left"
+            )
+        self._pos = pos + fmt.size
+        return fmt.unpack_from(self._buffer, pos)
+
+    def read(self, size: int = -1) -> memoryview:
         if size < 0:
-            size = len(self._buffer)
-        if len(self._buffer) <= self._pos:
-            return b""
+            size = self._end
+        if self._end <= self._pos:
+            return self._view[0:0]
         (buffer, pos) = self._read(size)
         self._pos = pos
         return buffer
 
-    def peek(self, size: int = -1) -> bytes:
+    def peek(self, size: int = -1) -> memoryview:
         if size < 0:
-            size = len(self._buffer)
-        if len(self._buffer) <= self._pos:
-            return b""
+            size = self._end
+        if self._end <= self._pos:
+            return self._view[0:0]
         (buffer, _pos) = self._read(size)
         return buffer
 
+    def reader(self, size: int) -> XRReader:
+        """
+        Read the next `size` bytes as a reader sharing the buffer.
+        """
+        pos = min(self._end, self._pos + size)
+        reader = XRReader(self._buffer, self._pos, pos)
+        self._pos = pos
+        return reader
+
     def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
         if whence == 0:
             if pos < 0:
                 raise ValueError(f"negative seek position {pos}")
-            self._pos = pos
+            self._pos = self._start + pos
         elif whence == 1:
-            self._pos = max(0, self._pos + pos)
+            self._pos = max(self._start, self._pos + pos)
         elif whence == 2:
-            self._pos = max(0, len(self._buffer) + pos)
+            self._pos = max(self._start, self._end + pos)
         else:
             raise ValueError("unsupported whence value")
-        return self._pos
+        return self._pos - self._start
+
+    def tell(self) -> int:
+        return self._pos - self._start
 
     def elapsed(self) -> int:
-        return len(self._buffer) - self._pos
+        return self._end - self._pos
 
     def eof(self) -> bool:
         return self.elapsed() <= 0
 
     def u8(self) -> int:
-        return int(struct.unpack("<B", self.read(1))[0])
+        return self._unpack(_U8)[0]
 
     def s8(self) -> int:
-        return int(struct.unpack("<b", self.read(1))[0])
+        return self._unpack(_S8)[0]
 
     def u16(self) -> int:
-        return int(struct.unpack("<H", self.read(2))[0])
+        return self._unpack(_U16)[0]
 
     def s16(self) -> int:
-        return int(struct.unpack("<h", self.read(2))[0])
+        return self._unpack(_S16)[0]
 
     def u32(self) -> int:
-        return int(struct.unpack("<I", self.read(4))[0])
+        return self._unpack(_U32)[0]
 
     def s32(self) -> int:
-        return int(struct.unpack("<i", self.read(4))[0])
+        return self._unpack(_S32)[0]
 
     def u64(self) -> int:
-        return int(struct.unpack("<Q", self.read(8))[0])
+        return self._unpack(_U64)[0]
 
     def s64(self) -> int:
-        return int(struct.unpack("<q", self.read(8))[0])
+        return self._unpack(_S64)[0]
 
     def bool(self) -> bool:
-        return bool(struct.unpack("<?", self.read(1))[0])
+        return self._unpack(_BOOL)[0]
 
     def float(self) -> float:
-        return float(struct.unpack("<f", self.read(4))[0])
+        return self._unpack(_FLOAT)[0]
 
     def str(self) -> str:
-        chars = bytearray()
-        while not self.eof():
-            c = self.read(1)
-            if c == b"\x00":
-                return str(chars, "utf-8")
-            else:
-                chars += c
-        return ""
+        if self._pos >= self._end:
+            return ""
+        end = self._buffer.find(b"\x00", self._pos, self._end)
+        if end < 0:
+            self._pos = self._end
+            return ""
+        value = str(self._view[self._pos : end], "utf-8")
+        self._pos = end + 1
+        return value
 
     def fvec3(self) -> IVec3:
-        (f1, f2, f3) = struct.unpack("<fff", self.read(12))
+        (f1, f2, f3) = self._unpack(_FVEC3)
         return IVec3(f1, f2, f3)
 
 
+_CHUNK_HEADER = struct.Struct("<II")
+_CHUNK_COMPRESSED = 1 << 31
+
+
 class XRStream(XRReader):
-    def __init__(self, buffer: bytes):
-        super().__init__(buffer)
-        self.last_pos: int = 0
+    """
+    Reader over a sequence of chunks, each a (type, size) header followed by its
+    data. The chunks are indexed the first time one is looked up.
+    """
+
+    def __init__(self, buffer: bytes, start: int = 0, end: Optional[int] = None):
+        super().__init__(buffer, start, end)
+        self._chunks: Optional[List[Tuple[int, int, int]]] = None
+        self._chunk_index: Dict[int, Tuple[int, int]] = {}
+
+    def chunks(self) -> List[Tuple[int, int, int]]:
+        """
+        Returns:
+            The ID, the offset of the data (from the start of the stream) and the
+            size of each chunk, in order.
+        """
+        if self._chunks is None:
+            self._chunks = []
+            pos = self._start
+            while pos + _CHUNK_HEADER.size <= self._end:
+                (dw_type, dw_size) = _CHUNK_HEADER.unpack_from(self._buffer, pos)
+                pos += _CHUNK_HEADER.size
+                chunk = (dw_type & ~_CHUNK_COMPRESSED, pos - self._start, dw_size)
+                self._chunks.append(chunk)
+                # the first chunk with an ID is the one found
+                self._chunk_index.setdefault(chunk[0], chunk[1:])
+                pos += dw_size
+        return self._chunks
 
     def find_chunk(self, id: int) -> Optional[int]:
-        dw_type = 0
-        dw_size = 0
-        success = False
-        if self.last_pos != 0:
-            self.seek(self.last_pos)
-            dw_type = self.u32()
-            dw_size = self.u32()
-            if (dw_type & (~(1 << 31))) == id:
-                success = True
-
-        if not success:
-            self.seek(0)
-            while not self.eof():
-                dw_type = self.u32()
-                dw_size = self.u32()
-                if (dw_type & (~(1 << 31))) == id:
-                    success = True
-                    break
-                else:
-                    self.seek(dw_size, io.SEEK_CUR)
-
-            if not success:
-                self.last_pos = 0
-                return None
-
-        if (self._pos + dw_size) < len(self._buffer):
-            self.last_pos = self._pos + dw_size
-        else:
-            self.last_pos = 0
+        self.chunks()
+        chunk = self._chunk_index.get(id)
+        if chunk is None:
+            return None
 
-        return dw_size
+        (offset, size) = chunk
+        self.seek(offset)
+        return size
 
     def open_chunk(self, id: int) -> Optional[XRStream]:
         size = self.find_chunk(id)
         if size and size != 0:
-            data = self.read(size)
-            return XRStream(data)
+            pos = min(self._end, self._pos + size)
+            stream = XRStream(self._buffer, self._pos, pos)
+            self._pos = pos
+            return stream
         return None
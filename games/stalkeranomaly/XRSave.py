@@ -2,11 +2,11 @@ import io
 import struct
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO, Optional, cast
+from typing import Any, BinaryIO, Optional, cast
 
 import lzokay  # pyright: ignore[reportMissingTypeStubs]
 
-from .XRIO import XRReader, XRStream
+from .XRIO import XRStream
 from .XRObject import XRCreatureActor, XRFlag
 
 
@@ -124,16 +124,39 @@ class XRSave:
         if chunk:
             chunk.seek(4, io.SEEK_CUR)  # obj_count
             count_spawn = chunk.u16()
-            spawn = XRReader(chunk.read(count_spawn))
+            spawn = chunk.reader(count_spawn)
             actor = XRCreatureActor()
             actor.read_spawn(spawn)
             count_update = chunk.u16()
-            update = XRReader(chunk.read(count_update))
+            update = chunk.reader(count_update)
             actor.read_update(update)
             if actor:
                 self.player = actor
         return None
 
+    def metadata(self) -> dict[str, Any]:
+        """
+        Summary of the save as shown in MO2, small and JSON serializable so that it
+        can be cached.
+        """
+        player = getattr(self, "player", None)
+        return {
+            "save_fmt": self.save_fmt,
+            "time_fmt": self.time_fmt,
+            "player": {
+                "name": player.character_name_str,
+                "faction": self.getFaction(),
+                "health": player.health,
+                "money": player.money,
+                "rank": player.rank,
+                "rank_name": self.getRank(),
+                "reputation": player.reputation,
+                "reputation_name": self.getReputation(),
+            }
+            if player
+            else None,
+        }
+
     def getFaction(self) -> str:
         player = self.player
         if player:
@@ -162,3 +185,12 @@ class XRSave:
                     if player_rep <= rep:
                         return self._reputation[rep]
         return self._reputation["max"]
+
+
+def extract_metadata(filepath: Path) -> dict[str, Any]:
+    """
+    Extract the metadata of a save (see `XRSave.metadata()`). Defined at the module
+    level, which does not depend on mobase, so that saves can be parsed in worker
+    processes.
+    """
+    return XRSave(filepath).metadata()
@@ -5,7 +5,20 @@ import winreg
 from pathlib import Path
 
 
-def find_games() -> dict[str, Path]:
+def find_games(games: dict[str, Path] | None = None) -> dict[str, Path]:
+    """
+    Find the list of GOG games installed.
+
+    Args:
+        games: Mapping filled with the games as they are found, so that the games
+            found so far are available if the scan is interrupted.
+
+    Returns:
+        A mapping from GOG game IDs to install locations for available GOG games.
+    """
+    if games is None:
+        games = {}
+
     # List the game IDs from the registry:
     game_ids: list[str] = []
     try:
@@ -18,10 +31,9 @@ def find_games() -> dict[str, Path]:
                 if game_key.isdigit():
                     game_ids.append(game_key)
     except FileNotFoundError:
-        return {}
+        return games
 
     # For each game, query the path:
-    games: dict[str, Path] = {}
     for game_id in game_ids:
         try:
             with winreg.OpenKey(
@@ -3,14 +3,17 @@
 # Heavily influenced by https://github.com/erri120/GameFinder
 
 import os
+import sys
 import threading
 import time
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from urllib import parse
 
 import psutil
 
+from .cache_utils import FileCache
+
 
 class OriginWatcher:
     """
@@ -18,82 +21,250 @@ class OriginWatcher:
     order to hook and unhook Origin to get around the Origin DRM. Support
     for launching Origin is not included as it's intended for the game's
     DRM to launch Origin as needed.
+
+    The process table is only scanned until the game is found, at an interval that
+    grows while the game is not running. Once found, only the game process is
+    watched, until it exits.
     """
 
-    def __init__(self, executables: Sequence[str] = []):
+    def __init__(
+        self,
+        executables: Sequence[str] = [],
+        origin_executable: str = "origin.exe",
+        launch_timeout: float = 300.0,
+        exit_timeout: float = 5.0,
+        min_interval: float = 0.5,
+        max_interval: float = 4.0,
+    ):
+        """
+        Args:
+            executables: Name of the game executables.
+            origin_executable: Name of the Origin executable.
+            launch_timeout: Time (in seconds) given to Origin and the game to
+                launch before Origin is killed.
+            exit_timeout: Time (in seconds) after the game exits before Origin is
+                killed, in case the game is restarted (e.g., by its launcher).
+            min_interval: Initial interval (in seconds) between scans of the
+                process table.
+            max_interval: Maximum interval (in seconds) between scans of the
+                process table.
+        """
         self.executables = list(map(lambda s: s.lower(), executables))
+        self.origin_executable = origin_executable.lower()
+        self.launch_timeout = launch_timeout
+        self.exit_timeout = exit_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        # Statistics, for the last run of the watcher:
+        self.scan_count = 0  # scans of the process table
+        self.poll_count = 0  # checks of the game process
+        self.cpu_time = 0.0  # CPU time (in seconds) spent by the watcher thread
+
+        self._cpu_start = 0.0
+        self._stop = threading.Event()
 
     def spawn_origin_watcher(self) -> bool:
+        self.scan_count = 0
+        self.poll_count = 0
+        self.cpu_time = 0.0
         self.kill_origin()
         self.worker_alive = True
+        self._stop.clear()
         self.worker = threading.Thread(target=self._workerFunc)
         self.worker.start()
         return True
 
     def stop_origin_watcher(self) -> None:
         self.worker_alive = False
+        self._stop.set()
         self.worker.join(10.0)
 
+    def _find_processes(self, names: Sequence[str]) -> list[psutil.Process]:
+        self.scan_count += 1
+        return [
+            proc
+            for proc in psutil.process_iter(attrs=["name"])
+            if (proc.info["name"] or "").lower() in names
+        ]
+
     def kill_origin(self) -> None:
         """
         Kills the Origin application
         """
-        for proc in psutil.process_iter():
-            if proc.name().lower() == "origin.exe":
+        for proc in self._find_processes([self.origin_executable]):
+            try:
                 proc.kill()
+            except psutil.Error:
+                pass
+
+    def _wait_game(self, timeout: float) -> psutil.Process | None:
+        """
+        Scan the process table for the game, more and more slowly, until it is
+        found, the timeout expires or the watcher is stopped.
+
+        Returns:
+            The game process, if found.
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.min_interval
+        while self.worker_alive:
+            processes = self._find_processes(self.executables)
+            self._update_cpu_time()
+            if processes:
+                return processes[0]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._stop.wait(min(interval, remaining))
+            interval = min(interval * 2, self.max_interval)
+        return None
+
+    def _update_cpu_time(self) -> None:
+        # only called from the worker thread
+        self.cpu_time = time.thread_time() - self._cpu_start
 
     def _workerFunc(self) -> None:
-        gameAliveCount = 300  # Large number to allow Origin and the game to launch
+        self._cpu_start = time.thread_time()
+
+        # Large timeout to allow Origin and the game to launch
+        timeout = self.launch_timeout
         while self.worker_alive:
-            gameAlive = False
-            # See if the game is still alive
-            for proc in psutil.process_iter():
-                if proc.name().lower() in self.executables:
-                    gameAlive = True
-                    break
-            if gameAlive:
-                # Game is alive, sleep and keep monitoring at faster pace
-                gameAliveCount = 5
-            else:
-                gameAliveCount -= 1
-                if gameAliveCount <= 0:
+            game = self._wait_game(timeout)
+            if game is None:
+                if self.worker_alive:
                     self.kill_origin()
+                    self._update_cpu_time()
                     self.worker_alive = False
-            time.sleep(1)
+                return
+
+            # Game is alive, wait for it to exit, waking up regularly to check if
+            # the watcher was stopped
+            while self.worker_alive:
+                self.poll_count += 1
+                try:
+                    game.wait(self.min_interval)
+                    break
+                except psutil.TimeoutExpired:
+                    pass
+                except psutil.Error:
+                    # cannot wait on the process (e.g., access denied), poll it
+                    if not game.is_running():
+                        break
+                    self._stop.wait(self.min_interval)
+                finally:
+                    self._update_cpu_time()
+
+            # The game may be restarted (e.g., by its launcher), wait a bit before
+            # killing Origin
+            timeout = self.exit_timeout
+
+
+def read_manifest(manifest: Path) -> list[list[str]]:
+    """
+    Read the installed games from an Origin manifest.
+
+    Args:
+        manifest: Path to the manifest (.mfst file).
 
+    Returns:
+        A list of pairs [manifest ID, install location], empty if the manifest does
+        not contain both.
+    """
+    # Read the file and look for &id= and &dipinstallpath=
+    with open(manifest, "r") as f:
+        manifest_query = f.read()
+    url = parse.urlparse(manifest_query)
+    query = parse.parse_qs(url.query)
+    if "id" not in query:
+        # If id is not present, we have no clue what to do.
+        return []
+    if "dipinstallpath" not in query:
+        # We could query the Origin server for the install location but... no?
+        return []
+
+    return [[id_, path_] for id_ in query["id"] for path_ in query["dipinstallpath"]]
+
+
+# Manifests are stored in LocalContent/<game>/, deeper folders are only searched down to
+# this depth to avoid walking years of leftovers:
+MANIFEST_MAX_DEPTH = 3
+
+
+def list_manifests(
+    path: Path, max_depth: int = MANIFEST_MAX_DEPTH
+) -> Iterator[os.DirEntry[str]]:
+    """
+    List the Origin manifests in the given folder, skipping Steam manifests.
+
+    Args:
+        path: Folder to search.
+        max_depth: Maximum depth of the folders to search, 0 to only search the
+            given folder.
+
+    Returns:
+        The entries of the manifests, the manifests of a folder are listed before
+        the ones of its sub-folders.
+    """
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return
 
-def find_games() -> dict[str, Path]:
+    folders: list[os.DirEntry[str]] = []
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                folders.append(entry)
+                continue
+        except OSError:
+            continue
+
+        name = entry.name.lower()
+        # Skip any manifest file with '@steam'
+        if name.endswith(".mfst") and "@steam" not in name:
+            yield entry
+
+    if max_depth > 0:
+        for folder in folders:
+            yield from list_manifests(Path(folder.path), max_depth - 1)
+
+
+def find_games(
+    cache: FileCache | None = None, games: dict[str, Path] | None = None
+) -> dict[str, Path]:
     """
     Find the list of Origin games installed.
 
+    Args:
+        cache: Cache for the content of the manifests.
+        games: Mapping filled with the games as they are found, so that the games
+            found so far are available if the scan is interrupted.
+
     Returns:
         A mapping from Origin manifest IDs to install locations for available
         Origin games.
     """
-    games: dict[str, Path] = {}
+    if games is None:
+        games = {}
 
     program_data_path = os.path.expandvars("%PROGRAMDATA%")
     local_content_path = Path(program_data_path).joinpath("Origin", "LocalContent")
-    for manifest in local_content_path.glob("**/*.mfst"):
-        # Skip any manifest file with '@steam'
-        if "@steam" in manifest.name.lower():
-            continue
-
-        # Read the file and look for &id= and &dipinstallpath=
-        with open(manifest, "r") as f:
-            manifest_query = f.read()
-        url = parse.urlparse(manifest_query)
-        query = parse.parse_qs(url.query)
-        if "id" not in query:
-            # If id is not present, we have no clue what to do.
-            continue
-        if "dipinstallpath" not in query:
-            # We could query the Origin server for the install location but... no?
+    for entry in list_manifests(local_content_path):
+        manifest = Path(entry.path)
+        try:
+            if cache is None:
+                manifest_games = read_manifest(manifest)
+            else:
+                # the stat from scandir is free on Windows
+                manifest_games = cache.get(manifest, read_manifest, entry.stat())
+        except Exception as e:
+            print(f'Unable to parse file "{manifest}": {e}', file=sys.stderr)
             continue
 
-        for id_ in query["id"]:
-            for path_ in query["dipinstallpath"]:
-                games[id_] = Path(path_)
+        for id_, path_ in manifest_games:
+            games[id_] = Path(path_)
 
     return games
 
@@ -0,0 +1,95 @@
+# -*- encoding: utf-8 -*-
+
+import multiprocessing
+import os
+import runpy
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+_PACKAGE_PATH = Path(__file__).parent
+
+
+def python_executable() -> str | None:
+    """
+    Find a Python interpreter to start worker processes with. Inside MO2,
+    `sys.executable` is MO2 itself, so an interpreter is looked up in the
+    installation of the embedded Python.
+
+    Returns:
+        The path to the interpreter, or None if none was found.
+    """
+    if Path(sys.executable).name.lower().startswith("python"):
+        return sys.executable
+
+    for prefix in dict.fromkeys([sys.exec_prefix, sys.base_exec_prefix]):
+        for name in ("pythonw.exe", "python.exe", "bin/python3"):
+            path = os.path.join(prefix, name)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor | None:
+    """
+    Create a pool of worker processes, to run CPU-bound functions in parallel
+    (threads do not help since they hold the GIL).
+
+    Only the modules of this package that do not depend on mobase (e.g. parsers of
+    save files) can be used from the workers, see `process_worker.py`. Functions and
+    their arguments and results must be picklable.
+
+    Args:
+        max_workers: Number of worker processes.
+
+    Returns:
+        The pool, or None if no Python interpreter was found to start the workers.
+    """
+    executable = python_executable()
+    if executable is None:
+        print(
+            "Unable to find a Python interpreter to start worker processes.",
+            file=sys.stderr,
+        )
+        return None
+
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(executable)
+    return ProcessPoolExecutor(
+        max_workers,
+        mp_context=context,
+        initializer=runpy.run_path,
+        initargs=(
+            str(_PACKAGE_PATH.joinpath("process_worker.py")),
+            {"PACKAGE_NAME": __package__, "PACKAGE_PATH": str(_PACKAGE_PATH)},
+        ),
+    )
+
+
+def map_chunk(
+    function: Callable[[_T], _R], items: Sequence[_T]
+) -> list[tuple[_R | None, str | None]]:
+    """
+    Apply a function to a chunk of items, in a worker process. Exceptions are
+    returned as messages since they might not be picklable.
+
+    Args:
+        function: Function to apply.
+        items: Items to apply the function to.
+
+    Returns:
+        For each item, the result of the function and None, or None and the error
+        raised by the function.
+    """
+    results: list[tuple[_R | None, str | None]] = []
+    for item in items:
+        try:
+            results.append((function(item), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
@@ -0,0 +1,30 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Initialization of the worker processes created by `process_utils`.
+
+This file is run (with `runpy.run_path`) in each worker process, with the name and
+the path of the plugin package as `PACKAGE_NAME` and `PACKAGE_PATH`. It registers the
+package without running its `__init__`, which needs mobase (only available in MO2),
+so that the modules of the package that do not depend on mobase can be imported.
+"""
+
+import importlib.machinery
+import os
+import site
+import sys
+import types
+
+_name: str = globals()["PACKAGE_NAME"]
+_path: str = globals()["PACKAGE_PATH"]
+
+# the bundled dependencies are normally added by the __init__ of the package
+site.addsitedir(os.path.join(_path, "lib"))
+
+if _name not in sys.modules:
+    _spec = importlib.machinery.ModuleSpec(_name, None, is_package=True)
+    _spec.submodule_search_locations = [_path]
+    _package = types.ModuleType(_name)
+    _package.__spec__ = _spec
+    _package.__path__ = [_path]
+    sys.modules[_name] = _package
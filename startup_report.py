@@ -0,0 +1,153 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Timing of the startup of the basic games plugin.
+
+Set the BASIC_GAMES_STARTUP_REPORT environment variable to a folder to get a report
+of the time spent importing, instantiating and detecting each game plugin. Two files
+are written in that folder once the plugins are created, and updated when a plugin
+created lazily is loaded (e.g. when its game becomes the managed game):
+
+- startup_report.json, the list of measures with a summary per category,
+- startup_trace.json, the same measures in the Chrome trace event format, that can
+  be opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+ENVIRONMENT_VARIABLE = "BASIC_GAMES_STARTUP_REPORT"
+
+
+class StartupReport:
+    """
+    Collection of timing measures.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._events: list[dict[str, Any]] = []
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> Generator[None]:
+        """
+        Measure the time spent in the block.
+
+        Args:
+            category: Category of the measure (e.g. "import").
+            name: Name of the measure (e.g. the name of the module).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            self._events.append(
+                {
+                    "category": category,
+                    "name": name,
+                    "start": start - self._origin,
+                    "duration": end - start,
+                    "thread": thread.name,
+                    "thread_id": thread.ident,
+                }
+            )
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Returns:
+            The report, with all the measures and the total time and count of
+            measures per category.
+        """
+        summary: dict[str, dict[str, Any]] = {}
+        for event in self._events:
+            category = summary.setdefault(event["category"], {"count": 0, "total": 0.0})
+            category["count"] += 1
+            category["total"] += event["duration"]
+
+        return {
+            "summary": summary,
+            "events": sorted(self._events, key=lambda e: e["start"]),
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        Returns:
+            The measures in the Chrome trace event format.
+        """
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": event["name"],
+                "cat": event["category"],
+                "ph": "X",
+                "ts": event["start"] * 1e6,
+                "dur": event["duration"] * 1e6,
+                "pid": pid,
+                "tid": event["thread_id"],
+            }
+            for event in self._events
+        ]
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in {
+                (e["thread_id"], e["thread"]) for e in self._events
+            }
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, folder: Path) -> None:
+        """
+        Write the JSON report and the Chrome trace to the given folder.
+
+        Args:
+            folder: Folder to write the files to.
+        """
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+            with open(folder.joinpath("startup_report.json"), "w") as fp:
+                json.dump(self.to_json(), fp, indent=2)
+            with open(folder.joinpath("startup_trace.json"), "w") as fp:
+                json.dump(self.to_chrome_trace(), fp)
+        except OSError as e:
+            print(f"Failed to write startup report to {folder}: {e}", file=sys.stderr)
+
+
+_report_folder = os.environ.get(ENVIRONMENT_VARIABLE)
+_report = StartupReport() if _report_folder else None
+
+
+def measure(category: str, name: str) -> contextlib.AbstractContextManager[None]:
+    """
+    Measure the time spent in the block if the startup report is enabled.
+
+    Args:
+        category: Category of the measure (e.g. "import").
+        name: Name of the measure (e.g. the name of the module).
+    """
+    if _report is None:
+        return contextlib.nullcontext()
+    return _report.measure(category, name)
+
+
+def write_report() -> None:
+    """
+    Write the startup report if enabled, with all the measures so far. Can be called
+    several times, the files are overwritten.
+    """
+    if _report is not None and _report_folder:
+        _report.write(Path(_report_folder))
@@ -1,12 +1,18 @@
 # Code greatly inspired by https://github.com/LostDragonist/steam-library-setup-tool
 
+import os
+import re
 import sys
 import winreg
+from collections.abc import Callable, Sequence
 from pathlib import Path
 from typing import TypedDict, cast
 
 import vdf  # pyright: ignore[reportMissingTypeStubs]
 
+from .cache_utils import FileCache
+from .thread_utils import map_threaded
+
 
 class SteamGame:
     def __init__(self, appid: str, installdir: str):
@@ -38,22 +44,135 @@ class _LibraryFolders(TypedDict, total=False):
     LibraryFolders: dict[str, str]
 
 
+# Lines of a VDF file holding a key and a value, or only a key (before a block), for
+# the fast path of read_app_manifest():
+_VDF_KEY_VALUE = re.compile(r'"([^"\\]*)"\s+"((?:[^"\\]|\\.)*)"')
+_VDF_KEY = re.compile(r'"([^"\\]*)"')
+
+
+def _scan_app_manifest(filepath: Path) -> list[str] | None:
+    """
+    Scan a Steam application manifest for the application ID and the installation
+    folder, without parsing the whole file.
+
+    Both keys are near the top of the AppState block, so the scan stops as soon as
+    they are found, skipping the (much larger) depots and user configuration blocks.
+
+    Args:
+        filepath: Path to the manifest (appmanifest_*.acf).
+
+    Returns:
+        A pair [application ID, installation folder], or None if the manifest
+        contains anything unusual (or does not contain both keys) and must be parsed
+        with the vdf module.
+    """
+    values: dict[str, str] = {}
+    depth = 0
+    with open(filepath, "r", encoding="utf-8") as fp:
+        for line in fp:
+            token = line.strip()
+            if not token:
+                continue
+            if token == "{":
+                depth += 1
+                continue
+            if token == "}":
+                depth -= 1
+                if depth <= 0:
+                    # end of the AppState block
+                    return None
+                continue
+
+            if match := _VDF_KEY_VALUE.fullmatch(token):
+                if depth == 0:
+                    return None
+                key, value = match.groups()
+                if depth == 1 and key in ("appid", "installdir"):
+                    if "\\" in value:
+                        # escape sequences are left to the vdf module
+                        return None
+                    values.setdefault(key, value)
+                    if len(values) == 2:
+                        return [values["appid"], values["installdir"]]
+            elif match := _VDF_KEY.fullmatch(token):
+                if depth == 0 and match.group(1) != "AppState":
+                    return None
+            else:
+                return None
+
+    return None
+
+
+def read_app_manifest(filepath: Path) -> list[str]:
+    """
+    Read the application ID and the installation folder from a Steam application
+    manifest.
+
+    Args:
+        filepath: Path to the manifest (appmanifest_*.acf).
+
+    Returns:
+        A pair [application ID, installation folder].
+
+    Raises:
+        KeyError: If the manifest does not contain the expected information.
+    """
+    result = _scan_app_manifest(filepath)
+    if result is not None:
+        return result
+
+    with open(filepath, "r", encoding="utf-8") as fp:
+        info = cast(
+            _AppManifest,
+            vdf.load(fp),  # pyright: ignore[reportUnknownMemberType]
+        )
+    app_state = info["AppState"]
+    return [app_state["appid"], app_state["installdir"]]
+
+
+def list_app_manifests(steamapps_path: Path) -> list[os.DirEntry[str]]:
+    """
+    List the application manifests in the steamapps folder of a library.
+
+    Args:
+        steamapps_path: Path to the steamapps folder of the library.
+
+    Returns:
+        The entries of the application manifests (appmanifest_*.acf), empty if the
+        folder cannot be read.
+    """
+    try:
+        entries = list(os.scandir(steamapps_path))
+    except OSError:
+        return []
+
+    return [
+        entry
+        for entry in entries
+        if entry.name.lower().startswith("appmanifest_")
+        and entry.name.lower().endswith(".acf")
+    ]
+
+
 class LibraryFolder:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, cache: FileCache | None = None):
         self.path = path
 
         self.games: list[SteamGame] = []
-        for filepath in path.joinpath("steamapps").glob("appmanifest_*.acf"):
+        for entry in list_app_manifests(path.joinpath("steamapps")):
+            filepath = Path(entry.path)
             try:
-                with open(filepath, "r", encoding="utf-8") as fp:
-                    info = cast(
-                        _AppManifest,
-                        vdf.load(fp),  # pyright: ignore[reportUnknownMemberType]
+                if cache is None:
+                    app_id, install_dir = read_app_manifest(filepath)
+                else:
+                    # the stat from scandir is free on Windows
+                    app_id, install_dir = cache.get(
+                        filepath, read_app_manifest, entry.stat()
                     )
-                    app_state = info["AppState"]
             except KeyError:
                 print(
-                    f'Unable to read application state from "{filepath}"',
+                    f"Unable to read application ID or installation folder "
+                    f'from "{filepath}"',
                     file=sys.stderr,
                 )
                 continue
@@ -61,17 +180,7 @@ class LibraryFolder:
                 print(f'Unable to parse file "{filepath}": {e}', file=sys.stderr)
                 continue
 
-            try:
-                app_id = app_state["appid"]
-                install_dir = app_state["installdir"]
-                self.games.append(SteamGame(app_id, install_dir))
-            except KeyError:
-                print(
-                    f"Unable to read application ID or installation folder "
-                    f'from "{filepath}"',
-                    file=sys.stderr,
-                )
-                continue
+            self.games.append(SteamGame(app_id, install_dir))
 
     def __repr__(self):
         return str(self)
@@ -80,16 +189,16 @@ class LibraryFolder:
         return "LibraryFolder at {}: {}".format(self.path, self.games)
 
 
-def parse_library_info(library_vdf_path: Path) -> list[LibraryFolder]:
+def read_library_paths(library_vdf_path: Path) -> list[str]:
     """
-    Read library folders from the main library file.
+    Read the path of the library folders from the main library file.
 
     Args:
         library_vdf_path: The main library file (from the Steam installation
             folder).
 
     Returns:
-        A list of LibraryFolder, for each library found.
+        The path of each library found.
     """
 
     with open(library_vdf_path, "r", encoding="utf-8") as f:
@@ -111,7 +220,7 @@ def parse_library_info(library_vdf_path: Path) -> list[LibraryFolder]:
     else:
         raise ValueError(f'Unknown file format from "{library_vdf_path}"')
 
-    library_folders: list[LibraryFolder] = []
+    library_paths: list[str] = []
 
     for key, value in info_folders.items():
         # only keys that are integer values contains library folder
@@ -121,21 +230,86 @@ def parse_library_info(library_vdf_path: Path) -> list[LibraryFolder]:
             continue
 
         if isinstance(value, str):
-            path = value
+            library_paths.append(value)
         else:
-            path = value["path"]
+            library_paths.append(value["path"])
 
-        try:
-            library_folders.append(LibraryFolder(Path(path)))
-        except Exception as e:
+    return library_paths
+
+
+def read_library_folders(
+    library_paths: Sequence[str | Path],
+    cache: FileCache | None = None,
+    on_library: Callable[[LibraryFolder], None] | None = None,
+) -> list[LibraryFolder]:
+    """
+    Read the given library folders, in parallel since libraries are usually on
+    different drives.
+
+    Args:
+        library_paths: Path of the library folders.
+        cache: Cache for the content of the application manifest files.
+        on_library: Function called (from the thread reading the library) with each
+            library as soon as it is read, so that the libraries read so far are
+            available while a library on a slow drive is still being read.
+
+    Returns:
+        A list of LibraryFolder, in the order of the given paths, for each library
+        that could be read.
+    """
+
+    def read_library(path: str | Path) -> LibraryFolder:
+        library = LibraryFolder(Path(path), cache)
+        if on_library is not None:
+            on_library(library)
+        return library
+
+    library_folders: list[LibraryFolder] = []
+    for path, result in zip(
+        library_paths,
+        map_threaded(
+            read_library,
+            library_paths,
+            name="Steam library",
+        ),
+        strict=True,
+    ):
+        if isinstance(result, Exception):
             print(
-                'Failed to read steam library from "{}", {}'.format(path, repr(e)),
+                'Failed to read steam library from "{}", {}'.format(path, repr(result)),
                 file=sys.stderr,
             )
+        else:
+            library_folders.append(result)
 
     return library_folders
 
 
+def _read_library_paths(
+    library_vdf_path: Path, cache: FileCache | None = None
+) -> list[str]:
+    if cache is None:
+        return read_library_paths(library_vdf_path)
+    return cache.get(library_vdf_path, read_library_paths)
+
+
+def parse_library_info(
+    library_vdf_path: Path, cache: FileCache | None = None
+) -> list[LibraryFolder]:
+    """
+    Read library folders from the main library file.
+
+    Args:
+        library_vdf_path: The main library file (from the Steam installation
+            folder).
+        cache: Cache for the content of the library and application manifest files.
+
+    Returns:
+        A list of LibraryFolder, for each library found.
+    """
+    return read_library_folders(_read_library_paths(library_vdf_path, cache), cache)
+
+
 def find_steam_path() -> Path | None:
     """
     Retrieve the Steam path, if available.
@@ -151,33 +325,52 @@ def find_steam_path() -> Path | None:
         return None
 
 
-def find_games() -> dict[str, Path]:
+def find_games(
+    cache: FileCache | None = None, games: dict[str, Path] | None = None
+) -> dict[str, Path]:
     """
     Find the list of Steam games installed.
 
+    Args:
+        cache: Cache for the content of the library and application manifest files.
+        games: Mapping filled with the games as they are found, so that the games
+            found so far are available if the scan is interrupted.
+
     Returns:
         A mapping from Steam game ID to install locations for available
         Steam games.
     """
+    if games is None:
+        games = {}
+
     steam_path = find_steam_path()
     if not steam_path:
-        return {}
+        return games
 
     library_vdf_path = steam_path.joinpath("steamapps", "libraryfolders.vdf")
 
     try:
-        library_folders = parse_library_info(library_vdf_path)
-        library_folders.append(LibraryFolder(steam_path))
+        library_paths = _read_library_paths(library_vdf_path, cache)
     except FileNotFoundError:
-        return {}
+        return games
 
-    games: dict[str, Path] = {}
-    for library in library_folders:
+    def add_games(library: LibraryFolder):
         for game in library.games:
             games[game.appid] = Path(library.path).joinpath(
                 "steamapps", "common", game.installdir
             )
 
+    # the games are added as each library is read, so that a library on a sleeping
+    # drive does not hide the games of the other libraries if the scan times out
+    library_folders = read_library_folders(
+        [*library_paths, steam_path], cache, add_games
+    )
+
+    # added again in the order of the libraries, so that the location of a game found
+    # in several libraries does not depend on the library that was read first
+    for library in library_folders:
+        add_games(library)
+
     return games
 
 
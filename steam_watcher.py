@@ -0,0 +1,348 @@
+# -*- encoding: utf-8 -*-
+
+"""
+Live update of the installed Steam games.
+
+The Steam games are listed once when the plugins are loaded. Set the
+BASIC_GAMES_WATCH_STEAM environment variable to a non-empty value to also watch the
+Steam libraries while MO2 is running, so that games installed, moved or uninstalled
+through Steam are picked up without restarting MO2.
+"""
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from .basic_game import normalize_path
+from .cache_utils import FileCache
+from .steam_utils import list_app_manifests, read_app_manifest, read_library_paths
+
+ENVIRONMENT_VARIABLE = "BASIC_GAMES_WATCH_STEAM"
+
+
+class _Library:
+    def __init__(self, path: Path):
+        self.path = path
+        self.steamapps_path = path.joinpath("steamapps")
+
+        # [size, mtime], application ID and installation folder of each application
+        # manifest, by file name:
+        self.manifests: dict[str, tuple[list[int], str, str]] = {}
+
+    def games(self) -> dict[str, Path]:
+        return {
+            app_id: self.steamapps_path.joinpath("common", install_dir)
+            for _, app_id, install_dir in self.manifests.values()
+        }
+
+
+class SteamLibraryWatcher(QObject):
+    """
+    Watch the Steam libraries for games being installed, moved or uninstalled.
+
+    The main library file (libraryfolders.vdf) and the steamapps folder of each
+    library are watched. Changes are collected until nothing has changed for a short
+    delay (Steam writes the manifests many times while updating a game), then only
+    the application manifests that changed are parsed again.
+    """
+
+    # emitted by the thread reading the libraries when the watcher starts, with the
+    # libraries by normalized path, see start():
+    _libraries_read = pyqtSignal(object)
+
+    def __init__(
+        self,
+        steam_path: Path,
+        games: dict[str, Path],
+        callback: Callable[[dict[str, Path | None]], None],
+        cache: FileCache | None = None,
+        delay: int = 2000,
+        parent: QObject | None = None,
+    ):
+        """
+        Args:
+            steam_path: Path to the Steam installation.
+            games: The Steam games currently known, from application ID to install
+                location.
+            callback: Function called with the games that changed, from application
+                ID to the new install location, or None for uninstalled games.
+            cache: Cache for the content of the library and application manifest
+                files.
+            delay: Delay (in milliseconds) without changes before the libraries are
+                updated. Updates are delayed at most five times this delay.
+            parent: Parent of the watcher.
+        """
+        super().__init__(parent)
+
+        self._steam_path = steam_path
+        self._library_vdf_path = steam_path.joinpath("steamapps", "libraryfolders.vdf")
+        self._games = dict(games)
+        self._callback = callback
+        self._cache = cache
+        self._max_delay = 5 * delay / 1000
+
+        # libraries by normalized path, in the order of find_games() since the last
+        # library containing a game wins:
+        self._libraries: dict[str, _Library] = {}
+
+        # changes waiting for the timer:
+        self._pending_libraries: set[str] = set()
+        self._pending_vdf = False
+        self._pending_since = 0.0
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)  # type: ignore
+        self._watcher.directoryChanged.connect(self._on_directory_changed)  # type: ignore
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._update)  # type: ignore
+
+        self._libraries_read.connect(self._on_libraries_read)  # type: ignore
+
+    def start(self) -> None:
+        """
+        Read the libraries in the background and start watching them once they are
+        read. Games that changed since the games given to the constructor were
+        listed are reported.
+
+        The libraries are read in a daemon thread, so that a library on a sleeping
+        drive blocks neither MO2 nor its exit, and the libraries are not watched
+        until they can all be read. Since the libraries were just read by
+        find_games(), the manifests usually come from the cache.
+        """
+        threading.Thread(
+            target=self._read_libraries_in_background,
+            name="Steam library watcher",
+            daemon=True,
+        ).start()
+
+    def _read_libraries_in_background(self) -> None:
+        # the watcher has no libraries yet, so its state is not modified here
+        result = self._read_libraries()
+        if result is not None:
+            self._libraries_read.emit(result[0])
+
+    def _on_libraries_read(self, libraries: dict[str, _Library]) -> None:
+        # in the thread of the watcher, see start()
+        changed = set(self._games)
+        for library in libraries.values():
+            changed.update(library.games())
+        self._set_libraries(libraries)
+        self._report(changed)
+
+    def _schedule(self) -> None:
+        # restart the timer on every change, unless changes have been pending for
+        # too long (e.g. a large game being downloaded)
+        now = time.monotonic()
+        if not self._timer.isActive():
+            self._pending_since = now
+            self._timer.start()
+        elif now - self._pending_since < self._max_delay:
+            self._timer.start()
+
+    def _on_file_changed(self, path: str) -> None:
+        self._pending_vdf = True
+        self._schedule()
+
+    def _on_directory_changed(self, path: str) -> None:
+        self._pending_libraries.add(normalize_path(Path(path).parent))
+        self._schedule()
+
+    def _read_library_paths(self) -> list[Path] | None:
+        try:
+            if self._cache is None:
+                paths = read_library_paths(self._library_vdf_path)
+            else:
+                paths = self._cache.get(self._library_vdf_path, read_library_paths)
+        except FileNotFoundError:
+            paths = []
+        except Exception as e:
+            # probably being written by Steam, a new change will follow
+            print(
+                f'Unable to read Steam libraries from "{self._library_vdf_path}": {e}',
+                file=sys.stderr,
+            )
+            return None
+        return [Path(path) for path in paths] + [self._steam_path]
+
+    def _read_libraries(self) -> tuple[dict[str, _Library], set[str]] | None:
+        """
+        Read the list of libraries from the main library file, scanning only the
+        new libraries. The current libraries are not modified.
+
+        Returns:
+            The libraries by normalized path and the application IDs of the games in
+            libraries added or removed, or None if the main library file could not be
+            read.
+        """
+        paths = self._read_library_paths()
+        if paths is None:
+            return None
+
+        changed: set[str] = set()
+        libraries: dict[str, _Library] = {}
+        for path in paths:
+            key = normalize_path(path)
+            if key in libraries:
+                # the Steam folder is usually listed in the main library file too
+                libraries[key] = libraries.pop(key)
+                continue
+            library = self._libraries.get(key)
+            if library is None:
+                library = _Library(path)
+                changed |= self._scan(library)
+            libraries[key] = library
+
+        for key, library in self._libraries.items():
+            if key not in libraries:
+                changed.update(library.games())
+
+        return libraries, changed
+
+    def _update_libraries(self) -> set[str]:
+        """
+        Update the list of libraries from the main library file, scanning only the
+        new libraries.
+
+        Returns:
+            The application IDs of the games in libraries added or removed.
+        """
+        result = self._read_libraries()
+        if result is None:
+            return set()
+
+        libraries, changed = result
+        self._set_libraries(libraries)
+        return changed
+
+    def _set_libraries(self, libraries: dict[str, _Library]) -> None:
+        """
+        Replace the libraries, and watch the main library file and the new libraries.
+        """
+        self._libraries = libraries
+
+        # QFileSystemWatcher stops watching files that are replaced, so the main file
+        # and the folders are watched again after each update
+        watched = {
+            normalize_path(path): str(path)
+            for path in [self._library_vdf_path]
+            + [library.steamapps_path for library in libraries.values()]
+        }
+        current = {
+            normalize_path(path): path
+            for path in self._watcher.files() + self._watcher.directories()
+        }
+        unwatched = [path for key, path in current.items() if key not in watched]
+        for path in unwatched:
+            self._watcher.removePath(path)
+        missing = [
+            path
+            for key, path in watched.items()
+            if key not in current and Path(path).exists()
+        ]
+        for path in missing:
+            self._watcher.addPath(path)
+
+    def _scan(self, library: _Library) -> set[str]:
+        """
+        Update the games of a library, parsing only the application manifests that
+        changed.
+
+        Returns:
+            The application IDs of the games that changed.
+        """
+        manifests: dict[str, tuple[list[int], str, str]] = {}
+        for entry in list_app_manifests(library.steamapps_path):
+            previous = library.manifests.get(entry.name)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if previous is not None and previous[0] == signature:
+                manifests[entry.name] = previous
+                continue
+
+            filepath = Path(entry.path)
+            try:
+                if self._cache is None:
+                    app_id, install_dir = read_app_manifest(filepath)
+                else:
+                    app_id, install_dir = self._cache.get(
+                        filepath, read_app_manifest, stat
+                    )
+            except Exception as e:
+                # probably being written by Steam, keep the previous content until
+                # the next change
+                print(f'Unable to parse file "{filepath}": {e}', file=sys.stderr)
+                if previous is not None:
+                    manifests[entry.name] = previous
+                continue
+
+            manifests[entry.name] = (signature, app_id, install_dir)
+
+        old_games = library.games()
+        library.manifests = manifests
+        new_games = library.games()
+        return {
+            app_id
+            for app_id in old_games.keys() | new_games.keys()
+            if old_games.get(app_id) != new_games.get(app_id)
+        }
+
+    def _update(self, changed: set[str] | None = None) -> None:
+        """
+        Apply the pending changes and report the games that changed.
+
+        Args:
+            changed: Application IDs of games to check in addition to the ones in
+                the libraries that changed.
+        """
+        changed = set() if changed is None else changed
+        if self._pending_vdf:
+            self._pending_vdf = False
+            changed |= self._update_libraries()
+
+        for key in self._pending_libraries:
+            library = self._libraries.get(key)
+            if library is not None:
+                changed |= self._scan(library)
+        self._pending_libraries.clear()
+
+        self._report(changed)
+
+    def _report(self, changed: set[str]) -> None:
+        """
+        Save the cache and report the games that changed.
+
+        Args:
+            changed: Application IDs of the games that may have changed.
+        """
+        if self._cache is not None:
+            self._cache.save()
+
+        # resolve the install location of the changed games as in find_games(),
+        # where the last library containing a game wins
+        library_games = [library.games() for library in self._libraries.values()]
+        games: dict[str, Path | None] = {}
+        for app_id in changed:
+            path: Path | None = None
+            for library_game in library_games:
+                if app_id in library_game:
+                    path = library_game[app_id]
+            if path != self._games.get(app_id):
+                games[app_id] = path
+                if path is None:
+                    del self._games[app_id]
+                else:
+                    self._games[app_id] = path
+
+        if games:
+            self._callback(games)
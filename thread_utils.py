@@ -0,0 +1,57 @@
+# -*- encoding: utf-8 -*-
+
+import threading
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def map_threaded(
+    function: Callable[[_T], _R],
+    items: Sequence[_T],
+    max_workers: int = 8,
+    name: str = "worker",
+) -> list[_R | Exception]:
+    """
+    Apply a function to each item using a pool of threads.
+
+    Daemon threads are used (instead of concurrent.futures) so that a call blocked
+    on I/O, e.g. on a sleeping network drive, does not prevent MO2 from exiting.
+
+    Args:
+        function: Function to apply.
+        items: Items to apply the function to.
+        max_workers: Maximum number of threads.
+        name: Name of the threads.
+
+    Returns:
+        The result of the function for each item, in the order of the items, or the
+        exception raised by the function for this item.
+    """
+    results: list[_R | Exception | None] = [None] * len(items)
+    indices = iter(range(len(items)))
+    lock = threading.Lock()
+
+    def work():
+        while True:
+            with lock:
+                index = next(indices, None)
+            if index is None:
+                return
+            try:
+                results[index] = function(items[index])
+            except Exception as e:
+                results[index] = e
+
+    threads = [
+        threading.Thread(target=work, name=f"{name} {i}", daemon=True)
+        for i in range(min(max_workers, len(items)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results  # pyright: ignore[reportReturnType]